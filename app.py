@@ -33,10 +33,17 @@ except ImportError:
     SEABORN_AVAILABLE = False
 from datetime import datetime
 import time
+# The model helpers come from the pipeline so they act on the semantic_match module it scores with
 try:
-    from script.pipeline import evaluate_resume, evaluate_resumes_batch, evaluate_resume_fast
+    from script.pipeline import (evaluate_resume, evaluate_resumes_batch, evaluate_resume_fast,
+                                 warm_up, model_status, ADVANCED_SEMANTIC, SEMANTIC_COVERAGE)
 except ImportError:
-    from pipeline import evaluate_resume, evaluate_resumes_batch, evaluate_resume_fast
+    from pipeline import (evaluate_resume, evaluate_resumes_batch, evaluate_resume_fast,
+                          warm_up, model_status, ADVANCED_SEMANTIC, SEMANTIC_COVERAGE)
+
+# Load the semantic model in the background so the first evaluation does not pay the cold start
+if ADVANCED_SEMANTIC or SEMANTIC_COVERAGE:
+    warm_up(background=True)
 
 # ------------------------
 # Page Config & Custom CSS
@@ -345,6 +352,10 @@ with st.sidebar.expander("⚙️ Advanced Settings", expanded=False):
     hard_match_weight = st.slider("Hard Skills Weight", 0.0, 1.0, 0.6, 0.1)
     semantic_weight = st.slider("Semantic Match Weight", 0.0, 1.0, 0.4, 0.1)
 
+    if ADVANCED_SEMANTIC or SEMANTIC_COVERAGE:
+        status = model_status()
+        st.caption(f"Semantic model: {status['state']}" + (f" ({status['error']})" if status["error"] else ""))
+
     st.markdown("**Display Options**")
     show_detailed_feedback = st.checkbox("Show Detailed Feedback", True)
     show_skill_breakdown = st.checkbox("Show Skill Breakdown", True)
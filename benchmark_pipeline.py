@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+Benchmark script for the resume evaluation pipeline.
+
+Runs against the sample resumes in data/resumes. Pass benchmark names on the
+command line to run a subset, e.g. `python benchmark_pipeline.py batch`.
+"""
+
+import sys
+import os
+import glob
+import io
+import time
+import zipfile
+
+# Measure real extraction work, not extracted-text cache hits
+os.environ["RESUME_TEXT_CACHE"] = ""
+
+# Add script directory to path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "script"))
+
+from script.pipeline import evaluate_resumes_batch
+from script.parse_resume import (sniff_format, _peek_header, extract_text_fast, PDF_BACKENDS,
+                                 extract_text_parallel, count_pdf_pages, get_memory_stats,
+                                 probe_pdf_text_layer)
+from script.memory_usage import process_memory
+from script.parse_jd import extract_skills, TECHNICAL_SKILLS, SOFT_SKILLS
+from script.skill_matcher import SkillMatcher
+import script.skill_matcher as skill_matcher
+from script.skill_taxonomy import get_skill_taxonomy
+from script.fuzzy_index import FuzzyIndex
+from fuzzywuzzy import fuzz
+from script.hard_match import calculate_hard_score, calculate_hard_scores_batch, MATCH_FUZZY
+# The module the pipeline scores through (imported by its bare name), so one model is loaded
+from semantic_match import calculate_semantic_score, SENTENCE_TRANSFORMERS_AVAILABLE
+from script.model_store import measure_worker_startup, local_model_path, MODEL_DIR
+from script.quantization import quantize_dynamic_int8, parity_report, print_report as print_parity_report
+
+RESUME_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "resumes")
+
+JD_TEXT = """
+Senior Full Stack Developer
+Required Skills: python, javascript, react, django, sql, postgresql, aws, docker, git.
+Experience with kubernetes, machine learning and rest api design.
+Strong communication, leadership and problem solving skills.
+"""
+
+class BenchUpload(io.BytesIO):
+    """In-memory upload; Streamlit's UploadedFile is also a BytesIO subclass"""
+    def __init__(self, name, content):
+        super().__init__(content)
+        self.name = name
+
+def load_corpus(repeat=1):
+    """Load data/resumes as in-memory uploads, optionally repeated to make a bigger batch"""
+    uploads = []
+    for i in range(repeat):
+        for path in sorted(glob.glob(os.path.join(RESUME_DIR, "*.pdf"))):
+            with open(path, 'rb') as f:
+                uploads.append(BenchUpload(f"{i}-{os.path.basename(path)}", f.read()))
+    return uploads
+
+def time_function(func, *args, **kwargs):
+    """Time a function execution"""
+    start_time = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start_time
+
+def bench_batch():
+    """Thread pool vs process pool throughput for evaluate_resumes_batch"""
+    print("\n📦 Batch executor scaling (evaluate_resumes_batch)")
+
+    uploads = load_corpus(repeat=4)
+    cpus = os.cpu_count() or 1
+
+    _, baseline = time_function(evaluate_resumes_batch, uploads, JD_TEXT, max_workers=2)
+    print(f"   📊 threads (capped at 2): {baseline:.2f}s for {len(uploads)} resumes "
+          f"({len(uploads) / baseline:.1f} resumes/s)")
+
+    workers = 1
+    while workers <= cpus:
+        _, duration = time_function(evaluate_resumes_batch, uploads, JD_TEXT,
+                                    max_workers=workers, use_processes=True)
+        print(f"   📊 processes x{workers:<2}: {duration:.2f}s "
+              f"({len(uploads) / duration:.1f} resumes/s, {baseline / duration:.2f}x vs threads)")
+        workers *= 2
+
+def _legacy_dispatch(upload):
+    """Format check used by extract_text before sniffing: full copy plus a UTF-8 decode attempt"""
+    content = upload.getvalue()
+    try:
+        content.decode('utf-8')
+        return "text"
+    except UnicodeDecodeError:
+        return "pdf"
+
+def bench_sniff(rounds=200):
+    """Per-file dispatch overhead of magic-byte sniffing vs the old decode-first check"""
+    print("\n🔍 Format dispatch overhead (mixed batch)")
+
+    mixed = load_corpus()
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_performance.py"), 'rb') as f:
+        text_content = f.read()
+    docx_buffer = io.BytesIO()
+    with zipfile.ZipFile(docx_buffer, 'w') as archive:
+        archive.writestr('word/document.xml', text_content * 4)
+    for i in range(len(mixed) // 2):
+        mixed.append(BenchUpload(f"resume-{i}.txt", text_content))
+        mixed.append(BenchUpload(f"resume-{i}.docx", docx_buffer.getvalue()))
+
+    _, legacy = time_function(lambda: [_legacy_dispatch(u) for _ in range(rounds) for u in mixed])
+    _, sniffed = time_function(lambda: [sniff_format(_peek_header(u)) for _ in range(rounds) for u in mixed])
+
+    calls = rounds * len(mixed)
+    print(f"   📊 {len(mixed)} files ({sum(len(u.getvalue()) for u in mixed) / 1024:.0f} KB)")
+    print(f"   📊 decode-first: {legacy / calls * 1e6:.1f} µs/file")
+    print(f"   📊 magic bytes : {sniffed / calls * 1e6:.1f} µs/file ({legacy / sniffed:.1f}x less overhead)")
+
+def _score(resume_text, must_have, good_to_have):
+    """Total score as computed by evaluate_resume_fast"""
+    hard_score, _ = calculate_hard_score(resume_text, must_have)
+    return hard_score + calculate_semantic_score(resume_text, must_have + good_to_have)
+
+def bench_backends(rounds=3):
+    """Throughput and score parity of the PDF text backends"""
+    print("\n📄 PDF backend throughput and score parity")
+
+    uploads = load_corpus()
+    must_have, good_to_have = extract_skills(JD_TEXT)
+    reference = {}
+
+    for backend in PDF_BACKENDS:
+        texts, duration = time_function(
+            lambda: [extract_text_fast(u, backend=backend) for _ in range(rounds) for u in uploads])
+        scores = [_score(text, must_have, good_to_have) for text in texts[:len(uploads)]]
+        line = (f"   📊 {backend:<10}: {len(texts) / duration:.1f} docs/s "
+                f"({duration / len(texts) * 1000:.0f} ms/doc)")
+        if reference:
+            deltas = [abs(a - b) for a, b in zip(scores, reference["scores"])]
+            line += (f", score delta max {max(deltas):.2f} / mean {sum(deltas) / len(deltas):.2f}, "
+                     f"{reference['duration'] / duration:.2f}x vs {reference['name']}")
+        else:
+            reference = {"name": backend, "scores": scores, "duration": duration}
+        print(line)
+
+def bench_pages():
+    """Full-document extraction of a long CV, sequential vs split across processes"""
+    print("\n📚 Intra-document parallel page extraction")
+
+    import pypdfium2
+    document = pypdfium2.PdfDocument.new()
+    for upload in load_corpus():
+        document.import_pages(pypdfium2.PdfDocument(upload.getvalue()))
+    buffer = io.BytesIO()
+    document.save(buffer)
+    long_cv = BenchUpload("long-cv.pdf", buffer.getvalue())
+    pages = count_pdf_pages(long_cv.getvalue())
+
+    _, baseline = time_function(extract_text_parallel, long_cv, workers=1)
+    print(f"   📊 {pages} pages sequential: {baseline:.2f}s")
+    workers = 2
+    while workers <= max(2, os.cpu_count() or 1):
+        _, duration = time_function(extract_text_parallel, long_cv, workers=workers, threshold=2)
+        print(f"   📊 {pages} pages x{workers:<2} processes: {duration:.2f}s ({baseline / duration:.2f}x)")
+        workers *= 2
+
+def bench_memory(documents=1000):
+    """RSS over a large batch: default pdfplumber vs the memory-capped backend"""
+    print(f"\n🧠 Memory over a {documents}-resume batch")
+
+    corpus = load_corpus()
+    for backend in ("pdfplumber", "pdfplumber-lowmem"):
+        samples = []
+        start = time.perf_counter()
+        for i in range(documents):
+            upload = corpus[i % len(corpus)]
+            extract_text_fast(BenchUpload(upload.name, upload.getvalue()), backend=backend)
+            if (i + 1) % (documents // 10) == 0:
+                samples.append(process_memory()[0] / (1024 * 1024))
+        duration = time.perf_counter() - start
+        print(f"   📊 {backend:<18} {duration:.2f}s, RSS {samples[0]:.0f} -> {samples[-1]:.0f} MB "
+              f"(growth after first tenth {samples[-1] - samples[0]:+.1f} MB)")
+
+    stats = get_memory_stats()
+    print(f"   📊 lowmem per-document peak RSS growth: max {stats['max_peak_rss_mb']} MB, "
+          f"{stats['downgraded']} downgraded, {stats['refused']} refused, {stats['truncated']} truncated")
+
+def scanned_copy(content, dpi=150):
+    """Rasterise every page of a PDF into an image-only PDF, like a scanned resume"""
+    import pypdfium2
+    source = pypdfium2.PdfDocument(content)
+    scanned = pypdfium2.PdfDocument.new()
+    for page in source:
+        width, height = page.get_size()
+        image = pypdfium2.PdfImage.new(scanned)
+        image.set_bitmap(page.render(scale=dpi / 72, grayscale=True))
+        image.set_matrix(pypdfium2.PdfMatrix().scale(width, height))
+        new_page = scanned.new_page(width, height)
+        new_page.insert_obj(image)
+        new_page.gen_content()
+    buffer = io.BytesIO()
+    scanned.save(buffer)
+    return buffer.getvalue()
+
+def bench_probe(rounds=20):
+    """Cost of the image-only probe on text PDFs, and what it saves on scanned ones"""
+    print("\n🖼️  Image-only PDF probe")
+
+    corpus = load_corpus()
+    scans = [BenchUpload(upload.name, scanned_copy(upload.getvalue())) for upload in corpus]
+    for label, uploads in (("text PDFs", corpus), ("scanned PDFs", scans)):
+        _, probe = time_function(lambda: [probe_pdf_text_layer(u) for _ in range(rounds) for u in uploads])
+        _, extract = time_function(lambda: [extract_text_fast(u) for _ in range(rounds) for u in uploads])
+        runs = rounds * len(uploads)
+        print(f"   📊 {label:<13} probe {probe / runs * 1000:.2f} ms/file, "
+              f"extraction {extract / runs * 1000:.2f} ms/file ({probe / extract:.1%} of extraction)")
+    assert all(probe_pdf_text_layer(u) == "image" for u in scans)
+
+def skill_vocabulary(texts, size):
+    """Built-in skills padded with words and word pairs from the resumes, up to `size` entries"""
+    vocabulary = dict.fromkeys(TECHNICAL_SKILLS + SOFT_SKILLS)
+    for text in texts:
+        words = [word.strip(".,;:()|") for word in text.split()]
+        for pair in zip(words, words[1:]):
+            for candidate in (pair[0], " ".join(pair)):
+                if len(vocabulary) < size and len(candidate) > 1 and candidate.isascii():
+                    vocabulary.setdefault(candidate)
+    # Pad with made-up tools so large vocabularies are mostly skills the resumes don't mention
+    for i in range(size - len(vocabulary)):
+        vocabulary.setdefault(f"toolkit{i} framework")
+    return list(vocabulary)[:size]
+
+def bench_skills(rounds=5):
+    """Naive substring scan vs the matcher's whole-word substring scan and trie walk, as the vocabulary grows"""
+    print("\n🧩 Skill matching throughput")
+
+    texts = [extract_text_fast(upload) for upload in load_corpus()]
+    megabytes = rounds * sum(len(text) for text in texts) / 1e6
+    threshold = skill_matcher.SUBSTRING_SCAN_MAX_PHRASES
+    for size in (60, 300, 500, 2000, 5000):
+        vocabulary = skill_vocabulary(texts, size)
+        _, naive = time_function(lambda: [[s for s in vocabulary if s in t] for _ in range(rounds) for t in texts])
+        line = f"   📊 {len(vocabulary):>5} skills: naive substring {megabytes / naive:6.2f} MB/s"
+        try:
+            for name, limit in (("substring scan", len(vocabulary)), ("trie walk", 0)):
+                skill_matcher.SUBSTRING_SCAN_MAX_PHRASES = limit
+                matcher, build = time_function(SkillMatcher, vocabulary)
+                matcher.find_all("")
+                _, duration = time_function(lambda: [matcher.find_all(t) for _ in range(rounds) for t in texts])
+                line += f", {name} {megabytes / duration:6.2f} MB/s"
+        finally:
+            skill_matcher.SUBSTRING_SCAN_MAX_PHRASES = threshold
+        chosen = "substring scan" if len(vocabulary) <= threshold else "trie walk"
+        print(f"{line} (uses {chosen})")
+
+JD_BLURB = """
+About us: founded in {year}, we are a team of {people} people building software that helps
+customers around the world plan, track and grow their business. Our culture values ownership,
+curiosity and kindness, and we invest in every team member's growth with mentoring, a learning
+budget and regular hack weeks. Our platform runs on aws and serves {users} million users.
+Benefits include flexible hours, remote work, health insurance and {days} days of paid leave.
+We are an equal opportunity employer and welcome applicants from every background.
+"""
+
+def long_jd(size):
+    """A JD of about `size` characters: company blurb first, the requirements (JD_TEXT) at the end"""
+    blurb = []
+    while sum(map(len, blurb)) < size - len(JD_TEXT):
+        i = len(blurb)
+        blurb.append(JD_BLURB.format(year=1990 + i % 30, people=50 + i, users=i % 9 + 1, days=20 + i % 10))
+    return ("".join(blurb)[:max(size - len(JD_TEXT), 0)] + JD_TEXT)
+
+def bench_jd_scan(rounds=200):
+    """Long JDs: the old 2000-character truncated scan vs a full single pass vs the streaming scanner"""
+    print("\n📜 JD scanning by length")
+
+    matcher = get_skill_taxonomy().matcher
+    for size in (2_000, 10_000, 50_000):
+        jd = long_jd(size)
+        truncated_skills, _ = time_function(matcher.find_ordered, jd[:2000].lower())
+        _, truncated = time_function(lambda: [matcher.find_ordered(jd[:2000].lower()) for _ in range(rounds)])
+        _, full = time_function(lambda: [matcher.find_ordered(jd) for _ in range(rounds // 10)])
+        skills, streaming = time_function(lambda: [extract_skills(jd) for _ in range(rounds)])
+        found = len(skills[0][0]) + len(skills[0][1])
+        print(f"   📊 {len(jd) / 1000:4.0f} KB: truncated {truncated / rounds * 1000:.2f} ms "
+              f"({len(truncated_skills)} skills), full pass {full / (rounds // 10) * 1000:.2f} ms, "
+              f"streaming {streaming / rounds * 1000:.2f} ms ({found} skills)")
+
+def misspelled(skill):
+    """The skill with its middle character dropped, a typo fuzzy matching should still score"""
+    middle = len(skill) // 2
+    return skill[:middle] + skill[middle + 1:]
+
+def bench_fuzzy():
+    """fuzz.partial_ratio per skill vs the per-resume FuzzyIndex, on normal and long resumes"""
+    print("\n🔍 Fuzzy skill matching")
+
+    texts = [extract_text_fast(upload).lower() for upload in load_corpus()]
+    skills = [skill for skill in get_skill_taxonomy().categories if len(skill) > 3]
+    skills += [misspelled(skill) for skill in skills]
+    for label, corpus in (("resumes", texts), ("long resumes", [" ".join(texts)] * 2)):
+        expected, present = time_function(lambda: [[fuzz.partial_ratio(s, t) for s in skills] for t in corpus])
+        scores, indexed = time_function(lambda: [[index.partial_ratio(s) for s in skills]
+                                                 for index in map(FuzzyIndex, corpus)])
+        mismatches = sum(a != b for old, new in zip(expected, scores) for a, b in zip(old, new))
+        per_skill = 1000 / (len(corpus) * len(skills))
+        print(f"   📊 {len(corpus)} {label} ({sum(map(len, corpus)) // len(corpus)} chars) x {len(skills)} skills: "
+              f"partial_ratio {present * per_skill:.3f} ms/skill, index {indexed * per_skill:.3f} ms/skill "
+              f"({present / indexed:.1f}x), {mismatches} score mismatches")
+
+def bench_hard_batch(copies=20):
+    """calculate_hard_score per resume vs one calculate_hard_scores_batch call over the whole batch"""
+    print("\n🧮 Batch hard matching")
+
+    texts = [extract_text_fast(upload) for upload in load_corpus()] * copies
+    must_have = extract_skills(JD_TEXT)[0]
+    workloads = [("JD skills", must_have),
+                 ("JD + misspelled skills", must_have + [misspelled(skill) for skill in must_have if len(skill) > 3])]
+    for label, skills in workloads:
+        expected, single = time_function(lambda: [calculate_hard_score(text, skills) for text in texts])
+        (matrix, scores, missing), batch = time_function(lambda: calculate_hard_scores_batch(texts, skills))
+        mismatches = sum((int(score), row_missing) != row
+                         for score, row_missing, row in zip(scores, missing, expected))
+        fuzzy = int((matrix == MATCH_FUZZY).sum())
+        print(f"   📊 {label}: {len(texts)} resumes x {len(skills)} skills, {fuzzy} fuzzy matches: "
+              f"per resume {single * 1000:.1f} ms, batch {batch * 1000:.1f} ms ({single / batch:.1f}x), "
+              f"{mismatches} mismatches")
+
+def bench_model_startup(workers=2):
+    """Semantic model cold start per worker: load by name vs from RESUME_MODEL_DIR, with RSS and PSS"""
+    print("\n🚀 Semantic model cold start")
+
+    if not SENTENCE_TRANSFORMERS_AVAILABLE:
+        print("   ⏭️  sentence-transformers not installed, skipped")
+        return
+    sources = [("by name", None)]
+    if local_model_path():
+        sources.append(("local dir", MODEL_DIR))
+    else:
+        print("   ℹ️  Set RESUME_MODEL_DIR (see script/model_store.py export) to compare a local model")
+
+    mb = lambda value: f"{value / 1024 / 1024:.0f} MB" if value is not None else "n/a"
+    for label, directory in sources:
+        if directory:
+            os.environ["RESUME_MODEL_DIR"] = directory
+        else:
+            os.environ.pop("RESUME_MODEL_DIR", None)
+        for i, report in enumerate(measure_worker_startup(workers)):
+            print(f"   📊 {label} worker {i}: load {report['load_seconds']:.2f}s, "
+                  f"first encode {report['first_encode_seconds']:.2f}s, RSS {mb(report['rss'])}, "
+                  f"PSS {mb(report['pss'])}, shared {mb(report['shared'])} ({report['state']})")
+    if MODEL_DIR:
+        os.environ["RESUME_MODEL_DIR"] = MODEL_DIR
+
+def bench_quantized():
+    """fp32 vs int8 dynamically quantized model: chunk throughput and semantic score deviation"""
+    print("\n🔢 Quantized semantic model")
+
+    if not SENTENCE_TRANSFORMERS_AVAILABLE:
+        print("   ⏭️  sentence-transformers not installed, skipped")
+        return
+    from semantic_match import _load_model
+
+    texts = [extract_text_fast(upload) for upload in load_corpus()]
+    fp32_model = _load_model("fp32")
+    print_parity_report(parity_report([text for text in texts if text], extract_skills(JD_TEXT)[0],
+                                      fp32_model, quantize_dynamic_int8(fp32_model)))
+
+BENCHMARKS = {
+    "batch": bench_batch,
+    "sniff": bench_sniff,
+    "backends": bench_backends,
+    "pages": bench_pages,
+    "memory": bench_memory,
+    "probe": bench_probe,
+    "skills": bench_skills,
+    "jd_scan": bench_jd_scan,
+    "fuzzy": bench_fuzzy,
+    "hard_batch": bench_hard_batch,
+    "model_startup": bench_model_startup,
+    "quantized": bench_quantized,
+}
+
+def main(names):
+    """Run the selected benchmarks (all of them by default)"""
+    print("⏱️  Resume Pipeline Benchmarks")
+    print("=" * 50)
+
+    for name in names or BENCHMARKS:
+        if name not in BENCHMARKS:
+            print(f"❌ Unknown benchmark: {name} (choose from {', '.join(BENCHMARKS)})")
+            return False
+        BENCHMARKS[name]()
+
+    print("\n" + "=" * 50)
+    return True
+
+if __name__ == "__main__":
+    success = main(sys.argv[1:])
+    sys.exit(0 if success else 1)
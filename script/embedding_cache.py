@@ -0,0 +1,244 @@
+# Persistent cache of text embeddings: float16 rows in a memory-mapped file, indexed in SQLite
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+import numpy as np
+
+DEFAULT_MAX_ENTRIES = 50000
+
+# Hits are kept in memory and their access times written to the index with the next put_many,
+# or once this many are pending (skipped, not waited for, while another process holds the lock)
+ACCESS_FLUSH_ENTRIES = 256
+
+def embedding_key(text, model_name, policy):
+    """Cache key of one text's embedding: content digest, model and truncation policy"""
+    digest = hashlib.sha256(text.encode('utf-8', errors='surrogatepass')).hexdigest()
+    return f"{digest}:{model_name}:{policy}"
+
+class EmbeddingCache:
+    """
+    LRU cache of embedding vectors shared by every process using `directory`.
+
+    Vectors are stored as float16 rows of vectors-<dimensions>.f16, a file
+    of max_entries fixed-size slots that each process memory-maps, so
+    readers share it through the page cache. index.db maps keys to slots,
+    with a CRC of the row and the last access time. A writer holds the
+    SQLite write lock while it recycles the least recently used slot, writes
+    the row and indexes it. Readers never wait for that lock: they check the
+    CRC of the row they read and treat a mismatch (a slot rewritten under
+    them) as a miss, and their hits update the LRU order in batches (see
+    ACCESS_FLUSH_ENTRIES), so eviction order lags reads slightly.
+    """
+
+    def __init__(self, directory, max_entries=DEFAULT_MAX_ENTRIES):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._arrays = {}  # dimensions -> np.memmap
+        self._accessed = {}  # key -> last hit time not yet written to the index
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self):
+        if not self._initialized:
+            os.makedirs(self.directory, exist_ok=True)
+        conn = sqlite3.connect(os.path.join(self.directory, "index.db"), timeout=30)
+        if not self._initialized:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                dimensions INTEGER,
+                slot INTEGER,
+                checksum INTEGER,
+                last_access REAL
+            )''')
+            conn.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_embeddings_slot ON embeddings (dimensions, slot)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_embeddings_access ON embeddings (last_access)')
+            conn.commit()
+            self._initialized = True
+        return conn
+
+    def _array(self, dimensions):
+        """The memory-mapped slot file for vectors of this size, grown to max_entries slots"""
+        with self._lock:
+            array = self._arrays.get(dimensions)
+            if array is not None and len(array) >= self.max_entries:
+                return array
+            path = os.path.join(self.directory, f"vectors-{dimensions}.f16")
+            size = self.max_entries * dimensions * 2
+            with open(path, "ab") as f:
+                if f.tell() < size:
+                    f.truncate(size)
+            rows = os.path.getsize(path) // (dimensions * 2)
+            array = np.memmap(path, dtype=np.float16, mode="r+", shape=(rows, dimensions))
+            self._arrays[dimensions] = array
+            return array
+
+    def get_many(self, keys):
+        """Cached vectors (float32) for keys, None for each miss"""
+        vectors = [None] * len(keys)
+        if not keys:
+            return vectors
+        try:
+            conn = self._connect()
+            try:
+                rows = {}
+                for start in range(0, len(keys), 500):
+                    batch = keys[start:start + 500]
+                    rows.update((row[0], row[1:]) for row in conn.execute(
+                        f'SELECT key, dimensions, slot, checksum FROM embeddings WHERE key IN '
+                        f'({",".join("?" * len(batch))})', batch))
+
+                found = []
+                for i, key in enumerate(keys):
+                    if key not in rows:
+                        continue
+                    dimensions, slot, checksum = rows[key]
+                    array = self._array(dimensions)
+                    if slot >= len(array):
+                        continue
+                    row = np.array(array[slot])
+                    if zlib.crc32(row.tobytes()) == checksum:
+                        vectors[i] = row.astype(np.float32)
+                        found.append(key)
+
+                if found:
+                    now = time.time()
+                    with self._lock:
+                        self._accessed.update((key, now) for key in found)
+                        flush = len(self._accessed) >= ACCESS_FLUSH_ENTRIES
+                    if flush:
+                        self._flush_access(conn, wait=False)
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"Embedding cache unavailable: {e}")
+
+        with self._lock:
+            hits = sum(vector is not None for vector in vectors)
+            self.hits += hits
+            self.misses += len(keys) - hits
+        return vectors
+
+    def _flush_access(self, conn, wait=True):
+        """
+        Write pending hit times to the index. With wait=False, gives up (and
+        keeps them pending) if another connection holds the write lock.
+        """
+        with self._lock:
+            accessed, self._accessed = self._accessed, {}
+        if not accessed:
+            return
+        try:
+            if not wait:
+                conn.execute('PRAGMA busy_timeout = 0')
+                conn.execute('BEGIN IMMEDIATE')
+            conn.executemany('UPDATE embeddings SET last_access = ? WHERE key = ? AND last_access < ?',
+                             [(at, key, at) for key, at in accessed.items()])
+            if not wait:
+                conn.commit()
+        except sqlite3.OperationalError:
+            if wait:
+                raise
+            with self._lock:
+                for key, at in accessed.items():
+                    self._accessed.setdefault(key, at)
+
+    def put_many(self, keys, vectors):
+        """Store one vector per key, evicting the least recently used slots when full"""
+        if not len(keys):
+            return
+        vectors = np.asarray(vectors, dtype=np.float16)
+        dimensions = vectors.shape[1]
+        try:
+            array = self._array(dimensions)
+            conn = self._connect()
+            try:
+                conn.execute('BEGIN IMMEDIATE')
+                self._flush_access(conn)  # so recent hits are not the slots recycled below
+                now = time.time()
+                for key, vector in zip(keys, vectors):
+                    existing = conn.execute('SELECT slot FROM embeddings WHERE key = ? AND dimensions = ?',
+                                            (key, dimensions)).fetchone()
+                    if existing is not None:
+                        slot = existing[0]
+                    else:
+                        used = conn.execute('SELECT COUNT(*) FROM embeddings WHERE dimensions = ?',
+                                            (dimensions,)).fetchone()[0]
+                        if used < self.max_entries:
+                            slot = used
+                        else:
+                            # Recycle the least recently used slot; readers of the old key fail its CRC
+                            evicted, slot = conn.execute('''SELECT key, slot FROM embeddings WHERE dimensions = ?
+                                                            ORDER BY last_access LIMIT 1''', (dimensions,)).fetchone()
+                            conn.execute('DELETE FROM embeddings WHERE key = ?', (evicted,))
+                            with self._lock:
+                                self.evictions += 1
+                    array[slot] = vector
+                    conn.execute('''INSERT OR REPLACE INTO embeddings (key, dimensions, slot, checksum, last_access)
+                                    VALUES (?, ?, ?, ?, ?)''',
+                                 (key, dimensions, slot, zlib.crc32(vector.tobytes()), now))
+                array.flush()
+                conn.commit()
+            finally:
+                conn.close()
+        except (sqlite3.Error, OSError) as e:
+            print(f"Embedding cache unavailable: {e}")
+
+    def stats(self):
+        """Hit, miss and eviction counters plus the number of stored vectors"""
+        entries = 0
+        try:
+            conn = self._connect()
+            try:
+                entries = conn.execute('SELECT COUNT(*) FROM embeddings').fetchone()[0]
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            pass
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "directory": self.directory,
+            }
+
+    def clear(self):
+        """Drop every entry and reset the counters"""
+        conn = self._connect()
+        try:
+            conn.execute('DELETE FROM embeddings')
+            conn.commit()
+        finally:
+            conn.close()
+        with self._lock:
+            self.hits = self.misses = self.evictions = 0
+            self._accessed = {}
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_embedding_cache():
+    """
+    Shared cache instance configured from the environment, or None.
+
+    RESUME_EMBEDDING_CACHE_DIR enables the cache in that directory;
+    RESUME_EMBEDDING_CACHE_SIZE bounds the number of stored vectors.
+    """
+    global _cache
+    directory = os.getenv("RESUME_EMBEDDING_CACHE_DIR")
+    if not directory:
+        return None
+    with _cache_lock:
+        if _cache is None or _cache.directory != directory:
+            _cache = EmbeddingCache(directory, int(os.getenv("RESUME_EMBEDDING_CACHE_SIZE", DEFAULT_MAX_ENTRIES)))
+        return _cache
@@ -0,0 +1,203 @@
+# Killable worker processes for resume text extraction with per-document time and memory limits
+import io
+import multiprocessing
+import os
+import time
+from collections import deque
+from multiprocessing.connection import wait
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    # Not available on Windows; the parent-side RSS watchdog still applies
+    RESOURCE_AVAILABLE = False
+
+try:
+    from parse_resume import extract_text, ImageOnlyPDFError
+    from memory_usage import process_memory
+except ImportError:
+    from script.parse_resume import extract_text, ImageOnlyPDFError
+    from script.memory_usage import process_memory
+
+DEFAULT_TIMEOUT = 30  # seconds per document
+DEFAULT_MEMORY_LIMIT_MB = 512  # per document, on top of the idle worker's footprint
+POLL_INTERVAL = 0.05
+
+class _WorkerUpload(io.BytesIO):
+    """Upload rebuilt from bytes inside the worker"""
+    def __init__(self, data, name):
+        super().__init__(data)
+        self.name = name
+
+def _worker_main(conn, memory_limit):
+    """
+    Worker loop: receive (name, bytes, backend, skills, full_document),
+    send back ("ok", text), ("needs_ocr", message) or ("error", message)
+    """
+    if RESOURCE_AVAILABLE and memory_limit:
+        # Hard address-space ceiling so runaway allocations fail inside the worker
+        _, vms = process_memory(os.getpid())
+        if vms:
+            try:
+                resource.setrlimit(resource.RLIMIT_AS, (vms + memory_limit * 2, resource.RLIM_INFINITY))
+            except (ValueError, OSError):
+                pass
+
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            break
+        if task is None:
+            break
+
+        name, data, backend, required_skills, full_document = task
+        try:
+            text = extract_text(_WorkerUpload(data, name), backend=backend, required_skills=required_skills,
+                                full_document=full_document)
+            conn.send(("ok", text))
+        except MemoryError:
+            conn.send(("memory", "Extraction exceeded the memory limit"))
+        except ImageOnlyPDFError as e:
+            conn.send(("needs_ocr", str(e)))
+        except Exception as e:
+            conn.send(("error", f"Extraction error: {str(e)}"))
+
+class _Worker:
+    """One sandboxed extraction process and its pipe"""
+
+    def __init__(self, context, memory_limit):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, memory_limit), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def kill(self):
+        try:
+            self.process.kill()
+            self.process.join(timeout=5)
+        except Exception:
+            pass
+        self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+            self.process.join(timeout=2)
+        except Exception:
+            pass
+        if self.process.is_alive():
+            self.kill()
+        else:
+            self.conn.close()
+
+class ExtractionSandbox:
+    """
+    Pool of killable extraction workers.
+
+    Each document gets a wall-clock budget and a memory budget measured
+    against the worker's idle RSS. A worker that overruns either budget,
+    crashes, or hits its RLIMIT_AS ceiling is killed and replaced. The
+    document comes back as an error and the rest of the batch continues.
+    """
+
+    def __init__(self, workers=None, timeout=DEFAULT_TIMEOUT, memory_limit_mb=DEFAULT_MEMORY_LIMIT_MB):
+        self.size = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.memory_limit = int(memory_limit_mb * 1024 * 1024) if memory_limit_mb else None
+        self.respawns = 0
+        self._context = multiprocessing.get_context()
+        self._workers = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _spawn(self):
+        return _Worker(self._context, self.memory_limit)
+
+    def _replace(self, worker):
+        worker.kill()
+        self._workers[self._workers.index(worker)] = self._spawn()
+        self.respawns += 1
+
+    def extract_many(self, documents, backend=None, required_skills=None, full_document=False):
+        """
+        Extract text for a list of (name, bytes) documents.
+        required_skills enables streaming extraction and full_document=True
+        extracts every page (see parse_resume.extract_text); the timeout
+        still applies to the whole document.
+
+        Returns one (text, error, seconds) tuple per document, in input order;
+        exactly one of text and error is set. The error is a message, or an
+        ImageOnlyPDFError for scanned PDFs that need OCR.
+        """
+        results = [None] * len(documents)
+        pending = deque(range(len(documents)))
+        busy = {}  # worker -> (document index, start time, idle rss)
+
+        while len(self._workers) < min(self.size, len(documents)):
+            self._workers.append(self._spawn())
+
+        while pending or busy:
+            for worker in list(self._workers):
+                if worker in busy or not pending:
+                    continue
+                index = pending.popleft()
+                name, data = documents[index]
+                idle_rss, _ = process_memory(worker.process.pid)
+                try:
+                    worker.conn.send((name, data, backend, required_skills, full_document))
+                except (OSError, EOFError):
+                    results[index] = (None, "Extraction worker unavailable", 0)
+                    self._replace(worker)
+                    continue
+                busy[worker] = (index, time.monotonic(), idle_rss)
+
+            ready = wait([worker.conn for worker in busy], timeout=POLL_INTERVAL)
+            for worker in [w for w in busy if w.conn in ready]:
+                index, started, _ = busy.pop(worker)
+                elapsed = time.monotonic() - started
+                try:
+                    status, payload = worker.conn.recv()
+                except (EOFError, OSError):
+                    results[index] = (None, "Extraction worker crashed", elapsed)
+                    self._replace(worker)
+                    continue
+
+                if status == "ok":
+                    results[index] = (payload, None, elapsed)
+                elif status == "needs_ocr":
+                    results[index] = (None, ImageOnlyPDFError(payload), elapsed)
+                else:
+                    results[index] = (None, payload, elapsed)
+                    if status == "memory":
+                        # The heap may be left fragmented; start from a clean process
+                        self._replace(worker)
+
+            now = time.monotonic()
+            for worker, (index, started, idle_rss) in list(busy.items()):
+                elapsed = now - started
+                if self.timeout and elapsed > self.timeout:
+                    error = f"Extraction timed out after {self.timeout}s"
+                elif self.memory_limit and idle_rss is not None:
+                    rss, _ = process_memory(worker.process.pid)
+                    if rss is None or rss - idle_rss <= self.memory_limit:
+                        continue
+                    error = f"Extraction exceeded the {self.memory_limit // (1024 * 1024)} MB memory limit"
+                else:
+                    continue
+                del busy[worker]
+                results[index] = (None, error, elapsed)
+                self._replace(worker)
+
+        return results
+
+    def close(self):
+        """Stop all workers"""
+        for worker in self._workers:
+            worker.stop()
+        self._workers = []
@@ -7,6 +7,16 @@ except ImportError:
     print("Warning: OpenAI package not available. Using basic feedback generation.")
     OPENAI_AVAILABLE = False
 
+try:
+    from skill_matcher import get_skill_matcher
+    from skill_taxonomy import get_skill_taxonomy
+except ImportError:
+    from script.skill_matcher import get_skill_matcher
+    from script.skill_taxonomy import get_skill_taxonomy
+
+# Most common technologies checked by the rule-based feedback
+QUICK_SKILLS = ['python', 'java', 'javascript', 'react', 'sql', 'aws']
+
 def generate_feedback(resume_text, jd_text):
     """
     Generate feedback for resume improvement using OpenAI API.
@@ -49,9 +59,13 @@ def generate_simple_feedback(resume_text, jd_text):
 
     feedback_points = []
 
-    # Quick skill check with most common technologies
-    quick_skills = ['python', 'java', 'javascript', 'react', 'sql', 'aws']
-    missing_tech = [skill for skill in quick_skills if skill in jd_lower and skill not in resume_lower]
+    # Quick skill check with most common technologies (whole words, so 'java' is not found in 'javascript',
+    # and aliases count, so 'js' on a resume covers 'javascript')
+    taxonomy = get_skill_taxonomy()
+    matcher = taxonomy.matcher if taxonomy is not None else get_skill_matcher(QUICK_SKILLS)
+    resume_skills = matcher.find_all(resume_lower)
+    missing_tech = [skill for skill in matcher.find_ordered(jd_lower)
+                    if skill in QUICK_SKILLS and skill not in resume_skills]
 
     if missing_tech:
         feedback_points.append(f"Add skills: {', '.join(missing_tech[:2])}")
@@ -0,0 +1,58 @@
+# Per-resume index for fuzzy skill matching, built once and shared by every skill
+from difflib import SequenceMatcher
+
+try:
+    from fuzzywuzzy import fuzz
+    FUZZYWUZZY_AVAILABLE = True
+except ImportError:
+    FUZZYWUZZY_AVAILABLE = False
+
+class FuzzyIndex:
+    """
+    fuzz.partial_ratio(skill, text) for many skills against one text.
+
+    partial_ratio aligns equally long windows of the text on the blocks a
+    SequenceMatcher finds between skill and text, and keeps the best window
+    ratio. Finding those blocks needs the matcher's character index of the
+    text (position lists per character, with very common characters dropped
+    by difflib's autojunk heuristic); fuzzywuzzy rebuilds it for every skill,
+    here it is built once per text. Windows are then compared cheapest bound
+    first, skipping any that cannot beat the best so far, so scores are
+    identical to fuzzywuzzy's.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        # fuzzywuzzy uses python-Levenshtein's matcher when installed; it has no reusable index
+        self._matcher = None
+        if FUZZYWUZZY_AVAILABLE and fuzz.SequenceMatcher is SequenceMatcher:
+            self._matcher = SequenceMatcher(None, "", text)
+        self.windows_compared = 0
+
+    def partial_ratio(self, pattern):
+        """Same value as fuzz.partial_ratio(pattern, text), 0-100"""
+        if not pattern or not self.text:
+            return 0
+        if self._matcher is None or len(pattern) > len(self.text):
+            if FUZZYWUZZY_AVAILABLE:
+                return fuzz.partial_ratio(pattern, self.text)
+            return 100 if pattern in self.text else 0
+
+        self._matcher.set_seq1(pattern)
+        window = SequenceMatcher(None, pattern, "")
+        best = 0.0
+        starts = set()
+        for pattern_start, text_start, _ in self._matcher.get_matching_blocks():
+            start = max(text_start - pattern_start, 0)
+            if start in starts:
+                continue
+            starts.add(start)
+            window.set_seq2(self.text[start:start + len(pattern)])
+            if window.real_quick_ratio() <= best or window.quick_ratio() <= best:
+                continue
+            self.windows_compared += 1
+            ratio = window.ratio()
+            if ratio > .995:
+                return 100
+            best = max(best, ratio)
+        return int(round(100 * best))
@@ -1,10 +1,36 @@
+import re
+
 try:
-    from fuzzywuzzy import fuzz
+    import fuzzywuzzy  # noqa: F401 -- FuzzyIndex reproduces its scores; only its presence enables fuzzy matching
     FUZZYWUZZY_AVAILABLE = True
 except ImportError:
     print("Warning: fuzzywuzzy not available. Using basic string matching.")
     FUZZYWUZZY_AVAILABLE = False
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    print("Warning: numpy not available. Batch hard matching scores resumes one at a time.")
+    NUMPY_AVAILABLE = False
+
+try:
+    from skill_matcher import get_skill_matcher, phrase_pattern, is_glued, word_set
+    from skill_taxonomy import get_skill_taxonomy
+    from fuzzy_index import FuzzyIndex
+except ImportError:
+    from script.skill_matcher import get_skill_matcher, phrase_pattern, is_glued, word_set
+    from script.skill_taxonomy import get_skill_taxonomy
+    from script.fuzzy_index import FuzzyIndex
+
+# Skills this short only count as exact whole-word matches
+SHORT_SKILL_LENGTH = 3
+
+# Match states in the batch score matrix and the points each one earns
+MATCH_MISSING, MATCH_EXACT, MATCH_FUZZY, MATCH_WORD = 0, 1, 2, 3
+MATCH_POINTS = (0, 10, 8, 6)
+MAX_HARD_SCORE = 50
+
 def calculate_hard_score(resume_text, must_have_skills):
     """
     Calculate hard skills score based on exact and fuzzy matching.
@@ -13,24 +39,146 @@ def calculate_hard_score(resume_text, must_have_skills):
     missing_skills = []
     resume_lower = resume_text.lower()
 
+    # Whole-word matches for every must-have skill in one pass over the resume,
+    # compared as canonical taxonomy IDs so 'k8s' on a resume satisfies 'kubernetes'
+    exact_matches = {skill.lower() for skill in get_skill_matcher(must_have_skills).find_all(resume_lower)}
+    taxonomy = get_skill_taxonomy()
+    if taxonomy is not None:
+        exact_matches.update(taxonomy.extract(resume_lower))
+
+    # Built on the first fuzzy lookup and shared by the remaining skills
+    fuzzy_index = None
+
     for skill in must_have_skills:
         skill_lower = skill.lower()
+        skill_id = (taxonomy.canonical(skill_lower) if taxonomy is not None else None) or skill_lower
 
         # Check for exact match first
-        if skill_lower in resume_lower:
+        if skill_lower in exact_matches or skill_id in exact_matches:
             score += 10
+        elif len(skill_lower) <= SHORT_SKILL_LENGTH:
+            # Short skills ('ai', 'git', 'sql') fuzzy-match almost any text; require the exact word
+            missing_skills.append(skill)
         elif FUZZYWUZZY_AVAILABLE:
-            # Use fuzzy matching if available
-            if fuzz.partial_ratio(skill_lower, resume_lower) > 70:
+            # Use fuzzy matching if available (same scores as fuzz.partial_ratio)
+            if fuzzy_index is None:
+                fuzzy_index = FuzzyIndex(resume_lower)
+            if fuzzy_index.partial_ratio(skill_lower) > 70:
                 score += 8  # Slightly lower score for fuzzy match
             else:
                 missing_skills.append(skill)
         else:
-            # Basic substring matching as fallback
-            words = skill_lower.split()
-            if any(word in resume_lower for word in words if len(word) > 2):
+            # Basic word matching as fallback
+            words = [word for word in skill_lower.split() if len(word) > 2]
+            if get_skill_matcher(words).find_all(resume_lower):
                 score += 6  # Lower score for partial word match
             else:
                 missing_skills.append(skill)
 
     return min(score, 50), missing_skills
+
+def _phrase_incidence(sources, columns, column_count):
+    """
+    Every phrase that satisfies a column exactly (a must-have skill, or a
+    taxonomy name or alias of the same canonical ID) as incidence matrices:
+    (vocabulary {word: index}, phrase x word, words per phrase, phrase x column,
+    [(phrase, regex)] for the phrases a set of words cannot settle on its own).
+    """
+    phrase_columns = {}
+    for matcher in sources:
+        for tokens, skill in matcher.phrases():
+            targets = columns.get(skill.lower())
+            if targets:
+                phrase_columns.setdefault(tokens, set()).update(targets)
+
+    vocabulary = {}
+    for tokens in phrase_columns:
+        for token in tokens:
+            if token[0].isalnum() or token[0] == "_":
+                vocabulary.setdefault(token.encode(), len(vocabulary))
+
+    phrase_words = np.zeros((len(phrase_columns), len(vocabulary)), dtype=np.int32)
+    phrase_targets = np.zeros((len(phrase_columns), column_count), dtype=np.int32)
+    patterns = []
+    for phrase, (tokens, targets) in enumerate(phrase_columns.items()):
+        words = [vocabulary[token.encode()] for token in tokens if token.encode() in vocabulary]
+        phrase_words[phrase, words] = 1
+        phrase_targets[phrase, list(targets)] = 1
+        # One word is found exactly by its presence; longer phrases or punctuation need their order checked
+        if len(tokens) > 1 or not words:
+            patterns.append((phrase, re.compile(phrase_pattern(tokens))))
+    return vocabulary, phrase_words, phrase_words.sum(axis=1), phrase_targets, patterns
+
+def _exact_matrix(resumes_lower, matcher, taxonomy, columns, column_count):
+    """
+    N x M bool matrix of exact matches, as calculate_hard_score finds them
+    with the skill matcher and the taxonomy. Each resume is reduced to the
+    set of its words (C-level translate/split), the words a phrase needs
+    are counted with one matrix product, and only multi-token candidates
+    are confirmed with a regex; a second product maps phrases to columns.
+    """
+    sources = [matcher] + ([taxonomy.matcher] if taxonomy is not None else [])
+    vocabulary, phrase_words, word_counts, phrase_targets, patterns = _phrase_incidence(sources, columns,
+                                                                                       column_count)
+    present = np.zeros((len(resumes_lower), len(vocabulary)), dtype=np.int32)
+    for row, resume_lower in enumerate(resumes_lower):
+        present[row, [vocabulary[word] for word in word_set(resume_lower).intersection(vocabulary)]] = 1
+
+    found = (present @ phrase_words.T) == word_counts
+    for phrase, pattern in patterns:
+        for row in np.flatnonzero(found[:, phrase]):
+            found[row, phrase] = any(not is_glued(resumes_lower[row], match.start())
+                                     for match in pattern.finditer(resumes_lower[row]))
+    return (found.astype(np.int32) @ phrase_targets) > 0
+
+def calculate_hard_scores_batch(resume_texts, must_have_skills):
+    """
+    Hard skills scores for N resumes against the same M must-have skills.
+
+    Returns (matrix, scores, missing_skills): an N x M uint8 array of MATCH_*
+    states, an array of N scores and N missing-skill lists, each row the same
+    as calculate_hard_score gives for that resume. Exact matches for the
+    whole batch come from matrix products over resume word sets (see
+    _exact_matrix); only long skills still missing are looked up fuzzily,
+    with one index per resume. Without numpy the matrix is None and resumes
+    are scored one at a time.
+    """
+    if not NUMPY_AVAILABLE:
+        rows = [calculate_hard_score(resume_text, must_have_skills) for resume_text in resume_texts]
+        return None, [score for score, _ in rows], [missing for _, missing in rows]
+
+    skills_lower = [skill.lower() for skill in must_have_skills]
+    resumes_lower = [resume_text.lower() for resume_text in resume_texts]
+    taxonomy = get_skill_taxonomy()
+
+    # Lowercase skill or canonical taxonomy ID -> the matrix columns it satisfies
+    columns = {}
+    for column, skill_lower in enumerate(skills_lower):
+        skill_id = (taxonomy.canonical(skill_lower) if taxonomy is not None else None) or skill_lower
+        for key in {skill_lower, skill_id}:
+            columns.setdefault(key, []).append(column)
+
+    exact = _exact_matrix(resumes_lower, get_skill_matcher(must_have_skills), taxonomy, columns,
+                          len(must_have_skills))
+    matrix = np.where(exact, MATCH_EXACT, MATCH_MISSING).astype(np.uint8)
+
+    # Only long skills without an exact match are worth a fuzzy or word lookup
+    long_skills = np.array([len(skill_lower) > SHORT_SKILL_LENGTH for skill_lower in skills_lower], dtype=bool)
+    word_matchers = None
+    if not FUZZYWUZZY_AVAILABLE:
+        word_matchers = [get_skill_matcher([word for word in skill_lower.split() if len(word) > 2])
+                         for skill_lower in skills_lower]
+    for row in np.flatnonzero((~exact & long_skills).any(axis=1)):
+        pending = np.flatnonzero(~exact[row] & long_skills)
+        if FUZZYWUZZY_AVAILABLE:
+            fuzzy_index = FuzzyIndex(resumes_lower[row])
+            matched = [column for column in pending if fuzzy_index.partial_ratio(skills_lower[column]) > 70]
+            matrix[row, matched] = MATCH_FUZZY
+        else:
+            matched = [column for column in pending if word_matchers[column].find_all(resumes_lower[row])]
+            matrix[row, matched] = MATCH_WORD
+
+    scores = np.minimum(np.asarray(MATCH_POINTS)[matrix].sum(axis=1), MAX_HARD_SCORE)
+    missing_skills = [[must_have_skills[column] for column in np.flatnonzero(states == MATCH_MISSING)]
+                      for states in matrix]
+    return matrix, scores, missing_skills
@@ -0,0 +1,199 @@
+# Bounded cache of job-description skill extraction, keyed by a stable digest of the JD text
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_TTL = 3600  # seconds
+DEFAULT_DB_MAX_ENTRIES = 10000
+
+def jd_digest(jd_text):
+    """SHA-256 of the JD text; identical in every process, unlike hash()"""
+    return hashlib.sha256(jd_text.encode('utf-8', errors='surrogatepass')).hexdigest()
+
+class JDSkillsCache:
+    """
+    Size- and TTL-bounded LRU of (must_have, good_to_have) per job description.
+
+    Entries are keyed by the JD's SHA-256 and tagged with the skill extractor
+    version, so a taxonomy change is a miss rather than stale skills. With
+    db_path set, a SQLite file is used as a second tier shared by every worker
+    process: memory misses are looked up there and new entries written through.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL, db_path=None,
+                 db_max_entries=DEFAULT_DB_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.db_path = db_path
+        self.db_max_entries = db_max_entries
+        self.hits = 0
+        self.misses = 0
+        self.shared_hits = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries = OrderedDict()  # digest -> (version, skills, stored_at)
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _expired(self, stored_at, now):
+        return bool(self.ttl) and now - stored_at > self.ttl
+
+    def get(self, jd_text, version):
+        """Cached (must_have, good_to_have) for a JD, or None on a miss"""
+        digest = jd_digest(jd_text)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None:
+                entry_version, skills, stored_at = entry
+                if self._expired(stored_at, now):
+                    del self._entries[digest]
+                    self.expirations += 1
+                elif entry_version == version:
+                    self._entries.move_to_end(digest)
+                    self.hits += 1
+                    return skills
+
+        skills = self._db_get(digest, version, now) if self.db_path else None
+        with self._lock:
+            if skills is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.shared_hits += 1
+            self._store(digest, version, skills, now)
+        return skills
+
+    def put(self, jd_text, version, skills):
+        """Store the skills extracted from a JD"""
+        digest = jd_digest(jd_text)
+        now = time.time()
+        skills = (list(skills[0]), list(skills[1]))
+        with self._lock:
+            self._store(digest, version, skills, now)
+        if self.db_path:
+            self._db_put(digest, version, skills, now)
+
+    def _store(self, digest, version, skills, now):
+        self._entries[digest] = (version, skills, now)
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _connect(self):
+        if not self._initialized:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        if not self._initialized:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''CREATE TABLE IF NOT EXISTS jd_skills (
+                digest TEXT PRIMARY KEY,
+                version TEXT,
+                skills TEXT,
+                created REAL,
+                last_access REAL
+            )''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_jd_skills_access ON jd_skills (last_access)')
+            conn.commit()
+            self._initialized = True
+        return conn
+
+    def _db_get(self, digest, version, now):
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute('SELECT version, skills, created FROM jd_skills WHERE digest = ?',
+                                   (digest,)).fetchone()
+                if row is None or row[0] != version:
+                    return None
+                if self._expired(row[2], now):
+                    conn.execute('DELETE FROM jd_skills WHERE digest = ?', (digest,))
+                    conn.commit()
+                    with self._lock:
+                        self.expirations += 1
+                    return None
+                conn.execute('UPDATE jd_skills SET last_access = ? WHERE digest = ?', (now, digest))
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"JD cache unavailable: {e}")
+            return None
+        must_have, good_to_have = json.loads(row[1])
+        return must_have, good_to_have
+
+    def _db_put(self, digest, version, skills, now):
+        try:
+            conn = self._connect()
+            try:
+                conn.execute('''INSERT OR REPLACE INTO jd_skills (digest, version, skills, created, last_access)
+                                VALUES (?, ?, ?, ?, ?)''',
+                             (digest, version, json.dumps(skills), now, now))
+                excess = conn.execute('SELECT COUNT(*) FROM jd_skills').fetchone()[0] - self.db_max_entries
+                if excess > 0:
+                    conn.execute('''DELETE FROM jd_skills WHERE digest IN
+                                    (SELECT digest FROM jd_skills ORDER BY last_access LIMIT ?)''', (excess,))
+                    with self._lock:
+                        self.evictions += excess
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"JD cache unavailable: {e}")
+
+    def stats(self):
+        """Hit, miss, eviction and expiry counters plus the current size"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "shared_hits": self.shared_hits,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "persistent": bool(self.db_path),
+            }
+
+    def clear(self):
+        """Drop every entry (both tiers) and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.shared_hits = self.evictions = self.expirations = 0
+        if self.db_path:
+            conn = self._connect()
+            try:
+                conn.execute('DELETE FROM jd_skills')
+                conn.commit()
+            finally:
+                conn.close()
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_jd_cache():
+    """
+    Shared cache instance configured from the environment.
+
+    RESUME_JD_CACHE_SIZE and RESUME_JD_CACHE_TTL (seconds, 0 = no expiry)
+    bound the in-memory tier; RESUME_JD_CACHE_DB enables the shared SQLite
+    tier at that path.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = JDSkillsCache(
+                max_entries=int(os.getenv("RESUME_JD_CACHE_SIZE", DEFAULT_MAX_ENTRIES)),
+                ttl=float(os.getenv("RESUME_JD_CACHE_TTL", DEFAULT_TTL)),
+                db_path=os.getenv("RESUME_JD_CACHE_DB") or None,
+            )
+        return _cache
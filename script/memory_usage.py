@@ -0,0 +1,45 @@
+# Lightweight process memory readings used by the extraction memory guards
+import os
+
+def process_memory(pid=None):
+    """(rss, vms) of a process in bytes, or (None, None) when it cannot be read"""
+    pid = pid or os.getpid()
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            vms_pages, rss_pages = f.read().split()[:2]
+        page_size = os.sysconf("SC_PAGE_SIZE")
+        return int(rss_pages) * page_size, int(vms_pages) * page_size
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+        info = psutil.Process(pid).memory_info()
+        return info.rss, info.vms
+    except Exception:
+        return None, None
+
+def shared_memory(pid=None):
+    """
+    (rss, pss, shared) of a process in bytes. PSS splits shared pages between
+    the processes mapping them, so it is the fair per-worker cost; shared is
+    the part of RSS also mapped by other processes. (None, None, None) when
+    it cannot be read.
+    """
+    pid = pid or os.getpid()
+    fields = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                if value.strip().endswith("kB"):
+                    fields[name] = int(value.split()[0]) * 1024
+        return (fields["Rss"], fields["Pss"],
+                fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0))
+    except (OSError, ValueError, KeyError):
+        pass
+    try:
+        import psutil
+        info = psutil.Process(pid).memory_full_info()
+        return info.rss, getattr(info, "pss", None), getattr(info, "shared", None)
+    except Exception:
+        return None, None, None
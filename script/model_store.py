@@ -0,0 +1,186 @@
+# Local model artifacts: load the sentence transformer from a directory, with weights mapped from disk
+import hashlib
+import json
+import os
+import struct
+import sys
+import time
+
+# Directory holding an exported sentence-transformers model (see save_local_model); unset = load by name
+MODEL_DIR = os.getenv("RESUME_MODEL_DIR") or None
+
+WEIGHTS_FILE = "model.safetensors"
+# Written by save_local_model: the name of the model a directory was exported from
+MODEL_INFO_FILE = "resume_model.json"
+
+# safetensors dtype names -> torch dtype attribute names
+_SAFETENSORS_DTYPES = {
+    "F64": "float64", "F32": "float32", "F16": "float16", "BF16": "bfloat16",
+    "I64": "int64", "I32": "int32", "I16": "int16", "I8": "int8", "U8": "uint8", "BOOL": "bool",
+}
+
+def local_model_path(directory=None):
+    """The configured model directory if it holds an exported model, else None (with a warning if one is set)"""
+    directory = directory or MODEL_DIR
+    if not directory:
+        return None
+    if (os.path.isfile(os.path.join(directory, "modules.json"))
+            or os.path.isfile(os.path.join(directory, "config.json"))):
+        return directory
+    problem = "does not exist" if not os.path.isdir(directory) else "has no modules.json or config.json"
+    print(f"Warning: model directory {directory} {problem}; export one with "
+          f"'python script/model_store.py export {directory}'.")
+    return None
+
+def local_model_name(directory):
+    """
+    Identity of an exported model, for embedding cache keys: the name it was
+    exported from (see save_local_model), else a digest of its configuration
+    files and weight file sizes.
+    """
+    try:
+        with open(os.path.join(directory, MODEL_INFO_FILE)) as f:
+            return json.load(f)["model_name"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    digest = hashlib.sha256()
+    for root, _, files in sorted(os.walk(directory)):
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            digest.update(os.path.relpath(path, directory).encode())
+            if name.endswith((".json", ".txt")):
+                with open(path, "rb") as f:
+                    digest.update(f.read())
+            else:
+                digest.update(str(os.path.getsize(path)).encode())
+    return f"local-{digest.hexdigest()[:16]}"
+
+def read_safetensors_header(path):
+    """
+    Tensor layout of a .safetensors file: ({name: (dtype, shape, start, end)}, data_start).
+    start/end are byte offsets into the data section, which begins at data_start.
+    """
+    with open(path, "rb") as f:
+        (header_size,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(header_size))
+    header.pop("__metadata__", None)
+    tensors = {name: (info["dtype"], tuple(info["shape"]), info["data_offsets"][0], info["data_offsets"][1])
+               for name, info in header.items()}
+    return tensors, 8 + header_size
+
+def mmap_state_dict(path):
+    """
+    Tensors of a .safetensors file backed by a read-only private mapping of
+    it. The pages come from the page cache, so every process mapping the
+    same file shares one copy of the weights until a tensor is written.
+    """
+    import torch
+
+    tensors, data_start = read_safetensors_header(path)
+    storage = torch.UntypedStorage.from_file(path, shared=False, nbytes=os.path.getsize(path))
+    state_dict = {}
+    for name, (dtype_name, shape, start, end) in tensors.items():
+        dtype = getattr(torch, _SAFETENSORS_DTYPES[dtype_name])
+        item_size = torch.empty((), dtype=dtype).element_size()
+        offset = data_start + start
+        if offset % item_size or (end - start) % item_size:
+            raise ValueError(f"{name} is not aligned to its dtype in {path}")
+        tensor = torch.empty(0, dtype=dtype)
+        tensor.set_(storage, offset // item_size, shape)
+        state_dict[name] = tensor
+    return state_dict
+
+def share_weights(model, directory):
+    """
+    Swap the transformer weights of a loaded SentenceTransformer for
+    tensors mapped from directory/model.safetensors, releasing the private
+    copies made while loading. Returns how many tensors were swapped.
+    """
+    path = os.path.join(directory, WEIGHTS_FILE)
+    if not os.path.isfile(path):
+        return 0
+    auto_model = getattr(model[0], "auto_model", None)
+    if auto_model is None:
+        return 0
+
+    expected = auto_model.state_dict()
+    prefix = getattr(auto_model, "base_model_prefix", "") + "."
+    mapped = {}
+    for name, tensor in mmap_state_dict(path).items():
+        key = name if name in expected else name[len(prefix):] if name.startswith(prefix) else None
+        if key in expected and expected[key].shape == tensor.shape and expected[key].dtype == tensor.dtype:
+            mapped[key] = tensor
+    if mapped:
+        auto_model.load_state_dict(mapped, strict=False, assign=True)
+    return len(mapped)
+
+def load_local_model(directory):
+    """
+    SentenceTransformer from an exported model directory: no Hugging Face
+    cache lookups or network probes, CPU only, weights shared through the
+    page cache where the file layout allows it. The model carries its
+    identity as resume_model_name (see local_model_name).
+    """
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(directory, device="cpu", local_files_only=True, cache_folder=directory)
+    model.eval()
+    model.resume_model_name = local_model_name(directory)
+    try:
+        share_weights(model, directory)
+    except Exception as e:
+        print(f"Warning: could not map model weights from {directory}, using private copies: {e}")
+    return model
+
+def save_local_model(model_name, directory):
+    """Export a model (downloading it if needed) to directory with safetensors weights"""
+    from sentence_transformers import SentenceTransformer
+    SentenceTransformer(model_name, device="cpu").save(directory, safe_serialization=True)
+    with open(os.path.join(directory, MODEL_INFO_FILE), "w") as f:
+        json.dump({"model_name": model_name}, f)
+    return directory
+
+def _startup_worker(queue):
+    """Child process: cold-start the semantic model, then report timings and memory"""
+    try:
+        from semantic_match import get_model, warm_up, model_status
+        from memory_usage import shared_memory
+    except ImportError:
+        from script.semantic_match import get_model, warm_up, model_status
+        from script.memory_usage import shared_memory
+    start_time = time.perf_counter()
+    loaded = get_model() is not None
+    load_seconds = time.perf_counter() - start_time
+    warm_up()
+    rss, pss, shared = shared_memory()
+    queue.put({"loaded": loaded, "load_seconds": load_seconds,
+               "first_encode_seconds": time.perf_counter() - start_time - load_seconds,
+               "state": model_status()["state"], "rss": rss, "pss": pss, "shared": shared})
+
+def measure_worker_startup(workers=2, timeout=300):
+    """
+    Start `workers` fresh processes together, each loading and warming the
+    model; returns one report per worker (load time, first-encode time and
+    RSS / PSS / shared bytes). Shared pages are the weights the workers
+    did not have to copy.
+    """
+    import multiprocessing
+
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    processes = [context.Process(target=_startup_worker, args=(queue,)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    reports = [queue.get(timeout=timeout) for _ in processes]
+    for process in processes:
+        process.join(timeout)
+    return reports
+
+if __name__ == "__main__":
+    # python script/model_store.py export <directory> [model name]
+    if len(sys.argv) >= 3 and sys.argv[1] == "export":
+        model_name = sys.argv[3] if len(sys.argv) > 3 else "all-MiniLM-L6-v2"
+        print(f"Saved {model_name} to {save_local_model(model_name, sys.argv[2])}")
+    else:
+        print("usage: python script/model_store.py export <directory> [model name]")
+        sys.exit(1)
@@ -0,0 +1,29 @@
+# Lazily loaded NLP models, so importing the pipeline does not pay for spaCy
+import os
+import threading
+
+SPACY_MODEL = os.getenv("RESUME_SPACY_MODEL", "en_core_web_sm")
+
+_nlp = None
+_nlp_loaded = False
+_nlp_lock = threading.Lock()
+
+def get_nlp():
+    """
+    spaCy pipeline for SPACY_MODEL, imported and loaded on first call.
+    None if spaCy or the model is not installed.
+    """
+    global _nlp, _nlp_loaded
+    with _nlp_lock:
+        if not _nlp_loaded:
+            try:
+                import spacy
+                _nlp = spacy.load(SPACY_MODEL)
+            except ImportError:
+                print("Warning: spaCy not available. Text processing will be basic.")
+                _nlp = None
+            except OSError:
+                print(f"Warning: spaCy model '{SPACY_MODEL}' not found. Text processing will be basic.")
+                _nlp = None
+            _nlp_loaded = True
+        return _nlp
@@ -1,78 +1,299 @@
-import spacy
+import multiprocessing
+import os
 import re
+import time
+from collections import deque
+from multiprocessing.connection import wait
 
 try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    print("Warning: spaCy model 'en_core_web_sm' not found. Using basic skill extraction.")
-    nlp = None
+    from skill_matcher import get_skill_matcher, STREAM_CHUNK_SIZE
+    from skill_taxonomy import get_skill_taxonomy
+    from nlp_models import get_nlp
+except ImportError:
+    from script.skill_matcher import get_skill_matcher, STREAM_CHUNK_SIZE
+    from script.skill_taxonomy import get_skill_taxonomy
+    from script.nlp_models import get_nlp
+
+# Built-in vocabulary, used when the skill taxonomy (data/skills/taxonomy.json) is unavailable
+TECHNICAL_SKILLS = [
+    'python', 'java', 'javascript', 'react', 'angular', 'vue', 'node.js', 'express',
+    'sql', 'mysql', 'postgresql', 'mongodb', 'redis', 'elasticsearch',
+    'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'git', 'github',
+    'html', 'css', 'bootstrap', 'tailwind', 'sass', 'less',
+    'django', 'flask', 'spring', 'laravel', 'rails', 'asp.net',
+    'machine learning', 'deep learning', 'ai', 'data science', 'pandas', 'numpy',
+    'tensorflow', 'pytorch', 'scikit-learn', 'opencv', 'nlp',
+    'agile', 'scrum', 'devops', 'ci/cd', 'microservices', 'api', 'rest', 'graphql'
+]
+
+SOFT_SKILLS = [
+    'communication', 'leadership', 'teamwork', 'problem solving', 'analytical',
+    'creative', 'adaptable', 'organized', 'detail-oriented', 'time management'
+]
+
+# Opt-in spaCy requirement extraction on top of the keyword path (see extract_skills_batch)
+ACCURATE_MODE = os.getenv("RESUME_JD_ACCURATE_MODE", "").lower() in ("1", "true", "yes")
+ACCURATE_TIME_BUDGET = float(os.getenv("RESUME_JD_ACCURATE_BUDGET_S", 2.0))  # seconds per JD
+ACCURATE_BATCH_SIZE = 32
+# Batches of at least this many JDs are parsed by several spaCy processes
+ACCURATE_MULTIPROCESS_MIN = int(os.getenv("RESUME_JD_ACCURATE_MULTIPROCESS_MIN", 200))
+# Seconds a spaCy worker process may take to load its model before accurate mode is skipped
+ACCURATE_LOAD_TIMEOUT = 120
+ACCURATE_POLL_INTERVAL = 0.05
+# Noun chunks and sentences only need the tagger and parser
+ACCURATE_DISABLED_PIPES = ("ner", "lemmatizer", "textcat", "entity_ruler")
+
+REQUIREMENT_CUES = re.compile(r"\b(requir\w*|must|need\w*|experience\w*|proficien\w*|knowledge|familiar\w*|"
+                              r"expert\w*|skill\w*|strong|abilit\w*)\b", re.IGNORECASE)
+PREFERRED_CUES = re.compile(r"\b(nice to have|prefer\w*|a plus|bonus|desirable|ideally)\b", re.IGNORECASE)
+# Chunk heads that name the requirement itself rather than what is required
+GENERIC_NOUNS = {
+    'experience', 'years', 'year', 'knowledge', 'skills', 'skill', 'ability', 'abilities', 'understanding',
+    'team', 'teams', 'role', 'candidate', 'candidates', 'company', 'we', 'you', 'us', 'they', 'it', 'plus',
+    'bonus', 'requirements', 'responsibilities', 'background', 'degree', 'work', 'etc'
+}
+MAX_PHRASE_TOKENS = 4
+
+# Bump when extract_skills changes what it returns for the same JD
+SKILL_EXTRACTION_VERSION = 3
+
+def skills_version(accurate=None):
+    """Identifies the extractor and vocabulary, so cached JD skills are dropped when either changes"""
+    taxonomy = get_skill_taxonomy()
+    vocabulary = taxonomy.digest[:16] if taxonomy is not None and taxonomy.digest else "builtin"
+    mode = "accurate" if (ACCURATE_MODE if accurate is None else accurate) else "keyword"
+    return f"{SKILL_EXTRACTION_VERSION}:{vocabulary}:{mode}"
+
+def iter_jd_chunks(jd_source, chunk_size=STREAM_CHUNK_SIZE):
+    """JD text in chunks, from a string or a text file object"""
+    if isinstance(jd_source, str):
+        for start in range(0, len(jd_source), chunk_size):
+            yield jd_source[start:start + chunk_size]
+        return
+    while True:
+        chunk = jd_source.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
 
 def extract_skills(jd_text):
     """
-    Extract skills from job description text.
-    Fast keyword-based extraction to avoid hanging issues.
+    Extract skills from job description text (or a text file object).
+    Fast keyword-based extraction to avoid hanging issues; JDs of any length
+    are scanned in one streaming pass (see SkillMatcher.find_ordered_stream).
     """
     try:
-        # Limit text length for faster processing
-        if len(jd_text) > 2000:
-            jd_text = jd_text[:2000]
-
-        # Common technical skills and keywords
-        technical_skills = [
-            'python', 'java', 'javascript', 'react', 'angular', 'vue', 'node.js', 'express',
-            'sql', 'mysql', 'postgresql', 'mongodb', 'redis', 'elasticsearch',
-            'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'git', 'github',
-            'html', 'css', 'bootstrap', 'tailwind', 'sass', 'less',
-            'django', 'flask', 'spring', 'laravel', 'rails', 'asp.net',
-            'machine learning', 'deep learning', 'ai', 'data science', 'pandas', 'numpy',
-            'tensorflow', 'pytorch', 'scikit-learn', 'opencv', 'nlp',
-            'agile', 'scrum', 'devops', 'ci/cd', 'microservices', 'api', 'rest', 'graphql'
-        ]
-
-        soft_skills = [
-            'communication', 'leadership', 'teamwork', 'problem solving', 'analytical',
-            'creative', 'adaptable', 'organized', 'detail-oriented', 'time management'
-        ]
-
-        jd_lower = jd_text.lower()
-
-        # Extract skills using keyword matching
-        found_technical = []
-        found_soft = []
-
-        for skill in technical_skills:
-            if skill in jd_lower:
-                found_technical.append(skill)
-
-        for skill in soft_skills:
-            if skill in jd_lower:
-                found_soft.append(skill)
-
-        # Skip spaCy processing to avoid hanging issues
-        # Use simple regex patterns instead
-        requirement_patterns = [
-            r'(?:required|must have|essential)[\s\w]*?:\s*([^.]+)',
-            r'(?:experience with|knowledge of|proficient in)\s+([^.]+)'
-        ]
+        # One whole-word pass over the JD; skills come back as canonical IDs
+        # ('k8s' -> 'kubernetes'), deduplicated, in the order the JD mentions them.
+        # Names that are also ordinary words need confirming ('excel under pressure' is not Excel)
+        taxonomy = get_skill_taxonomy()
+        if taxonomy is not None:
+            found = taxonomy.matcher.find_ordered_stream(iter_jd_chunks(jd_text), confirm=taxonomy.confirm)
+            found_soft = [skill for skill in found if taxonomy.categories.get(skill) == "soft"]
+            found_technical = [skill for skill in found if taxonomy.categories.get(skill) != "soft"]
+        else:
+            if not isinstance(jd_text, str):
+                jd_text = jd_text.read()
+            found_technical = get_skill_matcher(TECHNICAL_SKILLS).find_ordered_stream(iter_jd_chunks(jd_text))
+            found_soft = get_skill_matcher(SOFT_SKILLS).find_ordered_stream(iter_jd_chunks(jd_text))
+
+        return found_technical, found_soft
 
+    except Exception as e:
+        # Fallback to basic skills if everything fails
+        return ['python', 'java', 'javascript'], ['communication', 'teamwork']
+
+def requirement_phrases(doc):
+    """
+    Noun-chunk phrases from the requirement sentences of a parsed JD, as
+    (required, preferred) lists of lowercase phrases in order of appearance.
+    """
+    required, preferred = {}, {}
+    for chunk in doc.noun_chunks:
+        sentence = chunk.sent.text
+        if PREFERRED_CUES.search(sentence):
+            target = preferred
+        elif REQUIREMENT_CUES.search(sentence):
+            target = required
+        else:
+            continue
+
+        tokens = list(chunk)
+        while tokens and (tokens[0].pos_ in ("DET", "PRON", "NUM", "PUNCT") or tokens[0].is_stop):
+            tokens.pop(0)
+        if not tokens or len(tokens) > MAX_PHRASE_TOKENS or chunk.root.lower_ in GENERIC_NOUNS:
+            continue
+        phrase = " ".join(token.lower_ for token in tokens)
+        target.setdefault(phrase, None)
+    return list(required), list(preferred)
+
+def _merge_requirements(keyword_result, required, preferred):
+    """Keyword skills plus the phrases that do not just restate a skill already found"""
+    must_have, good_to_have = list(keyword_result[0]), list(keyword_result[1])
+    taxonomy = get_skill_taxonomy()
+    known = set(must_have) | set(good_to_have)
+    for phrases, target in ((required, must_have), (preferred, good_to_have)):
+        for phrase in phrases:
+            skill = taxonomy.canonical(phrase) if taxonomy is not None else None
+            if (skill or phrase) not in known:
+                known.add(skill or phrase)
+                target.append(skill or phrase)
+    return must_have, good_to_have
+
+def _spacy_worker_main(conn, disable):
+    """Worker loop: receive a batch of JD texts, send back ("ok", (required, preferred)) for each in order"""
+    nlp = get_nlp()
+    conn.send(("ready", None) if nlp is not None else ("unavailable", "no spaCy model"))
+    while nlp is not None:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            break
+        if task is None:
+            break
         try:
-            for pattern in requirement_patterns:
-                matches = re.finditer(pattern, jd_lower, re.IGNORECASE)
-                for match in matches:
-                    requirement_text = match.group(1)
-                    # Extract individual skills from the requirement text
-                    for skill in technical_skills[:10]:  # Limit to first 10 skills for speed
-                        if skill in requirement_text and skill not in found_technical:
-                            found_technical.append(skill)
+            for doc in nlp.pipe(task, batch_size=ACCURATE_BATCH_SIZE, disable=disable):
+                conn.send(("ok", requirement_phrases(doc)))
+        except Exception as e:
+            # A JD spaCy rejects (e.g. E088, text too long) fails on its own, see _parse_requirements
+            conn.send(("error", str(e)))
+
+class _SpacyWorker:
+    """One killable spaCy process, the JDs it still owes results for and when the next one is due"""
+
+    def __init__(self, context, disable):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_spacy_worker_main, args=(child_conn, disable), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.loaded = False
+        self.pending = deque()
+        self.deadline = time.monotonic() + ACCURATE_LOAD_TIMEOUT
+
+    def send(self, indexes, jd_texts, time_budget):
+        self.pending = deque(indexes)
+        self.conn.send([jd_texts[index] for index in indexes])
+        # The budget is per JD: a batch spaCy cannot answer within one JD's budget is retried one JD at a time
+        self.deadline = time.monotonic() + time_budget
+
+    def kill(self):
+        try:
+            self.process.kill()
+            self.process.join(timeout=5)
+        except Exception:
+            pass
+        self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+            self.process.join(timeout=2)
         except Exception:
-            pass  # Continue even if regex fails
+            pass
+        if self.process.is_alive():
+            self.kill()
+        else:
+            self.conn.close()
+
+def _parse_requirements(jd_texts, time_budget, workers, disable):
+    """
+    {index: (required, preferred)} for the JDs spaCy parsed within budget.
+
+    JDs go to killable worker processes in batches of ACCURATE_BATCH_SIZE;
+    a worker gets time_budget seconds for each JD it answers. A worker that
+    overruns, crashes or errors is killed (and replaced while batches are
+    left), and the JDs it had not answered are retried one per batch, so
+    only a JD that overruns or fails on its own is left out.
+    """
+    context = multiprocessing.get_context()
+    batches = deque(list(range(start, min(start + ACCURATE_BATCH_SIZE, len(jd_texts))))
+                    for start in range(0, len(jd_texts), ACCURATE_BATCH_SIZE))
+    pool = [_SpacyWorker(context, disable) for _ in range(min(workers, len(batches)))]
+    parsed = {}
+    try:
+        while batches or any(worker.pending for worker in pool):
+            for worker in pool:
+                if worker.loaded and not worker.pending and batches:
+                    worker.send(batches.popleft(), jd_texts, time_budget)
 
-        # Remove duplicates and clean up
-        must_have = list(set(found_technical))
-        good_to_have = list(set(found_soft))
+            ready = wait([worker.conn for worker in pool], timeout=ACCURATE_POLL_INTERVAL)
+            for worker in list(pool):
+                if worker.conn in ready:
+                    try:
+                        status, payload = worker.conn.recv()
+                    except (EOFError, OSError):
+                        status, payload = "error", "worker exited"
+                    if status == "ready":
+                        worker.loaded = True
+                        continue
+                    if status == "ok" and worker.pending:
+                        parsed[worker.pending.popleft()] = payload
+                        worker.deadline = time.monotonic() + time_budget
+                        continue
+                    if status == "unavailable" or not worker.loaded:
+                        print(f"Warning: accurate JD extraction unavailable ({payload}). Using keyword extraction.")
+                        return parsed
+                elif time.monotonic() <= worker.deadline:
+                    continue
+                elif not worker.loaded:
+                    print("Warning: spaCy worker did not load in time. Using keyword extraction.")
+                    return parsed
 
-        return must_have, good_to_have
+                # Overran, crashed or failed: the JDs it owes are retried alone, an overrunning single JD is dropped
+                unanswered = list(worker.pending)
+                if len(unanswered) > 1:
+                    batches.extendleft([index] for index in reversed(unanswered))
+                worker.kill()
+                if batches:
+                    pool[pool.index(worker)] = _SpacyWorker(context, disable)
+                else:
+                    pool.remove(worker)
+    finally:
+        for worker in pool:
+            worker.stop()
+    return parsed
 
+def extract_skills_batch(jd_texts, accurate=None, time_budget=None, n_process=None):
+    """
+    Skills for many job descriptions at once, as a list of (must_have, good_to_have).
+
+    Keyword extraction always runs. In accurate mode (RESUME_JD_ACCURATE_MODE)
+    spaCy additionally parses the JDs in batches, with the pipes it does not
+    need disabled, in n_process killable worker processes (several for large
+    batches), and adds the noun-chunk phrases of requirement sentences. Each
+    JD gets time_budget seconds; a JD that takes longer, or whose parse
+    fails, keeps its keyword result (see _parse_requirements), and so do
+    all JDs when spaCy or its model is missing.
+    """
+    jd_texts = list(jd_texts)
+    results = [extract_skills(jd_text) for jd_text in jd_texts]
+    if not (ACCURATE_MODE if accurate is None else accurate) or not jd_texts:
+        return results
+
+    # Loaded here so forked workers share the model instead of each loading it
+    nlp = get_nlp()
+    if nlp is None:
+        return results
+    if not nlp.has_pipe("parser"):
+        # Noun chunks need the dependency parse
+        print("Warning: accurate JD extraction unavailable (spaCy model has no parser). Using keyword extraction.")
+        return results
+
+    if time_budget is None:
+        time_budget = ACCURATE_TIME_BUDGET
+    if n_process is None:
+        n_process = min(os.cpu_count() or 1, 4) if len(jd_texts) >= ACCURATE_MULTIPROCESS_MIN else 1
+    disable = [name for name in ACCURATE_DISABLED_PIPES if name in nlp.pipe_names]
+
+    try:
+        parsed = _parse_requirements(jd_texts, time_budget, n_process, disable)
     except Exception as e:
-        # Fallback to basic skills if everything fails
-        return ['python', 'java', 'javascript'], ['communication', 'teamwork']
+        print(f"Warning: accurate JD extraction failed ({e}). Using keyword extraction.")
+        parsed = {}
+    for index, (required, preferred) in parsed.items():
+        results[index] = _merge_requirements(results[index], required, preferred)
+
+    if len(parsed) < len(jd_texts):
+        print(f"Warning: {len(jd_texts) - len(parsed)} of {len(jd_texts)} JDs used keyword extraction "
+              f"(accurate mode budget {time_budget}s per JD)")
+    return results
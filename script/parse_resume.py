@@ -1,22 +1,301 @@
 import pdfplumber
-import spacy
 import io
-from concurrent.futures import ThreadPoolExecutor
+import itertools
+import mmap
+import os
+import tempfile
+import re
+import zipfile
+import multiprocessing
+import threading
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
 
 try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    print("Warning: spaCy model 'en_core_web_sm' not found. Text processing will be basic.")
-    nlp = None
+    from pdfminer.pdfdevice import PDFTextDevice
+    from pdfminer.pdffont import PDFUnicodeNotDefined
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.pdftypes import resolve1
+    from pdfminer.utils import apply_matrix_pt
+    PDFMINER_AVAILABLE = True
+except ImportError:
+    print("Warning: pdfminer.six not available. Only the pdfplumber PDF backend can be used.")
+    PDFMINER_AVAILABLE = False
+    PDFTextDevice = object
+
+try:
+    from text_cache import get_text_cache, content_digest
+    from memory_usage import process_memory
+    from skill_matcher import get_skill_matcher
+    from skill_taxonomy import get_skill_taxonomy
+except ImportError:
+    from script.text_cache import get_text_cache, content_digest
+    from script.memory_usage import process_memory
+    from script.skill_matcher import get_skill_matcher
+    from script.skill_taxonomy import get_skill_taxonomy
+
+# Bump whenever extraction output changes so stale cache entries are ignored
+EXTRACTOR_VERSION = "3p-3000c-3"
+# Bump whenever StopPolicy stops at different pages; only early-stopped entries depend on it
+STOP_POLICY_VERSION = 2
+
+try:
+    from docx import Document
+    DOCX_AVAILABLE = True
+except ImportError:
+    print("Warning: python-docx not available. DOCX resumes will be read with basic XML parsing.")
+    DOCX_AVAILABLE = False
+
+# Number of leading bytes inspected to detect the upload format
+SNIFF_BYTES = 1024
+
+def _pdfplumber_pages(resume_file, max_pages, first_page=0):
+    """Yield page text using pdfplumber's layout-aware extraction"""
+    with pdfplumber.open(resume_file) as pdf:
+        # Limit pages for faster processing (most resumes are 1-3 pages)
+        for i, page in enumerate(pdf.pages[first_page:max_pages], start=first_page):
+            try:
+                yield page.extract_text() or ""
+            except MemoryError:
+                raise
+            except Exception as e:
+                print(f"Error extracting page {i}: {e}")
+                yield ""
+
+# pdfplumber's extract_text defaults, which the pdfminer backend reproduces
+PDF_X_TOLERANCE = 3
+PDF_Y_TOLERANCE = 3
+PDF_LIGATURES = {"ﬀ": "ff", "ﬃ": "ffi", "ﬄ": "ffl", "ﬁ": "fi", "ﬂ": "fl", "ﬆ": "st", "ﬅ": "st"}
+
+def _top_clusters(tops, tolerance):
+    """Cluster number of each top coordinate: sorted tops stay in one cluster while each is within tolerance"""
+    clusters, cluster, last = {}, 0, None
+    for top in sorted(set(tops)):
+        if last is not None and top > last + tolerance:
+            cluster += 1
+        clusters[top] = cluster
+        last = top
+    return clusters
+
+def _glyph_lines(glyphs):
+    """
+    Page text from (top, x0, x1, text) glyphs, ordered the way pdfplumber's
+    extract_text orders characters: lines by top, glyphs by x0, words split
+    on whitespace or gaps wider than PDF_X_TOLERANCE
+    """
+    line_of = _top_clusters((glyph[0] for glyph in glyphs), PDF_Y_TOLERANCE)
+    words = []  # [top, characters, last glyph]
+    for _, line in itertools.groupby(sorted(glyphs, key=lambda glyph: line_of[glyph[0]]),
+                                     key=lambda glyph: line_of[glyph[0]]):
+        word = None
+        for glyph in sorted(line, key=lambda glyph: glyph[1]):
+            top, x0, _, text = glyph
+            text = PDF_LIGATURES.get(text, text)
+            if text.isspace():
+                word = None
+            elif (word is not None and word[2][1] <= x0 <= word[2][2] + PDF_X_TOLERANCE
+                  and abs(top - word[2][0]) <= PDF_Y_TOLERANCE):
+                word[0] = min(word[0], top)
+                word[1].append(text)
+                word[2] = glyph
+            else:
+                word = [top, [text], glyph]
+                words.append(word)
+
+    # Words keep their order; consecutive words whose tops fall in one cluster share a line
+    word_line_of = _top_clusters((word[0] for word in words), PDF_Y_TOLERANCE)
+    return "\n".join(" ".join("".join(word[1]) for word in line)
+                     for _, line in itertools.groupby(words, key=lambda word: word_line_of[word[0]]))
+
+class _StreamTextDevice(PDFTextDevice):
+    """
+    pdfminer device that records each glyph's box as a plain tuple.
+
+    Skips layout analysis entirely: pdfminer positions the glyphs, but no
+    LTChar or layout objects are built. The page text is assembled by
+    _glyph_lines in pdfplumber's reading order, so both backends feed the
+    same text into scoring.
+    """
+
+    def __init__(self, rsrcmgr):
+        super().__init__(rsrcmgr)
+        self.glyphs = []
+        self._height = 0
+        self._top_offset = 0
+
+    def begin_page(self, page, ctm):
+        self.glyphs = []
+        # Same top coordinate as pdfplumber: page height minus y1, shifted by the MediaBox origin
+        (x0, y0, x1, y1) = page.mediabox
+        self._height = abs(apply_matrix_pt(ctm, (x0, y0))[1] - apply_matrix_pt(ctm, (x1, y1))[1])
+        self._top_offset = y0
+
+    def render_char(self, matrix, font, fontsize, scaling, rise, cid, ncs, graphicstate):
+        try:
+            text = font.to_unichr(cid)
+        except (PDFUnicodeNotDefined, KeyError):
+            text = f"(cid:{cid})"
+        advance = font.char_width(cid) * fontsize * scaling
+        descent = font.get_descent() * fontsize
+        (x0, y0) = apply_matrix_pt(matrix, (0, descent + rise))
+        (x1, y1) = apply_matrix_pt(matrix, (advance, descent + rise + fontsize))
+        self.glyphs.append((self._height - max(y0, y1) + self._top_offset, min(x0, x1), max(x0, x1), text))
+        return advance
+
+    def page_text(self):
+        return _glyph_lines(self.glyphs)
+
+def _pdfminer_pages(resume_file, max_pages, first_page=0):
+    """Yield page text straight from the content streams, without layout analysis"""
+    if not PDFMINER_AVAILABLE:
+        raise RuntimeError("pdfminer.six is not installed")
+
+    if isinstance(resume_file, (str, os.PathLike)):
+        with open(resume_file, 'rb') as f:
+            yield from _pdfminer_pages(f, max_pages, first_page)
+        return
+
+    rsrcmgr = PDFResourceManager(caching=True)
+    device = _StreamTextDevice(rsrcmgr)
+    interpreter = PDFPageInterpreter(rsrcmgr, device)
+    # Skipping pages only walks the page tree; their content streams are never interpreted
+    pages = itertools.islice(PDFPage.get_pages(resume_file, maxpages=max_pages or 0), first_page, None)
+    for i, page in enumerate(pages, start=first_page):
+        try:
+            interpreter.process_page(page)
+            yield device.page_text()
+        except MemoryError:
+            raise
+        except Exception as e:
+            print(f"Error extracting page {i}: {e}")
+            yield ""
+
+# Memory guards for the "pdfplumber-lowmem" backend. Resumes have ~50-200 PDF objects;
+# far more than that usually means embedded junk or a deliberately hostile file.
+PDF_DOWNGRADE_OBJECTS = int(os.getenv("RESUME_PDF_DOWNGRADE_OBJECTS", "5000"))
+PDF_MAX_OBJECTS = int(os.getenv("RESUME_PDF_MAX_OBJECTS", "100000"))
+PDF_PAGE_MEMORY_MB = float(os.getenv("RESUME_PDF_MEMORY_MB", "256"))
+
+_memory_records = deque(maxlen=1000)
+_memory_lock = threading.Lock()
+
+class PDFTooComplexError(ValueError):
+    """Raised when a PDF's object count marks it as a likely memory bomb"""
+
+def _record_memory(record):
+    with _memory_lock:
+        _memory_records.append(record)
+
+def get_memory_stats():
+    """Summary of the memory-capped extractions seen by this process"""
+    with _memory_lock:
+        records = list(_memory_records)
+    peaks = [r["peak_rss_mb"] for r in records if r["peak_rss_mb"] is not None]
+    return {
+        "documents": len(records),
+        "downgraded": sum(1 for r in records if r["action"] == "downgraded"),
+        "refused": sum(1 for r in records if r["action"] == "refused"),
+        "truncated": sum(1 for r in records if r["action"] == "truncated"),
+        "max_peak_rss_mb": max(peaks) if peaks else None,
+        "recent": records[-10:],
+    }
+
+def _pdfplumber_pages_lowmem(resume_file, max_pages, first_page=0):
+    """
+    Memory-capped pdfplumber extraction.
+
+    Page objects are created one at a time and their character/layout caches
+    are released as soon as the page's text is taken; pdfminer's object cache
+    is disabled. Documents with more than PDF_DOWNGRADE_OBJECTS objects are
+    handed to the layout-free pdfminer backend, more than PDF_MAX_OBJECTS are
+    refused, and reading stops once RSS grows by PDF_PAGE_MEMORY_MB.
+    """
+    start_rss, _ = process_memory()
+    record = {"pages": 0, "objects": None, "peak_rss_mb": None, "action": "ok"}
+
+    def track():
+        rss, _ = process_memory()
+        if rss is not None and start_rss is not None:
+            growth = (rss - start_rss) / (1024 * 1024)
+            record["peak_rss_mb"] = max(record["peak_rss_mb"] or 0.0, round(growth, 1))
+            return growth
+        return 0.0
 
-def extract_page_text(page):
-    """Extract text from a single PDF page"""
     try:
-        return page.extract_text() or ""
-    except Exception:
-        return ""
+        with pdfplumber.open(resume_file) as pdf:
+            record["objects"] = sum(len(list(xref.get_objids())) for xref in pdf.doc.xrefs)
+            if record["objects"] > PDF_MAX_OBJECTS:
+                record["action"] = "refused"
+                raise PDFTooComplexError(f"PDF has {record['objects']} objects (limit {PDF_MAX_OBJECTS})")
+
+            if record["objects"] > PDF_DOWNGRADE_OBJECTS:
+                record["action"] = "downgraded"
+                if hasattr(resume_file, 'seek'):
+                    resume_file.seek(0)
+                pages = _pdfminer_pages(resume_file, max_pages, first_page)
+            else:
+                pdf.doc.caching = False
+                pages = _lowmem_page_texts(pdf, max_pages, first_page)
+
+            try:
+                for page_text in pages:
+                    record["pages"] += 1
+                    yield page_text
+                    if track() > PDF_PAGE_MEMORY_MB:
+                        record["action"] = "truncated"
+                        break
+            finally:
+                pages.close()
+                # Stop PDF.close() from materialising every Page object just to close it
+                pdf._pages = []
+    finally:
+        track()
+        _record_memory(record)
+
+def _lowmem_page_texts(pdf, max_pages, first_page):
+    """Build, read and close one pdfplumber Page at a time"""
+    for i, page_obj in enumerate(PDFPage.create_pages(pdf.doc)):
+        if max_pages and i >= max_pages:
+            break
+        if i < first_page:
+            continue
+        page = pdfplumber.page.Page(pdf, page_obj, page_number=i + 1)
+        try:
+            page_text = page.extract_text() or ""
+        except MemoryError:
+            raise
+        except Exception as e:
+            print(f"Error extracting page {i}: {e}")
+            page_text = ""
+        finally:
+            page.close()
+        yield page_text
+
+# PDF text backends: name -> generator of page texts, called as backend(file, max_pages).
+# Backends that also accept first_page=N can be used for parallel page-range extraction.
+PDF_BACKENDS = {
+    "pdfplumber": _pdfplumber_pages,
+    "pdfminer": _pdfminer_pages,
+    "pdfplumber-lowmem": _pdfplumber_pages_lowmem,
+}
+
+DEFAULT_PDF_BACKEND = "pdfplumber"
 
-def extract_text_fast(resume_file, max_pages=3):
+def register_pdf_backend(name, page_extractor):
+    """Register an additional PDF text backend"""
+    PDF_BACKENDS[name] = page_extractor
+
+def resolve_pdf_backend(backend=None):
+    """Pick the backend for a call: explicit argument, then RESUME_PDF_BACKEND, then the default"""
+    backend = backend or os.getenv("RESUME_PDF_BACKEND") or DEFAULT_PDF_BACKEND
+    if backend not in PDF_BACKENDS:
+        print(f"Warning: unknown PDF backend '{backend}', using {DEFAULT_PDF_BACKEND}")
+        backend = DEFAULT_PDF_BACKEND
+    return backend
+
+def extract_text_fast(resume_file, max_pages=3, backend=None):
     """
     Fast and reliable text extraction without parallel processing
     """
@@ -29,25 +308,19 @@ def extract_text_fast(resume_file, max_pages=3):
         except Exception:
             pass  # Continue even if seek fails
 
-        with pdfplumber.open(resume_file) as pdf:
-            # Limit pages for faster processing (most resumes are 1-3 pages)
-            pages_to_process = pdf.pages[:max_pages]
-
-            # Process sequentially to avoid hanging issues
-            for i, page in enumerate(pages_to_process):
-                try:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
+        page_extractor = PDF_BACKENDS[resolve_pdf_backend(backend)]
 
-                    # Break early if we have enough text
-                    if len(text) > 3000:
-                        break
+        # Process sequentially to avoid hanging issues
+        for page_text in page_extractor(resume_file, max_pages):
+            if page_text:
+                text += page_text + "\n"
 
-                except Exception as e:
-                    print(f"Error extracting page {i}: {e}")
-                    continue
+            # Break early if we have enough text
+            if len(text) > 3000:
+                break
 
+    except MemoryError:
+        raise  # Let sandboxed workers report the memory limit
     except Exception as e:
         print(f"Error extracting text from PDF: {e}")
         return ""
@@ -58,25 +331,563 @@ def extract_text_fast(resume_file, max_pages=3):
 
     return text.lower() if text else ""
 
-def extract_text(resume_file):
+# Check the first page for a text layer before extracting (RESUME_IMAGE_PDF_PROBE=0 disables)
+IMAGE_PDF_PROBE = os.getenv("RESUME_IMAGE_PDF_PROBE", "1").lower() not in ("0", "false", "no")
+
+NEEDS_OCR_MESSAGE = "No text layer found (scanned or image-only PDF); the resume needs OCR"
+
+class ImageOnlyPDFError(ValueError):
+    """Raised by extract_text for PDFs whose first page has no text layer"""
+    def __init__(self, message=NEEDS_OCR_MESSAGE):
+        super().__init__(message)
+
+_TEXT_SHOW_OPERATOR = re.compile(rb'(?:^|[\s\])>])(?:Tj|TJ|\'|")(?=[\s\[(<]|$)')
+
+def _has_fonts(resources):
+    return bool(resolve1((resources or {}).get('Font')))
+
+def probe_pdf_text_layer(resume_file):
+    """
+    Cheap first-page check for a text layer: 'text', 'image' or 'unknown'.
+
+    Only the page tree, the first page's resource dictionaries and (when
+    there are no fonts) its content stream are read. A page with neither
+    fonts nor text-showing operators but with image XObjects is a scan.
+    """
+    if not PDFMINER_AVAILABLE:
+        return "unknown"
+    if isinstance(resume_file, (str, os.PathLike)):
+        with open(resume_file, 'rb') as f:
+            return probe_pdf_text_layer(f)
+
+    try:
+        if hasattr(resume_file, 'seek'):
+            resume_file.seek(0)
+        page = next(PDFPage.get_pages(resume_file, maxpages=1), None)
+        if page is None:
+            return "unknown"
+
+        resources = resolve1(page.resources) or {}
+        if _has_fonts(resources):
+            return "text"
+
+        has_image = False
+        for xobject in (resolve1(resources.get('XObject')) or {}).values():
+            xobject = resolve1(xobject)
+            subtype = getattr(xobject.get('Subtype'), 'name', None) if hasattr(xobject, 'get') else None
+            if subtype == 'Image':
+                has_image = True
+            elif subtype == 'Form' and _has_fonts(resolve1(xobject.get('Resources'))):
+                return "text"
+
+        for stream in page.contents:
+            if _TEXT_SHOW_OPERATOR.search(resolve1(stream).get_data()):
+                return "text"
+        return "image" if has_image else "unknown"
+    except Exception as e:
+        print(f"Error probing PDF text layer: {e}")
+        return "unknown"
+    finally:
+        if hasattr(resume_file, 'seek'):
+            resume_file.seek(0)
+
+# Safety cap for streaming extraction; the stop policy normally ends it much earlier
+DEFAULT_STREAM_MAX_PAGES = 20
+
+def iter_pdf_pages(resume_file, backend=None, max_pages=DEFAULT_STREAM_MAX_PAGES):
+    """
+    Lazily yield the lowercased text of each PDF page
+    """
+    try:
+        if hasattr(resume_file, 'seek'):
+            resume_file.seek(0)
+    except Exception:
+        pass  # Continue even if seek fails
+
+    page_extractor = PDF_BACKENDS[resolve_pdf_backend(backend)]
+    for page_text in page_extractor(resume_file, max_pages):
+        yield page_text.lower()
+
+class StopPolicy:
+    """
+    Decides when streaming extraction has read enough of a document.
+
+    Extraction stops once every required skill has been seen, or once
+    pages stop contributing new vocabulary: when the share of previously
+    unseen tokens on a page drops below novelty_threshold for `patience`
+    pages in a row (after at least min_pages pages). Skills are seen the
+    way hard matching scores them: whole words, or a taxonomy alias.
+    """
+
+    def __init__(self, required_skills=None, min_pages=1, novelty_threshold=0.15, patience=1):
+        self.unresolved = {skill.lower() for skill in required_skills or []}
+        self.track_skills = bool(self.unresolved)
+        self._matcher = get_skill_matcher(tuple(sorted(self.unresolved))) if self.track_skills else None
+        self.min_pages = min_pages
+        self.novelty_threshold = novelty_threshold
+        self.patience = patience
+        self.pages_seen = 0
+        self.stop_reason = None
+        self._seen_tokens = set()
+        self._flat_pages = 0
+        self._tail = ""
+
+    def _resolved(self, text):
+        """Unresolved skills that occur in text, matched like hard_match.calculate_hard_score"""
+        found = self._matcher.find_all(text) & self.unresolved
+        taxonomy = get_skill_taxonomy()
+        if taxonomy is not None:
+            ids = taxonomy.extract(text)
+            found.update(skill for skill in self.unresolved if taxonomy.canonical(skill) in ids)
+        return found
+
+    def update(self, page_text):
+        """Account for one more page; returns True when extraction should stop"""
+        self.pages_seen += 1
+
+        if self.unresolved:
+            # Include the end of the previous page so skills split across pages are found
+            self.unresolved -= self._resolved(self._tail + " " + page_text)
+            tail = page_text[-64:]
+            if len(page_text) > 64 and not page_text[-65].isspace():
+                tail = "".join(tail.split(None, 1)[1:])  # drop the cut-off first word
+            self._tail = tail
+
+        tokens = page_text.split()
+        new_tokens = set(tokens) - self._seen_tokens
+        self._seen_tokens.update(new_tokens)
+        novelty = len(new_tokens) / len(tokens) if tokens else 0.0
+        self._flat_pages = self._flat_pages + 1 if novelty < self.novelty_threshold else 0
+
+        if self.pages_seen < self.min_pages:
+            return False
+        if self.track_skills and not self.unresolved:
+            self.stop_reason = "skills resolved"
+        elif self._flat_pages >= self.patience:
+            self.stop_reason = "novelty flattened"
+        return self.stop_reason is not None
+
+def extract_text_streaming(resume_file, required_skills=None, backend=None,
+                           max_pages=DEFAULT_STREAM_MAX_PAGES, policy=None):
+    """
+    Extract PDF text page by page until the stop policy is satisfied.
+    Unlike extract_text_fast there is no fixed character cap.
+    """
+    policy = policy or StopPolicy(required_skills)
+    pages = []
+    try:
+        for page_text in iter_pdf_pages(resume_file, backend, max_pages):
+            if page_text:
+                pages.append(page_text)
+            if policy.update(page_text):
+                break
+    except MemoryError:
+        raise
+    except Exception as e:
+        print(f"Error extracting text from PDF: {e}")
+
+    return "\n".join(pages)
+
+# Documents with at least this many pages are split across processes in full-document mode
+PARALLEL_PAGE_THRESHOLD = int(os.getenv("RESUME_PARALLEL_PAGE_THRESHOLD", "8"))
+MIN_PAGES_PER_CHUNK = 2
+
+def _open_pdf_source(data):
+    """File object for a PDF given as bytes or as the path of a spooled upload"""
+    return open(data, 'rb') if isinstance(data, str) else io.BytesIO(data)
+
+def count_pdf_pages(data):
+    """Page count of a PDF given as bytes or a file path; only the page tree is read"""
+    with _open_pdf_source(data) as source:
+        if PDFMINER_AVAILABLE:
+            return sum(1 for _ in PDFPage.get_pages(source))
+        with pdfplumber.open(source) as pdf:
+            return len(pdf.pages)
+
+def split_page_range(page_count, chunks):
+    """Split pages [0, page_count) into `chunks` contiguous (first, last) ranges"""
+    chunks = max(1, min(chunks, page_count))
+    size, extra = divmod(page_count, chunks)
+    ranges = []
+    first = 0
+    for i in range(chunks):
+        last = first + size + (1 if i < extra else 0)
+        ranges.append((first, last))
+        first = last
+    return ranges
+
+def plan_page_chunks(page_count, batch_size=1, workers=None, threshold=None):
+    """
+    Number of page ranges to extract one document in (1 means don't split).
+
+    Documents shorter than the threshold are never split. In a batch, the
+    documents already keep the workers busy, so a document is only split
+    over the workers left over once each document has one (workers // batch_size).
+    """
+    workers = workers or os.cpu_count() or 1
+    threshold = threshold or PARALLEL_PAGE_THRESHOLD
+    if page_count < threshold:
+        return 1
+    return max(1, min(workers // max(batch_size, 1), page_count // MIN_PAGES_PER_CHUNK))
+
+def extract_page_range(data, first_page, last_page, backend=None):
+    """
+    Lowercased text of pages [first_page, last_page) of a PDF given as bytes
+    or a file path (process-pool entry point)
+    """
+    page_extractor = PDF_BACKENDS[resolve_pdf_backend(backend)]
+    with _open_pdf_source(data) as source:
+        return [page_text.lower() for page_text in page_extractor(source, last_page, first_page=first_page)]
+
+def extract_text_parallel(resume_file, backend=None, workers=None, threshold=None, batch_size=1):
+    """
+    Extract every page of a PDF. Long documents are split into page ranges
+    that are extracted in parallel worker processes and reassembled in order.
+    batch_size is the number of documents being extracted alongside this one
+    (see plan_page_chunks), so concurrent callers don't each start a full pool.
+    """
+    backend = resolve_pdf_backend(backend)
+    try:
+        # Workers reopen a spooled upload from disk instead of receiving a pickled copy
+        data = resume_file.path if isinstance(resume_file, MappedUpload) else read_upload_bytes(resume_file)
+        page_count = count_pdf_pages(data)
+
+        # Already inside a pool or sandbox worker: never nest another pool
+        if multiprocessing.parent_process() is not None:
+            chunks = 1
+        else:
+            chunks = plan_page_chunks(page_count, batch_size, workers, threshold)
+
+        if chunks > 1:
+            ranges = split_page_range(page_count, chunks)
+            with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+                futures = [executor.submit(extract_page_range, data, first, last, backend)
+                           for first, last in ranges]
+                pages = [page_text for future in futures for page_text in future.result()]
+        else:
+            pages = extract_page_range(data, 0, page_count, backend)
+
+    except MemoryError:
+        raise
+    except Exception as e:
+        print(f"Error extracting text from PDF: {e}")
+        return ""
+
+    return "\n".join(page_text for page_text in pages if page_text)
+
+def read_upload_bytes(resume_file):
+    """Read the raw bytes of an uploaded file (Streamlit upload, file object or path holder)"""
+    if hasattr(resume_file, 'getvalue'):
+        content = resume_file.getvalue()
+    elif hasattr(resume_file, 'read'):
+        try:
+            resume_file.seek(0)
+        except Exception:
+            pass
+        content = resume_file.read()
+    elif hasattr(resume_file, 'path'):
+        with open(resume_file.path, 'rb') as f:
+            content = f.read()
+    else:
+        content = b""
+
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    return content or b""
+
+def _upload_buffer(resume_file):
+    """
+    Zero-copy view of an upload's bytes when the object supports it
+    (Streamlit's UploadedFile is a BytesIO), otherwise the bytes themselves
+    """
+    if hasattr(resume_file, 'getbuffer'):
+        try:
+            return resume_file.getbuffer()
+        except Exception:
+            pass
+    return read_upload_bytes(resume_file)
+
+def _release(buffer):
+    """Release a memoryview so the underlying upload can be resized or closed again"""
+    if isinstance(buffer, memoryview):
+        buffer.release()
+
+def _peek_header(resume_file, size=SNIFF_BYTES):
+    """Read the first bytes of an upload without consuming it"""
+    if hasattr(resume_file, 'getbuffer'):
+        try:
+            with resume_file.getbuffer() as buffer:
+                return bytes(buffer[:size])
+        except Exception:
+            pass
+    if hasattr(resume_file, 'read'):
+        try:
+            resume_file.seek(0)
+            head = resume_file.read(size)
+            resume_file.seek(0)
+            return head.encode('utf-8') if isinstance(head, str) else head
+        except Exception:
+            pass
+    if hasattr(resume_file, 'getvalue'):
+        return resume_file.getvalue()[:size]
+    if hasattr(resume_file, 'path'):
+        with open(resume_file.path, 'rb') as f:
+            return f.read(size)
+    return b""
+
+# Uploads larger than this are spooled to a temp file and memory-mapped (RESUME_SPOOL_THRESHOLD_MB)
+SPOOL_THRESHOLD = int(float(os.getenv("RESUME_SPOOL_THRESHOLD_MB", "4")) * 1024 * 1024)
+
+class MappedUpload:
+    """
+    Read-only, memory-mapped view of an upload spooled to disk.
+
+    Behaves like the BytesIO uploads the extractors already accept: read/seek
+    for the parsers and getbuffer() for zero-copy hashing and sniffing, all
+    backed by the same mapping. `path` lets worker processes reopen the file.
+    """
+
+    def __init__(self, path, name):
+        self.path = path
+        self.name = name
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def read(self, size=-1):
+        return self._map.read(size)
+
+    def seek(self, position, whence=0):
+        self._map.seek(position, whence)
+        return self._map.tell()
+
+    def tell(self):
+        return self._map.tell()
+
+    def seekable(self):
+        return True
+
+    def readable(self):
+        return True
+
+    def getbuffer(self):
+        return memoryview(self._map)
+
+    def getvalue(self):
+        """Copy of the whole file; prefer getbuffer()"""
+        return self._map[:]
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+def _upload_size(resume_file):
+    """Size of an upload in bytes without reading it, or None when unknown"""
+    if hasattr(resume_file, 'getbuffer'):
+        try:
+            with resume_file.getbuffer() as buffer:
+                return buffer.nbytes
+        except Exception:
+            pass
+    if hasattr(resume_file, 'size'):
+        return resume_file.size
+    if hasattr(resume_file, 'path'):
+        try:
+            return os.path.getsize(resume_file.path)
+        except OSError:
+            pass
+    return None
+
+def _spool(resume_file, handle):
+    """Copy an upload into an open temp file without materialising a second in-memory copy"""
+    buffer = _upload_buffer(resume_file)
+    try:
+        handle.write(buffer)
+    finally:
+        _release(buffer)
+
+@contextmanager
+def ingest_upload(resume_file, threshold=None):
+    """
+    Yield the upload to extract from: small uploads unchanged, larger ones
+    spooled to a temp file (RESUME_SPOOL_DIR, default the system temp dir)
+    and memory-mapped. The temp file is removed on exit.
+    """
+    threshold = SPOOL_THRESHOLD if threshold is None else threshold
+    if isinstance(resume_file, MappedUpload):
+        yield resume_file
+        return
+    size = _upload_size(resume_file)
+    if not size or size <= threshold:
+        yield resume_file
+        return
+
+    name = getattr(resume_file, 'name', 'upload')
+    if not hasattr(resume_file, 'read') and hasattr(resume_file, 'path'):
+        # Already on disk: map it in place
+        upload = MappedUpload(resume_file.path, name)
+        try:
+            yield upload
+        finally:
+            upload.close()
+        return
+
+    handle = tempfile.NamedTemporaryFile(prefix="resume-", suffix=".spool", delete=False,
+                                         dir=os.getenv("RESUME_SPOOL_DIR") or None)
+    try:
+        with handle:
+            _spool(resume_file, handle)
+        upload = MappedUpload(handle.name, name)
+        try:
+            yield upload
+        finally:
+            upload.close()
+    finally:
+        try:
+            os.unlink(handle.name)
+        except OSError:
+            pass
+
+def sniff_format(head):
     """
-    Standard text extraction with fallback for different file types
+    Classify an upload from its leading bytes: 'pdf', 'docx', 'text' or 'binary'
     """
+    if not head:
+        return "text"
+    # The PDF spec allows junk before the header within the first 1024 bytes
+    if head.startswith(b'%PDF') or b'%PDF-' in head[:SNIFF_BYTES]:
+        return "pdf"
+    if head.startswith(b'PK\x03\x04'):
+        return "docx"
+    if b'\x00' in head:
+        return "binary"
     try:
-        # Check if it's a text file or has text content
-        if hasattr(resume_file, 'getvalue'):
-            content = resume_file.getvalue()
-            if isinstance(content, bytes):
+        head.decode('utf-8')
+        return "text"
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off at the end of the sample is still text
+        if e.start >= len(head) - 3 and e.reason == 'unexpected end of data':
+            return "text"
+        return "binary"
+
+def extract_text_plain(resume_file):
+    """Decode a plain-text resume"""
+    buffer = _upload_buffer(resume_file)
+    try:
+        return str(buffer, 'utf-8', errors='ignore').lower()[:3000]
+    finally:
+        _release(buffer)
+
+def extract_text_docx(resume_file):
+    """Extract paragraph and table text from a DOCX resume"""
+    try:
+        if hasattr(resume_file, 'seek'):
+            resume_file.seek(0)
+        source = resume_file if hasattr(resume_file, 'read') else io.BytesIO(read_upload_bytes(resume_file))
+
+        if DOCX_AVAILABLE:
+            document = Document(source)
+            parts = [paragraph.text for paragraph in document.paragraphs]
+            for table in document.tables:
+                for row in table.rows:
+                    parts.extend(cell.text for cell in row.cells)
+        else:
+            with zipfile.ZipFile(source) as archive:
+                xml = archive.read('word/document.xml').decode('utf-8', errors='ignore')
+            parts = re.findall(r'<w:t[^>]*>([^<]*)</w:t>', xml.replace('</w:p>', '</w:p>\n'))
+
+        text = "\n".join(part for part in parts if part)
+    except Exception as e:
+        print(f"Error extracting text from DOCX: {e}")
+        return ""
+
+    return text.lower()[:3000] if text else ""
+
+# Extractor used for each sniffed format
+FORMAT_EXTRACTORS = {
+    "pdf": extract_text_fast,
+    "docx": extract_text_docx,
+    "text": extract_text_plain,
+}
+
+def extract_text(resume_file, use_cache=True, backend=None, required_skills=None, full_document=False,
+                 batch_size=1):
+    """
+    Standard text extraction with fallback for different file types.
+    Results are cached on disk by content digest, so re-uploads skip parsing.
+
+    Uploads above SPOOL_THRESHOLD are spooled to disk and memory-mapped first,
+    so hashing, sniffing and parsing share one buffer.
+
+    Passing required_skills (the JD's must-haves) switches PDFs to streaming
+    extraction: pages are read until those skills are found or new pages stop
+    adding vocabulary, instead of cutting off at 3 pages / 3000 characters.
+    full_document=True extracts every page, splitting long PDFs across processes
+    when the batch (batch_size documents extracted concurrently) leaves workers free.
+
+    Raises ImageOnlyPDFError for scanned PDFs with no text layer.
+    """
+    backend = resolve_pdf_backend(backend)
+    policy = None
+    if full_document:
+        versions = [f"{EXTRACTOR_VERSION}:{backend}:full"]
+    elif required_skills is None:
+        versions = [f"{EXTRACTOR_VERSION}:{backend}"]
+    else:
+        policy = StopPolicy(required_skills)
+        # Complete documents are reusable for any JD; early-stopped ones only for the same skills
+        complete_version = f"{EXTRACTOR_VERSION}:{backend}:stream"
+        skills_key = content_digest("\n".join(sorted(policy.unresolved)).encode('utf-8'))[:16]
+        versions = [complete_version, f"{complete_version}:p{STOP_POLICY_VERSION}:{skills_key}"]
+
+    with ingest_upload(resume_file) as upload:
+        cache = get_text_cache() if use_cache else None
+        digest = None
+        if cache is not None:
+            try:
+                data = _upload_buffer(upload)
                 try:
-                    # Try to decode as text first
-                    text_content = content.decode('utf-8')
-                    return text_content.lower()[:3000]  # Limit length
-                except UnicodeDecodeError:
-                    pass  # Continue to PDF extraction
+                    digest = content_digest(data) if len(data) else None
+                finally:
+                    _release(data)
+                for version in versions if digest else []:
+                    cached_text = cache.get(digest, version)
+                    if cached_text is not None:
+                        return cached_text
+            except Exception as e:
+                print(f"Error reading text cache: {e}")
+                digest = None
+
+        text = _extract_text_uncached(upload, backend, policy, full_document, batch_size)
 
-        # Try PDF extraction
-        return extract_text_fast(resume_file)
+    if cache is not None and digest and text:
+        early_stopped = policy is not None and policy.stop_reason is not None
+        cache.put(digest, versions[-1] if early_stopped else versions[0], text)
+    return text
+
+def get_extraction_cache_stats():
+    """Hit/miss counters of the extracted-text cache (empty dict when disabled)"""
+    cache = get_text_cache()
+    return cache.stats() if cache is not None else {}
+
+def _extract_text_uncached(resume_file, backend=None, policy=None, full_document=False, batch_size=1):
+    """
+    Extract text without consulting the cache, dispatching on the file's magic bytes
+    """
+    try:
+        file_format = sniff_format(_peek_header(resume_file))
+        if file_format == "pdf" and IMAGE_PDF_PROBE and probe_pdf_text_layer(resume_file) == "image":
+            raise ImageOnlyPDFError()
+        if file_format in ("pdf", "binary"):
+            # Unknown binary content: let the PDF parser decide
+            if full_document:
+                return extract_text_parallel(resume_file, backend=backend, batch_size=batch_size)
+            if policy is not None:
+                return extract_text_streaming(resume_file, backend=backend, policy=policy)
+            return extract_text_fast(resume_file, backend=backend)
+        return FORMAT_EXTRACTORS[file_format](resume_file)
 
+    except (MemoryError, ImageOnlyPDFError):
+        raise
     except Exception as e:
         print(f"Error in text extraction: {e}")
         # Last resort: try to read as plain text
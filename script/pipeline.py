@@ -1,8 +1,8 @@
 import sys
 import os
+import io
 import time
-from concurrent.futures import ThreadPoolExecutor
-import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 
 # Add the script directory to the Python path
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -10,66 +10,86 @@ if script_dir not in sys.path:
     sys.path.append(script_dir)
 
 try:
-    from parse_resume import extract_text
-    from parse_jd import extract_skills
-    from hard_match import calculate_hard_score
-    from semantic_match import calculate_semantic_score
+    from parse_resume import (extract_text, read_upload_bytes, sniff_format, count_pdf_pages,
+                              plan_page_chunks, split_page_range, extract_page_range,
+                              probe_pdf_text_layer, ImageOnlyPDFError, NEEDS_OCR_MESSAGE)
+    from parse_jd import extract_skills_batch, skills_version
+    from jd_cache import get_jd_cache
+    from hard_match import calculate_hard_scores_batch
+    # app.py warms up and reports on the model through these, so both use this one module
+    from semantic_match import (calculate_semantic_batch, warm_up, model_status, ADVANCED_SEMANTIC,
+                                SEMANTIC_COVERAGE)
     from feedback import generate_feedback
+    from extraction_sandbox import ExtractionSandbox, DEFAULT_TIMEOUT, DEFAULT_MEMORY_LIMIT_MB
 except ImportError:
     # Fallback to absolute imports
-    from script.parse_resume import extract_text
-    from script.parse_jd import extract_skills
-    from script.hard_match import calculate_hard_score
-    from script.semantic_match import calculate_semantic_score
+    from script.parse_resume import (extract_text, read_upload_bytes, sniff_format, count_pdf_pages,
+                                     plan_page_chunks, split_page_range, extract_page_range,
+                                     probe_pdf_text_layer, ImageOnlyPDFError, NEEDS_OCR_MESSAGE)
+    from script.parse_jd import extract_skills_batch, skills_version
+    from script.jd_cache import get_jd_cache
+    from script.hard_match import calculate_hard_scores_batch
+    from script.semantic_match import (calculate_semantic_batch, warm_up, model_status, ADVANCED_SEMANTIC,
+                                       SEMANTIC_COVERAGE)
     from script.feedback import generate_feedback
+    from script.extraction_sandbox import ExtractionSandbox, DEFAULT_TIMEOUT, DEFAULT_MEMORY_LIMIT_MB
 
-# Cache for processed job descriptions to avoid reprocessing
-_jd_cache = {}
-_cache_lock = threading.Lock()
+# Read PDFs page by page until the JD's must-have skills are found, instead of 3 pages / 3000 chars
+STREAMING_EXTRACTION = os.getenv("RESUME_STREAMING_EXTRACTION", "").lower() in ("1", "true", "yes")
+
+# Extract every page instead of the first 3 (long PDFs are split across processes)
+FULL_DOCUMENT_EXTRACTION = os.getenv("RESUME_FULL_DOCUMENT_EXTRACTION", "").lower() in ("1", "true", "yes")
 
 def extract_skills_cached(jd_text):
-    """Cache job description skill extraction to avoid reprocessing"""
-    jd_hash = hash(jd_text)
+    """Cache job description skill extraction to avoid reprocessing (see jd_cache for the bounds)"""
+    return extract_skills_cached_batch([jd_text])[0]
+
+def extract_skills_cached_batch(jd_texts):
+    """Skills for a library of JDs; cache misses are extracted together in one batch"""
+    cache = get_jd_cache()
+    version = skills_version()
+    results = [cache.get(jd_text, version) for jd_text in jd_texts]
 
-    with _cache_lock:
-        if jd_hash in _jd_cache:
-            return _jd_cache[jd_hash]
+    missing = [index for index, cached in enumerate(results) if cached is None]
+    if missing:
+        extracted = extract_skills_batch([jd_texts[index] for index in missing])
+        for index, skills in zip(missing, extracted):
+            cache.put(jd_texts[index], version, skills)
+            results[index] = skills
+    return results
 
-    must_have, good_to_have = extract_skills(jd_text)
+def get_jd_cache_stats():
+    """Hit, miss and eviction counters of the JD skills cache"""
+    return get_jd_cache().stats()
 
-    with _cache_lock:
-        _jd_cache[jd_hash] = (must_have, good_to_have)
+def _error_result(resume_name, message, start_time=None):
+    """Result row for a resume that could not be evaluated"""
+    return {
+        "Resume": resume_name,
+        "Total Score": 0,
+        "Verdict": "Error",
+        "Missing Skills": [],
+        "Feedback": message,
+        "Processing Time": round(time.time() - start_time, 2) if start_time else 0
+    }
 
-    return must_have, good_to_have
+def _needs_ocr_result(resume_name, start_time=None):
+    """Result row for a scanned resume with no text layer"""
+    result = _error_result(resume_name, NEEDS_OCR_MESSAGE, start_time)
+    result["Verdict"] = "Needs OCR"
+    return result
 
-def evaluate_resume_fast(resume_file, jd_text, skip_feedback=False):
+def score_resume_text(resume_name, resume_text, jd_text, skip_feedback=False, start_time=None):
     """
-    Fast resume evaluation with simplified processing (no parallel execution to avoid hanging)
+    Score already-extracted resume text against a job description
     """
-    start_time = time.time()
+    return score_resume_texts([resume_name], [resume_text], jd_text, skip_feedback, [start_time])[0]
 
+def _finish_result(resume_name, resume_text, jd_text, hard_score, semantic_score, missing_skills,
+                   skip_feedback, start_time):
+    """Result row for one scored resume, with its feedback unless skipped"""
     try:
-        # Extract text (this is usually the slowest part)
-        resume_text = extract_text(resume_file)
-
-        if not resume_text:
-            return {
-                "Resume": resume_file.name,
-                "Total Score": 0,
-                "Verdict": "Error",
-                "Missing Skills": [],
-                "Feedback": "Could not extract text from resume",
-                "Processing Time": round(time.time() - start_time, 2)
-            }
-
-        # Use cached skill extraction
-        must_have, good_to_have = extract_skills_cached(jd_text)
-
-        # Calculate scores sequentially for reliability (avoid parallel processing issues)
-        hard_score, missing_skills = calculate_hard_score(resume_text, must_have)
-        semantic_score = calculate_semantic_score(resume_text, must_have + good_to_have)
-
-        total_score = hard_score + semantic_score
+        total_score = int(hard_score) + semantic_score
         verdict = "High" if total_score >= 75 else "Medium" if total_score >= 50 else "Low"
 
         # Skip feedback for faster processing if requested
@@ -77,27 +97,87 @@ def evaluate_resume_fast(resume_file, jd_text, skip_feedback=False):
             feedback = "Feedback skipped for faster processing"
         else:
             feedback = generate_feedback(resume_text, jd_text)
+    except Exception as e:
+        return _error_result(resume_name, f"Processing error: {str(e)}", start_time)
+
+    processing_time = time.time() - start_time
+
+    return {
+        "Resume": resume_name,
+        "Total Score": round(total_score, 2),
+        "Verdict": verdict,
+        "Missing Skills": missing_skills,
+        "Feedback": feedback,
+        "Processing Time": round(processing_time, 2)
+    }
+
+def score_resume_texts(resume_names, resume_texts, jd_text, skip_feedback=False, start_times=None, max_workers=1):
+    """
+    Score already-extracted resumes against one job description.
+
+    The must-have skills are matched against every resume in one batch
+    (see calculate_hard_scores_batch) and the semantic scores are computed
+    in one batch too (calculate_semantic_batch), which in semantic coverage
+    mode also clears missing skills the resume covers semantically.
+    Feedback is generated per resume, on max_workers threads. Results keep
+    the input order.
+    """
+    now = time.time()
+    start_times = [start_time or now for start_time in (start_times or [None] * len(resume_names))]
+
+    # Use cached skill extraction
+    must_have, good_to_have = extract_skills_cached(jd_text)
+
+    scored = [i for i, resume_text in enumerate(resume_texts) if resume_text]
+    texts = [resume_texts[i] for i in scored]
+    _, hard_scores, missing = calculate_hard_scores_batch(texts, must_have)
+    semantic_scores, coverage = calculate_semantic_batch(texts, must_have + good_to_have, must_have)
+    if coverage is not None:
+        # Semantic coverage mode: skills a resume covers in other words are not missing
+        missing = [[skill for skill, covered in zip(must_have, covered_row) if not covered and skill in row_missing]
+                   for covered_row, row_missing in zip(coverage, missing)]
+
+    results = [_error_result(name, "Could not extract text from resume", start_time)
+               for name, start_time in zip(resume_names, start_times)]
+    rows = [(resume_names[i], resume_texts[i], jd_text, hard_score, semantic_score, missing_skills,
+             skip_feedback, start_times[i])
+            for i, hard_score, missing_skills, semantic_score in zip(scored, hard_scores, missing, semantic_scores)]
+    if skip_feedback or max_workers <= 1 or len(rows) <= 1:
+        finished = [_finish_result(*row) for row in rows]
+    else:
+        # Feedback calls (OpenAI when configured) wait on the network, so they overlap on threads
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            finished = list(executor.map(lambda row: _finish_result(*row), rows))
+    for i, result in zip(scored, finished):
+        results[i] = result
+    return results
 
-        processing_time = time.time() - start_time
+def _full_document(full_document):
+    """Resolve the per-call full-document flag against the module default"""
+    return FULL_DOCUMENT_EXTRACTION if full_document is None else full_document
+
+def _required_skills(jd_text, streaming):
+    """Must-have skills that drive streaming extraction, or None for the fixed-budget extractor"""
+    if streaming is None:
+        streaming = STREAMING_EXTRACTION
+    return extract_skills_cached(jd_text)[0] if streaming else None
+
+def evaluate_resume_fast(resume_file, jd_text, skip_feedback=False, streaming=None, full_document=None):
+    """
+    Fast resume evaluation with simplified processing (no parallel execution to avoid hanging)
+    """
+    start_time = time.time()
 
-        return {
-            "Resume": resume_file.name,
-            "Total Score": round(total_score, 2),
-            "Verdict": verdict,
-            "Missing Skills": missing_skills,
-            "Feedback": feedback,
-            "Processing Time": round(processing_time, 2)
-        }
+    try:
+        # Extract text (this is usually the slowest part)
+        resume_text = extract_text(resume_file, required_skills=_required_skills(jd_text, streaming),
+                                   full_document=_full_document(full_document))
+        return score_resume_text(resume_file.name, resume_text, jd_text, skip_feedback, start_time)
 
+    except ImageOnlyPDFError:
+        return _needs_ocr_result(resume_file.name, start_time)
     except Exception as e:
-        return {
-            "Resume": resume_file.name,
-            "Total Score": 0,
-            "Verdict": "Error",
-            "Missing Skills": [],
-            "Feedback": f"Processing error: {str(e)}",
-            "Processing Time": round(time.time() - start_time, 2)
-        }
+        return _error_result(resume_file.name, f"Processing error: {str(e)}", start_time)
 
 def evaluate_resume(resume_file, jd_text):
     """
@@ -105,77 +185,234 @@ def evaluate_resume(resume_file, jd_text):
     """
     return evaluate_resume_fast(resume_file, jd_text, skip_feedback=False)
 
-def evaluate_resumes_batch(resume_files, jd_text, max_workers=2, skip_feedback=True):
-    """
-    Batch process multiple resumes with simplified parallel processing
+class _UploadedBytes(io.BytesIO):
+    """In-memory stand-in for an uploaded file, rebuilt inside worker processes"""
+
+    def __init__(self, data, name):
+        super().__init__(data)
+        self.name = name
+
+def _evaluate_resume_bytes(name, data, jd_text, skip_feedback, full_document=None):
+    """Worker-process entry point: rebuild the upload from bytes, then extract and score it"""
+    return evaluate_resume_fast(_UploadedBytes(data, name), jd_text, skip_feedback, full_document=full_document)
+
+def _evaluate_batch_processes(resume_files, jd_text, max_workers, skip_feedback, full_document=None):
     """
-    if not resume_files:
-        return []
+    Evaluate resumes on a process pool so CPU-bound PDF extraction is not serialized by the GIL.
 
-    start_time = time.time()
+    In full-document mode, a long PDF in a batch smaller than the pool is
+    split into page ranges that share the same pool, then scored here.
+    """
     results = []
+    workers = max_workers or os.cpu_count() or 1
+    full_document = _full_document(full_document)
+    split_documents = full_document and len(resume_files) < workers
+    pool_size = workers if split_documents else min(workers, len(resume_files))
 
-    # Pre-cache the job description skills
-    try:
-        extract_skills_cached(jd_text)
-    except Exception:
-        pass  # Continue even if caching fails
-
-    # For small batches, process sequentially to avoid issues
-    if len(resume_files) <= 2:
+    with ProcessPoolExecutor(max_workers=pool_size) as executor:
+        futures = []
         for resume_file in resume_files:
             try:
-                result = evaluate_resume_fast(resume_file, jd_text, skip_feedback)
-                results.append(result)
+                data = read_upload_bytes(resume_file)
+                chunks = 1
+                if split_documents and sniff_format(data[:1024]) == "pdf":
+                    page_count = count_pdf_pages(data)
+                    chunks = plan_page_chunks(page_count, len(resume_files), workers)
+
+                if chunks > 1 and probe_pdf_text_layer(io.BytesIO(data)) == "image":
+                    futures.append((resume_file, ImageOnlyPDFError()))
+                elif chunks > 1:
+                    page_futures = [executor.submit(extract_page_range, data, first, last)
+                                    for first, last in split_page_range(page_count, chunks)]
+                    futures.append((resume_file, page_futures))
+                else:
+                    futures.append((resume_file, executor.submit(
+                        _evaluate_resume_bytes, resume_file.name, data, jd_text, skip_feedback, full_document)))
+            except Exception as e:
+                futures.append((resume_file, e))
+
+        # Collect results in submission order
+        for resume_file, future in futures:
+            start_time = time.time()
+            try:
+                if isinstance(future, ImageOnlyPDFError):
+                    results.append(_needs_ocr_result(resume_file.name))
+                    continue
+                if isinstance(future, Exception):
+                    raise future
+                if isinstance(future, list):
+                    # Page ranges of one split document: reassemble in order, then score
+                    pages = [page_text for page_future in future for page_text in page_future.result(timeout=60)]
+                    resume_text = "\n".join(page_text for page_text in pages if page_text)
+                    results.append(score_resume_text(resume_file.name, resume_text, jd_text,
+                                                     skip_feedback, start_time))
+                else:
+                    results.append(future.result(timeout=60))  # 60 second timeout per resume
             except Exception as e:
                 results.append({
                     "Resume": resume_file.name,
                     "Total Score": 0,
                     "Verdict": "Error",
                     "Missing Skills": [],
-                    "Feedback": f"Processing error: {str(e)}",
+                    "Feedback": f"Processing timeout or error: {str(e)}",
                     "Processing Time": 0
                 })
+
+    return results
+
+def _evaluate_batch_sandboxed(resume_files, jd_text, max_workers, skip_feedback,
+                              extraction_timeout, memory_limit_mb, full_document=None):
+    """
+    Extract text in killable sandbox workers, then score in this process.
+    Full documents are extracted page range by page range inside one worker.
+    """
+    documents = []
+    results = [None] * len(resume_files)
+    for i, resume_file in enumerate(resume_files):
+        try:
+            documents.append((i, resume_file.name, read_upload_bytes(resume_file)))
+        except Exception as e:
+            results[i] = _error_result(resume_file.name, f"Processing error: {str(e)}")
+
+    with ExtractionSandbox(max_workers, extraction_timeout, memory_limit_mb) as sandbox:
+        outcomes = sandbox.extract_many([(name, data) for _, name, data in documents],
+                                        required_skills=_required_skills(jd_text, None),
+                                        full_document=_full_document(full_document))
+
+    extracted = []
+    for (i, name, _), (resume_text, error, elapsed) in zip(documents, outcomes):
+        start_time = time.time() - elapsed
+        if isinstance(error, ImageOnlyPDFError):
+            results[i] = _needs_ocr_result(name, start_time)
+        elif error:
+            results[i] = _error_result(name, error, start_time)
+        else:
+            extracted.append((i, name, resume_text, start_time))
+
+    _score_extracted(extracted, results, jd_text, skip_feedback, sandbox.size)
+    return results
+
+def _score_extracted(extracted, results, jd_text, skip_feedback, max_workers=1):
+    """
+    Score [(index, name, resume_text, start_time)] in one batch into results[index].
+    If the batch fails, each resume is scored on its own so only the failing ones become Error rows.
+    """
+    if not extracted:
+        return
+    indexes, names, resume_texts, start_times = zip(*extracted)
+    try:
+        scored = score_resume_texts(names, resume_texts, jd_text, skip_feedback, start_times, max_workers)
+    except Exception:
+        scored = []
+        for name, resume_text, start_time in zip(names, resume_texts, start_times):
+            try:
+                scored.append(score_resume_text(name, resume_text, jd_text, skip_feedback, start_time))
+            except Exception as e:
+                scored.append(_error_result(name, f"Processing error: {str(e)}", start_time))
+    for i, result in zip(indexes, scored):
+        results[i] = result
+
+def _extract_for_scoring(resume_file, jd_text, full_document, batch_size=1):
+    """Extract one resume's text for batch scoring: (resume_text, start_time, error_result)"""
+    start_time = time.time()
+    try:
+        resume_text = extract_text(resume_file, required_skills=_required_skills(jd_text, None),
+                                   full_document=_full_document(full_document), batch_size=batch_size)
+        return resume_text, start_time, None
+    except ImageOnlyPDFError:
+        return None, start_time, _needs_ocr_result(resume_file.name, start_time)
+    except Exception as e:
+        return None, start_time, _error_result(resume_file.name, f"Processing error: {str(e)}", start_time)
+
+def _evaluate_batch_threads(resume_files, jd_text, max_workers, skip_feedback, full_document=None):
+    """
+    Extract text sequentially (two resumes or fewer) or on a small thread
+    pool, then score every extracted resume in one batch (feedback on the same number of threads).
+    Full documents are only split across processes when the batch is smaller than the CPU count.
+    """
+    threads = 1 if len(resume_files) <= 2 else min(max_workers or 2, 2)
+    batch_size = len(resume_files)
+    outcomes = []
+    if threads == 1:
+        # For small batches, process sequentially to avoid issues
+        outcomes = [_extract_for_scoring(resume_file, jd_text, full_document, batch_size)
+                    for resume_file in resume_files]
     else:
         # Process larger batches with limited parallelism
         try:
-            with ThreadPoolExecutor(max_workers=min(max_workers, 2)) as executor:
-                # Submit all resume processing tasks
-                future_to_resume = {
-                    executor.submit(evaluate_resume_fast, resume_file, jd_text, skip_feedback): resume_file
-                    for resume_file in resume_files
-                }
-
-                # Collect results as they complete
-                for future in future_to_resume:
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                futures = [executor.submit(_extract_for_scoring, resume_file, jd_text, full_document, batch_size)
+                           for resume_file in resume_files]
+
+                # Collect results in submission order
+                for resume_file, future in zip(resume_files, futures):
                     try:
-                        result = future.result(timeout=60)  # 60 second timeout per resume
-                        results.append(result)
+                        outcomes.append(future.result(timeout=60))  # 60 second timeout per resume
                     except Exception as e:
-                        resume_file = future_to_resume[future]
-                        results.append({
+                        outcomes.append((None, None, {
                             "Resume": resume_file.name,
                             "Total Score": 0,
                             "Verdict": "Error",
                             "Missing Skills": [],
                             "Feedback": f"Processing timeout or error: {str(e)}",
                             "Processing Time": 0
-                        })
-        except Exception as e:
+                        }))
+        except Exception:
             # Fallback to sequential processing if parallel fails
-            for resume_file in resume_files:
-                try:
-                    result = evaluate_resume_fast(resume_file, jd_text, skip_feedback)
-                    results.append(result)
-                except Exception as e:
-                    results.append({
-                        "Resume": resume_file.name,
-                        "Total Score": 0,
-                        "Verdict": "Error",
-                        "Missing Skills": [],
-                        "Feedback": f"Processing error: {str(e)}",
-                        "Processing Time": 0
-                    })
+            outcomes = [_extract_for_scoring(resume_file, jd_text, full_document, batch_size)
+                        for resume_file in resume_files]
+
+    results = [error for _, _, error in outcomes]
+    extracted = [(i, resume_file.name, resume_text, start_time)
+                 for i, (resume_file, (resume_text, start_time, error)) in enumerate(zip(resume_files, outcomes))
+                 if error is None]
+    _score_extracted(extracted, results, jd_text, skip_feedback, threads)
+    return results
+
+def evaluate_resumes_batch(resume_files, jd_text, max_workers=2, skip_feedback=True, use_processes=False,
+                           isolate_extraction=False, extraction_timeout=DEFAULT_TIMEOUT,
+                           memory_limit_mb=DEFAULT_MEMORY_LIMIT_MB, full_document=None):
+    """
+    Batch process multiple resumes with simplified parallel processing.
+
+    With use_processes=True the file bytes are shipped to a process pool of
+    max_workers workers (all CPUs if None) so extraction scales across cores.
+    With isolate_extraction=True extraction runs in killable sandbox workers:
+    a document that exceeds extraction_timeout seconds or memory_limit_mb
+    comes back as an Error row and its worker is replaced.
+    full_document=True extracts every page; with use_processes, long PDFs
+    are also split across idle workers when the batch is smaller than the pool.
+    Outside the process pool, the extracted resumes are hard-matched against
+    the must-have skills together (see calculate_hard_scores_batch).
+    """
+    if not resume_files:
+        return []
+
+    start_time = time.time()
+    results = []
+
+    # Pre-cache the job description skills
+    try:
+        extract_skills_cached(jd_text)
+    except Exception:
+        pass  # Continue even if caching fails
+
+    if isolate_extraction:
+        try:
+            results = _evaluate_batch_sandboxed(resume_files, jd_text, max_workers, skip_feedback,
+                                                extraction_timeout, memory_limit_mb, full_document)
+        except Exception as e:
+            print(f"Extraction sandbox unavailable, falling back to threads: {e}")
+            results = []
+    elif use_processes and (len(resume_files) > 1 or _full_document(full_document)):
+        try:
+            results = _evaluate_batch_processes(resume_files, jd_text, max_workers, skip_feedback, full_document)
+        except Exception as e:
+            print(f"Process pool unavailable, falling back to threads: {e}")
+            results = []
+
+    if not results:
+        results = _evaluate_batch_threads(resume_files, jd_text, max_workers, skip_feedback, full_document)
 
     total_time = time.time() - start_time
 
@@ -0,0 +1,110 @@
+# int8 dynamic quantization of the embedding model, with a parity check against fp32
+import glob
+import os
+import sys
+import time
+
+import numpy as np
+
+PRECISIONS = ("fp32", "int8")
+
+def quantize_dynamic_int8(model, inplace=False):
+    """
+    SentenceTransformer whose transformer Linear layers run as int8 with
+    dynamically quantized activations (CPU only). Embedding tables and
+    LayerNorms stay fp32.
+
+    By default the model is deep-copied, for comparing both (parity_report).
+    With inplace=True the Linear layers of `model` itself are swapped, so
+    its other weights are not copied and stay shared pages when they are
+    mapped from disk (see model_store.share_weights).
+    """
+    import torch
+
+    quantized = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=inplace)
+    quantized.resume_precision = "int8"
+    return quantized
+
+def model_precision(model):
+    """'int8' for a model from quantize_dynamic_int8, else 'fp32'"""
+    return getattr(model, "resume_precision", "fp32")
+
+def score_deviation(reference_scores, candidate_scores, tolerance=1.0):
+    """
+    How far candidate semantic scores (0-50) are from the reference:
+    max and mean absolute deviation in points, the share of resumes off by
+    more than `tolerance` points, and the Spearman correlation of the rankings.
+    """
+    reference = np.asarray(reference_scores, dtype=np.float64)
+    candidate = np.asarray(candidate_scores, dtype=np.float64)
+    deviation = np.abs(candidate - reference)
+    rank_correlation = 1.0
+    if len(reference) > 1:
+        reference_ranks = reference.argsort().argsort()
+        candidate_ranks = candidate.argsort().argsort()
+        if reference_ranks.std() and candidate_ranks.std():
+            rank_correlation = float(np.corrcoef(reference_ranks, candidate_ranks)[0, 1])
+    return {
+        "resumes": len(reference),
+        "max_deviation": float(deviation.max()) if len(deviation) else 0.0,
+        "mean_deviation": float(deviation.mean()) if len(deviation) else 0.0,
+        "over_tolerance": float((deviation > tolerance).mean()) if len(deviation) else 0.0,
+        "rank_correlation": rank_correlation,
+    }
+
+def parity_report(resume_texts, jd_skills, reference_model, candidate_model, batch_size=None):
+    """Semantic scores of both models on the same resumes, with score_deviation and throughput"""
+    try:
+        from semantic_match import calculate_semantic_batch, split_chunks
+    except ImportError:
+        from script.semantic_match import calculate_semantic_batch, split_chunks
+
+    chunks = sum(len(split_chunks(text)) for text in resume_texts)
+    report = {"chunks": chunks}
+    scores = {}
+    for label, model in (("fp32", reference_model), ("int8", candidate_model)):
+        model.encode(["warm up"], convert_to_numpy=True)  # kernel initialization is not throughput
+        start_time = time.perf_counter()
+        # Bypass the embedding cache: time the models, not the cache
+        scores[label] = calculate_semantic_batch(resume_texts, jd_skills, advanced=True, coverage=False,
+                                                 batch_size=batch_size, model=model, use_cache=False)[0]
+        elapsed = time.perf_counter() - start_time
+        report[f"{label}_seconds"] = elapsed
+        report[f"{label}_chunks_per_second"] = chunks / elapsed if elapsed else float("inf")
+    report.update(score_deviation(scores["fp32"], scores["int8"]))
+    report["scores"] = scores
+    return report
+
+def resume_corpus(resume_dir=None):
+    """Extracted text of every resume in data/resumes"""
+    try:
+        from parse_resume import extract_text_fast
+    except ImportError:
+        from script.parse_resume import extract_text_fast
+
+    resume_dir = resume_dir or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                            "data", "resumes")
+    texts = []
+    for path in sorted(glob.glob(os.path.join(resume_dir, "*.pdf"))):
+        with open(path, "rb") as f:
+            texts.append(extract_text_fast(f))
+    return [text for text in texts if text]
+
+def print_report(report):
+    print(f"{report['resumes']} resumes, {report['chunks']} chunks")
+    print(f"  fp32: {report['fp32_chunks_per_second']:.1f} chunks/s   "
+          f"int8: {report['int8_chunks_per_second']:.1f} chunks/s   "
+          f"({report['fp32_seconds'] / report['int8_seconds']:.2f}x)")
+    print(f"  score deviation: max {report['max_deviation']:.2f}, mean {report['mean_deviation']:.2f} points, "
+          f"{report['over_tolerance']:.0%} over 1 point, rank correlation {report['rank_correlation']:.3f}")
+
+if __name__ == "__main__":
+    # python script/quantization.py [skill ...] -- int8 vs fp32 on data/resumes
+    try:
+        from semantic_match import _load_model
+    except ImportError:
+        from script.semantic_match import _load_model
+    jd_skills = sys.argv[1:] or ["python", "javascript", "react", "django", "sql", "aws", "docker",
+                                 "machine learning", "communication"]
+    fp32_model = _load_model("fp32")
+    print_report(parity_report(resume_corpus(), jd_skills, fp32_model, quantize_dynamic_int8(fp32_model)))
@@ -1,24 +1,225 @@
+import importlib.util
+import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Windows: model loads are only serialized within a process
+
+import numpy as np
+
 try:
-    from sentence_transformers import SentenceTransformer, util
-    # Use a smaller, faster model for better performance
-    model = None  # Lazy loading
-    SENTENCE_TRANSFORMERS_AVAILABLE = True
+    from embedding_cache import get_embedding_cache, embedding_key
+    from skill_taxonomy import get_skill_taxonomy
+    from model_store import local_model_path, load_local_model, MODEL_DIR
+    from quantization import quantize_dynamic_int8, model_precision, PRECISIONS
 except ImportError:
+    from script.embedding_cache import get_embedding_cache, embedding_key
+    from script.skill_taxonomy import get_skill_taxonomy
+    from script.model_store import local_model_path, load_local_model, MODEL_DIR
+    from script.quantization import quantize_dynamic_int8, model_precision, PRECISIONS
+
+# sentence-transformers pulls in torch; only check it is installed here and import it in get_model()
+SENTENCE_TRANSFORMERS_AVAILABLE = importlib.util.find_spec("sentence_transformers") is not None
+if not SENTENCE_TRANSFORMERS_AVAILABLE:
     print("Warning: sentence-transformers not available. Using basic semantic matching.")
-    SENTENCE_TRANSFORMERS_AVAILABLE = False
-    model = None
+model = None  # Lazy loading
+MODEL_NAME = 'all-MiniLM-L6-v2'
+
+# "int8" runs the model's Linear layers dynamically quantized (faster on CPU, see quantization.py)
+MODEL_PRECISION = os.getenv("RESUME_MODEL_PRECISION", "fp32").lower()
+if MODEL_PRECISION not in PRECISIONS:
+    print(f"Warning: unknown RESUME_MODEL_PRECISION '{MODEL_PRECISION}'. Using fp32.")
+    MODEL_PRECISION = "fp32"
+
+# Model lifecycle states reported by model_status()
+MODEL_UNAVAILABLE = "unavailable"  # sentence-transformers not installed
+MODEL_UNLOADED = "unloaded"
+MODEL_LOADING = "loading"
+MODEL_LOADED = "loaded"  # usable, first encode will still initialize kernels
+MODEL_READY = "ready"  # loaded and warmed up
+MODEL_FAILED = "failed"
+
+# Held while a process loads the model, so workers starting together load one at a time
+MODEL_LOCK_FILE = os.getenv("RESUME_MODEL_LOCK_FILE",
+                            os.path.join(tempfile.gettempdir(), "resume-checker-model.lock"))
+
+_model_lock = threading.Lock()  # held for the whole load
+_status_lock = threading.Lock()  # guards _model_status, never held for long
+_model_status = {"state": MODEL_UNLOADED, "error": None, "load_seconds": None, "warm": False}
+_warm_up_thread = None
+
+# Score with the sentence-transformer model instead of word overlap (slower but more accurate)
+ADVANCED_SEMANTIC = os.getenv("RESUME_SEMANTIC_ADVANCED", "").lower() in ("1", "true", "yes")
+
+# Texts per model.encode forward pass when scoring a batch of resumes
+ENCODE_BATCH_SIZE = int(os.getenv("RESUME_ENCODE_BATCH_SIZE", 32))
+
+# Texts are split into sentence-aligned chunks of up to this many characters, each encoded separately
+CHUNK_CHARS = int(os.getenv("RESUME_SEMANTIC_CHUNK_CHARS", 500))
+
+# Chunks encoded per text at most; longer texts are sampled evenly from start to end
+MAX_CHUNKS = int(os.getenv("RESUME_SEMANTIC_MAX_CHUNKS", 32))
+
+# How chunk similarities become one score: "max" (best chunk) or "mean" (all chunks)
+POOLING = os.getenv("RESUME_SEMANTIC_POOLING", "max").lower()
+
+# Credit must-have skills a resume chunk is semantically close to, instead of string matches only
+SEMANTIC_COVERAGE = os.getenv("RESUME_SEMANTIC_COVERAGE", "").lower() in ("1", "true", "yes")
+
+# Cosine similarity between a skill and a resume chunk that counts as covering the skill
+COVERAGE_THRESHOLD = float(os.getenv("RESUME_SEMANTIC_COVERAGE_THRESHOLD", 0.4))
+
+# Skill embeddings per (model, taxonomy version), filled as skills are first seen
+_skill_embeddings = {}
+_skill_embeddings_lock = threading.Lock()
+
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?;])\s+|\s*\n\s*")
+
+def _set_status(**changes):
+    with _status_lock:
+        _model_status.update(changes)
+
+@contextmanager
+def _load_lock():
+    """Exclusive lock file shared by every process on the host, held while loading"""
+    lock_file = None
+    if fcntl is not None:
+        try:
+            lock_file = open(MODEL_LOCK_FILE, "a")
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        except OSError as e:
+            # A read-only or foreign-owned lock file must not disable semantic scoring
+            print(f"Warning: model lock file {MODEL_LOCK_FILE} unavailable ({e}). "
+                  f"Loading without the cross-process lock.")
+            if lock_file is not None:
+                lock_file.close()
+            lock_file = None
+    try:
+        yield
+    finally:
+        if lock_file is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+            lock_file.close()
+
+def _load_model(precision=None):
+    # A local export (RESUME_MODEL_DIR) skips the Hugging Face cache lookups and maps the weights
+    directory = local_model_path()
+    if directory is not None:
+        loaded = load_local_model(directory)
+    elif MODEL_DIR:
+        # Fetching by name instead would hang in a container without network access
+        raise FileNotFoundError(f"RESUME_MODEL_DIR={MODEL_DIR} holds no exported model")
+    else:
+        from sentence_transformers import SentenceTransformer
+        # Use a smaller, faster model for better performance
+        loaded = SentenceTransformer(MODEL_NAME)
+    if (precision or MODEL_PRECISION) == "int8":
+        loaded = quantize_dynamic_int8(loaded, inplace=True)
+    return loaded
+
+def _model_name(model):
+    """Name of a loaded model: MODEL_NAME, or the model exported to RESUME_MODEL_DIR (see local_model_name)"""
+    return getattr(model, "resume_model_name", MODEL_NAME)
+
+def _model_id(model):
+    """Model identity for cached embeddings: quantized embeddings differ slightly from fp32 ones"""
+    precision = model_precision(model)
+    return _model_name(model) if precision == "fp32" else f"{_model_name(model)}:{precision}"
 
 def get_model():
-    """Lazy load the sentence transformer model for better startup performance"""
+    """
+    The sentence transformer model, loaded once per process on first use.
+    Threads asking while it loads wait for that one load instead of
+    starting their own; None if it is unavailable or failed to load.
+    """
     global model, SENTENCE_TRANSFORMERS_AVAILABLE
-    if model is None and SENTENCE_TRANSFORMERS_AVAILABLE:
-        try:
-            model = SentenceTransformer('all-MiniLM-L6-v2')
-        except Exception as e:
-            print(f"Error loading sentence transformer model: {e}")
-            SENTENCE_TRANSFORMERS_AVAILABLE = False
+    if model is not None or not SENTENCE_TRANSFORMERS_AVAILABLE:
+        return model
+    with _model_lock:
+        if model is None and SENTENCE_TRANSFORMERS_AVAILABLE:
+            _set_status(state=MODEL_LOADING, error=None)
+            start_time = time.time()
+            try:
+                with _load_lock():
+                    model = _load_model()
+                _set_status(state=MODEL_LOADED, load_seconds=round(time.time() - start_time, 2))
+            except Exception as e:
+                print(f"Error loading sentence transformer model: {e}")
+                SENTENCE_TRANSFORMERS_AVAILABLE = False
+                _set_status(state=MODEL_FAILED, error=str(e))
     return model
 
+def warm_up(background=False):
+    """
+    Load the model and run one dummy encode, so lazy kernel initialization
+    happens before the first real request. Returns True once the model is
+    ready. With background=True it runs on a daemon thread (one at a time)
+    and that thread is returned.
+    """
+    global _warm_up_thread
+    if background:
+        with _status_lock:
+            if _warm_up_thread is None or not _warm_up_thread.is_alive():
+                _warm_up_thread = threading.Thread(target=warm_up, name="semantic-model-warm-up", daemon=True)
+                _warm_up_thread.start()
+            return _warm_up_thread
+
+    current = get_model()
+    if current is None:
+        return False
+    with _model_lock:
+        if not _model_status["warm"]:
+            try:
+                current.encode(["warm up"], batch_size=1, normalize_embeddings=True, convert_to_numpy=True)
+            except Exception as e:
+                print(f"Error warming up sentence transformer model: {e}")
+                _set_status(error=str(e))
+                return False
+            _set_status(state=MODEL_READY, warm=True)
+    return True
+
+def model_status():
+    """
+    Readiness of the semantic model for the UI and health checks:
+    {"state", "ready", "model", "precision", "error", "load_seconds", "warm"}
+    """
+    with _status_lock:
+        status = dict(_model_status)
+    if status["state"] != MODEL_FAILED and not SENTENCE_TRANSFORMERS_AVAILABLE:
+        status["state"] = MODEL_UNAVAILABLE
+    elif model is not None and status["state"] in (MODEL_UNLOADED, MODEL_LOADING):
+        status["state"] = MODEL_LOADED  # installed directly rather than through get_model()
+    status["ready"] = status["state"] == MODEL_READY
+    status["model"] = _model_name(model) if model is not None else MODEL_NAME
+    status["precision"] = model_precision(model) if model is not None else MODEL_PRECISION
+    return status
+
+def _reset_model():
+    """Forget the loaded model and its state (used by tests)"""
+    global model
+    with _model_lock:
+        model = None
+        _set_status(state=MODEL_UNLOADED, error=None, load_seconds=None, warm=False)
+
+def _after_fork_in_child():
+    """A forked worker gets fresh locks; a load the parent had in progress is not inherited"""
+    global model, _model_lock, _status_lock, _warm_up_thread
+    _model_lock = threading.Lock()
+    _status_lock = threading.Lock()
+    _warm_up_thread = None
+    if _model_status["state"] == MODEL_LOADING:
+        model = None
+        _model_status.update(state=MODEL_UNLOADED, error=None)
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
 def calculate_semantic_score(resume_text, jd_skills):
     """
     Calculate semantic similarity score between resume and job requirements.
@@ -27,35 +228,170 @@ def calculate_semantic_score(resume_text, jd_skills):
     if not jd_skills:
         return 0
 
-    # Use basic scoring for faster processing (semantic transformers are slow)
-    # This provides good enough results for most use cases
-    return calculate_basic_semantic_score(resume_text, jd_skills)
+    # Use basic scoring for faster processing unless advanced mode is enabled
+    # (semantic transformers are slow); basic is good enough for most use cases
+    return calculate_semantic_scores_batch([resume_text], jd_skills)[0]
 
 def calculate_semantic_score_advanced(resume_text, jd_skills):
     """
     Advanced semantic scoring using transformers (slower but more accurate)
     """
+    return calculate_semantic_scores_batch([resume_text], jd_skills, advanced=True)[0]
+
+def calculate_semantic_scores_batch(resume_texts, jd_skills, advanced=None, batch_size=None, pooling=None):
+    """
+    Semantic scores (0-50) for many resumes against the same job requirements.
+
+    In advanced mode (RESUME_SEMANTIC_ADVANCED, or advanced=True) every
+    resume is split into chunks (see split_chunks) and the chunks of the
+    whole batch are encoded together in model.encode batches of batch_size
+    (RESUME_ENCODE_BATCH_SIZE); the JD skills are encoded once. A resume's
+    score is its chunk similarities pooled by `pooling` (POOLING), x 50.
+    Otherwise, or if the model is unavailable, each resume gets the basic
+    word-overlap score.
+    """
+    return calculate_semantic_batch(resume_texts, jd_skills, advanced=advanced, batch_size=batch_size,
+                                    pooling=pooling)[0]
+
+def calculate_semantic_batch(resume_texts, jd_skills, must_have_skills=(), coverage=None, advanced=None,
+                             batch_size=None, pooling=None, threshold=None, model=None, use_cache=True):
+    """
+    Semantic scores (see calculate_semantic_scores_batch) and skill coverage
+    for many resumes, encoding each resume chunk once for both.
+
+    With coverage on (RESUME_SEMANTIC_COVERAGE, or coverage=True) the second
+    value is an N x len(must_have_skills) bool array: True where some chunk
+    of the resume is within `threshold` (COVERAGE_THRESHOLD) cosine
+    similarity of the skill. It is None when coverage is off or the model is
+    unavailable. `model` overrides the shared model (see get_model);
+    use_cache=False encodes every text without the embedding cache.
+    """
     if not jd_skills:
-        return 0
+        return [0] * len(resume_texts), None
 
-    if SENTENCE_TRANSFORMERS_AVAILABLE:
-        model = get_model()
+    if advanced is None:
+        advanced = ADVANCED_SEMANTIC
+    if coverage is None:
+        coverage = SEMANTIC_COVERAGE
+    coverage = coverage and len(must_have_skills) > 0
+    scores, covered = None, None
+    if (advanced or coverage) and resume_texts and (model is not None or SENTENCE_TRANSFORMERS_AVAILABLE):
+        model = model or get_model()
         if model:
             try:
-                jd_text = " ".join(jd_skills)
-                # Limit text length for better performance
-                resume_text_limited = resume_text[:500] if len(resume_text) > 500 else resume_text
-                jd_text_limited = jd_text[:300] if len(jd_text) > 300 else jd_text
-
-                emb1 = model.encode(resume_text_limited, convert_to_tensor=True)
-                emb2 = model.encode(jd_text_limited, convert_to_tensor=True)
-                score = util.cos_sim(emb1, emb2).item() * 50
-                return min(max(score, 0), 50)
+                if advanced:
+                    jd_embeddings = encode_texts(model, split_chunks(" ".join(jd_skills)), CHUNK_CHARS, batch_size,
+                                                 use_cache)
+                chunk_embeddings, offsets = _encode_chunks(model, resume_texts, batch_size, use_cache)
+                if advanced:
+                    scores = _embedding_scores(chunk_embeddings, offsets, jd_embeddings, pooling or POOLING)
+                if coverage:
+                    covered = _skill_coverage(model, chunk_embeddings, offsets, must_have_skills, batch_size,
+                                              COVERAGE_THRESHOLD if threshold is None else threshold, use_cache)
             except Exception as e:
                 print(f"Error in semantic matching: {e}")
-                return calculate_basic_semantic_score(resume_text, jd_skills)
 
-    return calculate_basic_semantic_score(resume_text, jd_skills)
+    if scores is None:
+        scores = [calculate_basic_semantic_score(resume_text, jd_skills) for resume_text in resume_texts]
+    return scores, covered
+
+def split_chunks(text, chunk_chars=None, max_chunks=None):
+    """
+    Split text into chunks of up to chunk_chars characters, packing whole
+    sentences (or lines) and breaking longer ones between words. Runs in
+    linear time; past max_chunks, chunks are kept evenly spaced over the text.
+    """
+    chunk_chars = chunk_chars or CHUNK_CHARS
+    max_chunks = max_chunks or MAX_CHUNKS
+    chunks = []
+    current, current_length = [], 0
+    for sentence in _SENTENCE_BREAK.split(text):
+        words = sentence.split()
+        length = sum(map(len, words)) + len(words) - 1
+        if length <= 0:
+            continue
+        if current and current_length + 1 + length > chunk_chars:
+            chunks.append(" ".join(current))
+            current, current_length = [], 0
+        for word in words:
+            word = word[:chunk_chars]
+            if current and current_length + 1 + len(word) > chunk_chars:
+                chunks.append(" ".join(current))
+                current, current_length = [], 0
+            current_length += len(word) + (1 if current else 0)
+            current.append(word)
+    if current:
+        chunks.append(" ".join(current))
+
+    if len(chunks) > max_chunks:
+        chunks = [chunks[i] for i in np.unique(np.linspace(0, len(chunks) - 1, max_chunks).round().astype(int))]
+    return chunks or [text[:chunk_chars]]
+
+def _encode_chunks(model, resume_texts, batch_size, use_cache=True):
+    """Embeddings of every resume's chunks, stacked, and the row where each resume starts"""
+    resume_chunks = [split_chunks(resume_text) for resume_text in resume_texts]
+    offsets = np.cumsum([0] + [len(chunks) for chunks in resume_chunks[:-1]])
+    chunk_embeddings = encode_texts(model, [chunk for chunks in resume_chunks for chunk in chunks],
+                                    CHUNK_CHARS, batch_size, use_cache)
+    return chunk_embeddings, offsets
+
+def _embedding_scores(chunk_embeddings, offsets, jd_embeddings, pooling):
+    """Pooled cosine similarity x 50 of every resume's chunks to the JD skill chunks, clipped to 0-50"""
+    # Every chunk of every resume against every JD chunk in one product, pooled per resume
+    similarities = chunk_embeddings @ jd_embeddings.T
+    if pooling == "mean":
+        counts = np.diff(np.append(offsets, len(similarities)))
+        pooled = np.add.reduceat(similarities, offsets, axis=0) / counts[:, None]
+    else:
+        pooled = np.maximum.reduceat(similarities, offsets, axis=0)
+    scores = np.clip(pooled.mean(axis=1) * 50, 0, 50)
+    return scores.tolist()
+
+def _skill_coverage(model, chunk_embeddings, offsets, skills, batch_size, threshold, use_cache=True):
+    """Resumes x skills: whether the best-matching chunk of the resume reaches threshold"""
+    similarities = chunk_embeddings @ skill_embeddings(model, skills, batch_size, use_cache).T
+    return np.maximum.reduceat(similarities, offsets, axis=0) >= threshold
+
+def skill_embeddings(model, skills, batch_size=None, use_cache=True):
+    """
+    Normalized embeddings of skill names, one row per skill. Each skill is
+    encoded once per model and taxonomy version and kept for the process.
+    """
+    taxonomy = get_skill_taxonomy()
+    version = taxonomy.digest if taxonomy is not None and taxonomy.digest else "builtin"
+    with _skill_embeddings_lock:
+        vectors = _skill_embeddings.setdefault((_model_id(model), version), {})
+        names = [skill.lower() for skill in skills]
+        missing = [name for name in dict.fromkeys(names) if name not in vectors]
+
+    if missing:
+        encoded = encode_texts(model, missing, CHUNK_CHARS, batch_size, use_cache)
+        with _skill_embeddings_lock:
+            vectors.update(zip(missing, encoded))
+    return np.vstack([vectors[name] for name in names])
+
+def encode_texts(model, texts, char_limit, batch_size=None, use_cache=True):
+    """
+    Normalized float32 embeddings of the first char_limit characters of
+    each text. With the embedding cache enabled (and use_cache), texts
+    already seen with this model and limit are read from it and only the
+    rest are encoded.
+    """
+    cache = get_embedding_cache() if use_cache else None
+    policy = f"chars:{char_limit}:normalized"
+    keys = [embedding_key(text, _model_id(model), policy) for text in texts] if cache is not None else []
+    embeddings = cache.get_many(keys) if cache is not None else [None] * len(texts)
+
+    missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+    if missing:
+        encoded = np.asarray(model.encode([texts[i][:char_limit] for i in missing],
+                                          batch_size=batch_size or ENCODE_BATCH_SIZE,
+                                          normalize_embeddings=True, convert_to_numpy=True), dtype=np.float32)
+        if cache is not None:
+            cache.put_many([keys[i] for i in missing], encoded)
+        for i, embedding in zip(missing, encoded):
+            embeddings[i] = embedding
+    return np.vstack(embeddings)
 
 def calculate_basic_semantic_score(resume_text, jd_skills):
     """
@@ -0,0 +1,356 @@
+# Compiled whole-word skill matching shared by JD parsing, hard matching and feedback
+import itertools
+import os
+import re
+import threading
+from collections import OrderedDict
+
+# Compiled matchers kept per distinct skill vocabulary
+MATCHER_CACHE_SIZE = 64
+# Vocabularies of at most this many phrases (skills plus aliases) are matched with a
+# substring check per phrase, which beats the trie walk below a few hundred phrases
+SUBSTRING_SCAN_MAX_PHRASES = int(os.getenv("RESUME_SUBSTRING_SCAN_MAX_PHRASES", 300))
+
+_TOKEN = re.compile(r"\w+|\s+|[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+_WORD = re.compile(r"\w+")
+
+# Characters of text scanned per step by find_ordered_stream
+STREAM_CHUNK_SIZE = 16384
+# Longest unbroken (whitespace-free) run carried over to the next chunk
+STREAM_MAX_CARRY = 65536
+# Characters of context kept on each side of a match for find_ordered_stream's confirm callback
+STREAM_CONFIRM_CONTEXT = 256
+# Every ASCII non-word character becomes a space for the cheap word pre-check;
+# bytes.translate stays fast on non-ASCII text, str.translate does not
+_NON_WORD = bytes(c for c in range(128) if not (chr(c).isalnum() or chr(c) == "_"))
+_NON_WORD_TO_SPACE = bytes.maketrans(_NON_WORD, b" " * len(_NON_WORD))
+
+def _is_word(token):
+    return token[0].isalnum() or token[0] == "_"
+
+def _carry_start(text, tokens):
+    """Start of a whitespace run followed by at least `tokens` tokens, or 0"""
+    # n whitespace-separated pieces after a run are at least 2n tokens
+    pieces = (tokens + 1) // 2
+    parts = text.rsplit(None, pieces)
+    return len(parts[0]) if len(parts) > pieces else 0
+
+def phrase_tokens(phrase):
+    """Token sequence a skill or alias is stored under in the trie (whitespace runs become ' ')"""
+    return tuple(_TOKEN.findall(_WHITESPACE.sub(" ", phrase.strip().lower())))
+
+def phrase_pattern(tokens):
+    """
+    Regex source matching a phrase's tokens in lowercased text, across any
+    whitespace and not followed by a word character. A match preceded by a
+    word character is glued to it and does not count (see is_glued).
+    """
+    return "".join(r"\s+" if token == " " else re.escape(token) for token in tokens) + r"(?!\w)"
+
+def is_glued(text, start):
+    """Whether a match at `start` is glued to the word character before it ('net' in 'dotnet', '.net' in 'asp.net')"""
+    return bool(start) and _is_word(text[start - 1])
+
+def word_set(text):
+    """Word tokens of lowercased text as a set of UTF-8 bytes, built with C-level translate/split"""
+    words = set(text.encode().translate(_NON_WORD_TO_SPACE).split())
+    if not text.isascii():
+        # Words glued to non-ASCII symbols ('•python') are split like the tokenizer does
+        odd = [word for word in words if not word.isalnum()]
+        if odd:
+            words.update(word.encode() for word in _WORD.findall(b" ".join(odd).decode()))
+    return words
+
+class SkillMatcher:
+    """
+    Finds every skill of a vocabulary in a text in one pass.
+
+    The vocabulary is a token trie: from each word of the text the trie is
+    walked for as many tokens as match, so the cost per word depends on skill
+    length, not vocabulary size. Skills only match as whole words ('git' does
+    not match 'digital', 'ai' does not match 'maintain'), multi-word skills
+    match across any run of whitespace, and aliases report their canonical
+    skill ('k8s' -> 'kubernetes').
+
+    Trie nodes are dicts keyed by token; a skill ends where a node maps to a
+    string (a leaf) or where a dict node has a "" entry.
+
+    Small vocabularies (up to SUBSTRING_SCAN_MAX_PHRASES phrases) skip the
+    trie walk: the text's words are intersected with the phrases' words at C
+    level, and only phrases whose words are all present are confirmed with a
+    regex (one-word phrases need none for find_all). This beats the trie walk
+    until most of a few hundred phrases occur in the text; both ways report
+    the same matches.
+    """
+
+    def __init__(self, skills=(), aliases=None, trie=None):
+        self.trie = trie if trie is not None else {}
+        self._stream_index = None
+        self._substring_index = None
+        for skill in skills:
+            self.add(skill, skill)
+        for alias, skill in (aliases or {}).items():
+            self.add(alias, skill)
+
+    def add(self, phrase, skill):
+        """Make `phrase` match as `skill`; a phrase already in the trie keeps its first skill"""
+        tokens = phrase_tokens(phrase)
+        if not tokens:
+            return
+        self._stream_index = None
+        self._substring_index = None
+        node = self.trie
+        for token in tokens[:-1]:
+            child = node.get(token)
+            if child is None:
+                child = node[token] = {}
+            elif isinstance(child, str):
+                child = node[token] = {"": child}
+            node = child
+
+        child = node.get(tokens[-1])
+        if child is None:
+            node[tokens[-1]] = skill
+        elif isinstance(child, dict):
+            child.setdefault("", skill)
+
+    def lookup(self, phrase):
+        """Skill a whole phrase maps to, or None"""
+        node = self.trie
+        for token in phrase_tokens(phrase) or (None,):
+            if not isinstance(node, dict) or token not in node:
+                return None
+            node = node[token]
+        return node if isinstance(node, str) else node.get("")
+
+    def _scan(self, tokens):
+        """(skill, first token, last token + 1) for every match in a token list"""
+        count = len(tokens)
+        for i, node in enumerate(map(self.trie.get, tokens)):
+            # A skill starting with punctuation must not be glued to a word ('.net' in 'asp.net')
+            if node is None or (i and not _is_word(tokens[i]) and _is_word(tokens[i - 1])):
+                continue
+            j = i
+            while True:
+                skill = node if isinstance(node, str) else node.get("")
+                # ...nor end glued to one ('c++' in 'c++x')
+                if skill is not None and (j + 1 == count or _is_word(tokens[j]) or not _is_word(tokens[j + 1])):
+                    yield skill, i, j + 1
+                j += 1
+                if isinstance(node, str) or j == count:
+                    break
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+
+    def _tokens(self, text):
+        # Whitespace runs collapse to ' ', the form the trie is keyed by
+        return _TOKEN.findall(_WHITESPACE.sub(" ", text.lower())) if self.trie and text else []
+
+    def _substring_phrases(self):
+        """
+        The phrases without a word token ('c++' has one, '++' has none), or None
+        when the vocabulary is too large for the substring scan. Phrases with
+        words are found through the stream index (see _build_stream_index).
+        """
+        if self._substring_index is None:
+            phrases = list(itertools.islice(self.phrases(), SUBSTRING_SCAN_MAX_PHRASES + 1))
+            if len(phrases) > SUBSTRING_SCAN_MAX_PHRASES:
+                self._substring_index = False
+            else:
+                self._substring_index = [[skill, frozenset(), phrase_pattern(path), path]
+                                         for path, skill in phrases if not any(map(_is_word, path))]
+        return self._substring_index if self._substring_index is not False else None
+
+    def _substring_scan(self, text, first_only=False):
+        """
+        (skill, start, end) of the matches of each phrase whose words occur in
+        lowercased text (or, for punctuation-only phrases, whose characters do),
+        phrase by phrase. With first_only, a one-word phrase in the text's word
+        set is reported without offsets.
+        """
+        key_phrases = (self._stream_index or self._build_stream_index())[0]
+        words = word_set(text)
+        candidates = [phrase for key in words.intersection(key_phrases) for phrase in key_phrases[key]]
+        for phrase in itertools.chain(candidates, self._substring_phrases()):
+            skill, phrase_words, pattern, tokens = phrase
+            if not phrase_words <= words:
+                continue
+            if first_only and len(tokens) == 1 and phrase_words:
+                yield skill, None, None
+                continue
+            if not phrase_words and not all(piece in text for piece in "".join(tokens).split()):
+                continue
+            if isinstance(pattern, str):
+                pattern = phrase[2] = re.compile(pattern)
+            match = pattern.search(text)
+            while match is not None:
+                start = match.start()
+                if not is_glued(text, start):
+                    yield skill, start, match.end()
+                    if first_only:
+                        break
+                # Matches of one phrase may overlap ('a a' twice in 'a a a'), as in the trie walk
+                match = pattern.search(text, start + 1)
+
+    def occurrences(self, text):
+        """(skill, start, end) for every skill occurrence, in text order (shorter first at the same start)"""
+        if not text:
+            return []
+        if self._substring_phrases() is not None:
+            return sorted(self._substring_scan(text.lower()), key=lambda match: match[1:])
+        matches = list(self._scan(self._tokens(text)))
+        if not matches:
+            return []
+        # Character offsets come from the uncollapsed text, which has the same tokens
+        offsets = [0, *itertools.accumulate(map(len, _TOKEN.findall(text.lower())))]
+        return [(skill, offsets[first], offsets[last]) for skill, first, last in matches]
+
+    def find_ordered(self, text):
+        """Skills found in the text, in order of first occurrence"""
+        if text and self._substring_phrases() is not None:
+            return list(dict.fromkeys(skill for skill, _, _ in self.occurrences(text)))
+        return list(dict.fromkeys(skill for skill, _, _ in self._scan(self._tokens(text))))
+
+    def find_all(self, text):
+        """Set of skills found in the text"""
+        if text and self._substring_phrases() is not None:
+            return {skill for skill, _, _ in self._substring_scan(text.lower(), first_only=True)}
+        return {skill for skill, _, _ in self._scan(self._tokens(text))}
+
+    def phrases(self):
+        """(token sequence, skill) for every phrase in the trie"""
+        stack = [(self.trie, ())]
+        while stack:
+            node, tokens = stack.pop()
+            for token, child in node.items():
+                path = tokens + (token,) if token else tokens
+                if isinstance(child, dict):
+                    stack.append((child, path))
+                else:
+                    yield path, child
+
+    def _build_stream_index(self):
+        """
+        Every phrase in the trie as (skill, its word tokens, regex source, tokens), grouped
+        by 'key' (the phrase's first word token, UTF-8 encoded), the number of
+        distinct skills per key, each skill's keys and the longest phrase in tokens.
+        """
+        key_phrases = {}
+        max_depth = 1
+        for path, skill in self.phrases():
+            words = [word.encode() for word in path if _is_word(word)]
+            # Phrases made only of punctuation have no key and are not found by streaming
+            if words:
+                key_phrases.setdefault(words[0], []).append([skill, frozenset(words), phrase_pattern(path), path])
+                max_depth = max(max_depth, len(path))
+        skill_keys = {}
+        for key, phrases in key_phrases.items():
+            for skill, _, _, _ in phrases:
+                skill_keys.setdefault(skill, set()).add(key)
+        key_counts = {key: len({skill for skill, _, _, _ in phrases}) for key, phrases in key_phrases.items()}
+        self._stream_index = key_phrases, key_counts, skill_keys, max_depth
+        return self._stream_index
+
+    def find_ordered_stream(self, chunks, confirm=None):
+        """
+        find_ordered() over text that arrives in chunks (any iterable of str),
+        in one pass with memory bounded by the chunk size.
+
+        Every skill is reported once, so each chunk is only searched for skills
+        not reported yet, and only for phrases whose words all occur in it
+        (found with C-level translate/split/set operations); each such phrase
+        is a regex with a literal prefix, which re searches for very quickly.
+        Scanning stops once every skill is found. The last tokens of each chunk
+        are carried into the next, so phrases spanning chunk boundaries are
+        found exactly as in the whole text.
+
+        confirm(tokens, text, start, end), if given, can reject a match of the
+        phrase `tokens` at text[start:end] (text in its original case, unless
+        lowercasing changed its length, and with at least STREAM_CONFIRM_CONTEXT
+        characters on either side where the text has them); the next match is
+        tried instead.
+        """
+        key_phrases, key_counts, skill_keys, max_depth = self._stream_index or self._build_stream_index()
+        pending_keys = dict(key_counts)  # key -> skills under it not found yet
+        found = {}
+        carry = ""
+        floor = 0  # the carry's first `floor` characters are context, already searched
+        chunks = iter(chunks)
+
+        while pending_keys:
+            chunk = next(chunks, None)
+            final = chunk is None
+            text = carry + (chunk or "")
+            if not text:
+                break
+            buffer = text.lower()
+            if len(buffer) != len(text):
+                text = buffer
+            # Phrases starting in the last max_depth tokens may continue in the next chunk
+            cut = len(buffer) if final else max(_carry_start(buffer, max_depth + 1),
+                                                len(buffer) - STREAM_MAX_CARRY)
+            if confirm is not None and not final:
+                # Matches without their right-hand context wait for the next chunk
+                cut = max(floor, min(cut, len(buffer) - STREAM_CONFIRM_CONTEXT))
+
+            words = word_set(buffer)
+
+            candidates = {}
+            for key in words.intersection(pending_keys):
+                for phrase in key_phrases[key]:
+                    skill, phrase_words, pattern, tokens = phrase
+                    if skill in found or not phrase_words <= words:
+                        continue
+                    if isinstance(pattern, str):
+                        pattern = phrase[2] = re.compile(pattern)
+                    for match in pattern.finditer(buffer, floor):
+                        start = match.start()
+                        if start >= cut:
+                            break
+                        # Whole tokens only, and no punctuation glued to a word ('.net' in 'asp.net')
+                        if is_glued(buffer, start):
+                            continue
+                        if confirm is not None and not confirm(tokens, text, start, match.end()):
+                            continue
+                        span = (start, match.end())
+                        if skill not in candidates or span < candidates[skill]:
+                            candidates[skill] = span
+                        break
+
+            # In text order, shorter first at the same start, as find_ordered() reports them
+            for skill in sorted(candidates, key=candidates.get):
+                found[skill] = None
+                for key in skill_keys[skill]:
+                    pending_keys[key] -= 1
+                    if not pending_keys[key]:
+                        del pending_keys[key]
+
+            if final:
+                break
+            # ...and keep their left-hand context
+            keep = max(0, cut - STREAM_CONFIRM_CONTEXT) if confirm is not None else cut
+            carry, floor = text[keep:], cut - keep
+
+        return list(found)
+
+_matchers = OrderedDict()
+_matchers_lock = threading.Lock()
+
+def get_skill_matcher(skills):
+    """Compiled matcher for a skill vocabulary, built once and reused (LRU of MATCHER_CACHE_SIZE)"""
+    key = tuple(skills)
+    with _matchers_lock:
+        matcher = _matchers.get(key)
+        if matcher is not None:
+            _matchers.move_to_end(key)
+            return matcher
+
+    matcher = SkillMatcher(key)
+
+    with _matchers_lock:
+        _matchers[key] = matcher
+        while len(_matchers) > MATCHER_CACHE_SIZE:
+            _matchers.popitem(last=False)
+    return matcher
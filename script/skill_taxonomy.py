@@ -0,0 +1,192 @@
+# Versioned skill taxonomy with aliases, compiled once into a binary matcher artifact.
+# data/skills/taxonomy.json is a seed list of common skills, not full coverage; point
+# RESUME_SKILL_TAXONOMY at a larger file for that.
+import hashlib
+import json
+import marshal
+import os
+import re
+import sys
+import threading
+
+try:
+    from skill_matcher import SkillMatcher, phrase_tokens, word_set
+except ImportError:
+    from script.skill_matcher import SkillMatcher, phrase_tokens, word_set
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_TAXONOMY_PATH = os.path.join(PROJECT_DIR, "data", "skills", "taxonomy.json")
+DEFAULT_ARTIFACT_DIR = os.path.join(PROJECT_DIR, ".cache")
+
+# Bump when the artifact layout or tokenization changes
+ARTIFACT_FORMAT = 2
+
+# Characters either side of an ambiguous skill name searched for words that confirm it
+AMBIGUOUS_CONTEXT_CHARS = 80
+# What can precede a sentence or list item, where a capital letter says nothing
+_SENTENCE_STARTS = ("", "\n", ".", "!", "?", "•", "·", "-", "*")
+# Text between two items of a skill list ('spark, kafka', 'excel and tableau', 'rust/go')
+_LIST_SEPARATOR = re.compile(r"(?:[\s,;/&|()+]|\band\b|\bor\b)*")
+
+class SkillTaxonomy:
+    """
+    Canonical skill IDs with categories, plus a matcher that maps every
+    skill name and alias found in a text to its ID ('k8s' -> 'kubernetes').
+
+    Names that are also ordinary words ('excel', 'spark', 'swift') are
+    ambiguous: in a job description they only name the skill when confirm()
+    accepts them.
+    """
+
+    def __init__(self, version, categories, trie, digest=None, ambiguous=None):
+        self.version = version
+        self.categories = categories  # skill id -> category
+        self.matcher = SkillMatcher(trie=trie)
+        self.digest = digest
+        self.ambiguous = ambiguous or {}  # name tokens -> context words (UTF-8) that confirm it
+
+    def __len__(self):
+        return len(self.categories)
+
+    def canonical(self, skill):
+        """Canonical ID of a skill name or alias, or None when it is not in the taxonomy"""
+        return self.matcher.lookup(skill)
+
+    def extract(self, text, category=None):
+        """Skill IDs mentioned in a text, in order of first mention, optionally of one category"""
+        found = self.matcher.find_ordered(text)
+        if category is None:
+            return found
+        return [skill for skill in found if self.categories.get(skill) == category]
+
+    def confirm(self, tokens, text, start, end):
+        """
+        Whether the name `tokens` found at text[start:end] names the skill.
+        Unambiguous names always do. An ambiguous one must be capitalised
+        mid-sentence ('work with Spark'), have one of its context words within
+        AMBIGUOUS_CONTEXT_CHARS ('spark jobs on hadoop'), or sit in a list
+        next to an unambiguous technical skill ('excel and tableau').
+        'Excel under pressure' and 'spark ideas' do not qualify.
+        """
+        context = self.ambiguous.get(tokens)
+        if context is None:
+            return True
+        before = text[max(0, start - AMBIGUOUS_CONTEXT_CHARS):start]
+        if text[start].isupper() and before.rstrip(" \t")[-1:] not in _SENTENCE_STARTS:
+            return True
+        window = (before + text[start:end + AMBIGUOUS_CONTEXT_CHARS]).lower()
+        if context & word_set(window):
+            return True
+        first_char, last_char = len(before), len(before) + end - start
+        for skill, first, last in self.matcher.occurrences(window):
+            if self.categories.get(skill) == "soft" or phrase_tokens(window[first:last]) in self.ambiguous:
+                continue
+            if last <= first_char:
+                gap = window[last:first_char]
+            elif first >= last_char:
+                gap = window[last_char:first]
+            else:
+                gap = ""  # overlaps the name itself ('ruby on rails')
+            if _LIST_SEPARATOR.fullmatch(gap):
+                return True
+        return False
+
+    def to_bytes(self):
+        return marshal.dumps((ARTIFACT_FORMAT, self.version, self.digest, self.categories, self.matcher.trie,
+                              self.ambiguous))
+
+    @classmethod
+    def from_bytes(cls, data):
+        artifact_format, version, digest, categories, trie, ambiguous = marshal.loads(data)
+        if artifact_format != ARTIFACT_FORMAT:
+            raise ValueError(f"Unsupported skill artifact format {artifact_format}")
+        return cls(version, categories, trie, digest, ambiguous)
+
+def compile_taxonomy(source, digest=None):
+    """
+    Build a taxonomy from its JSON form:
+    {"version": "...", "skills": [{"id": "kubernetes", "category": "technical", "aliases": ["k8s"]}, ...]}
+
+    An entry may list which of its names are ordinary words under
+    "ambiguous", and words that confirm them nearby under "context":
+    {"id": "spark", "aliases": ["apache spark"], "ambiguous": ["spark"], "context": ["hadoop", "etl"]}
+    """
+    matcher = SkillMatcher()
+    categories = {}
+    for entry in source.get("skills", []):
+        skill = entry["id"].strip().lower()
+        categories.setdefault(skill, entry.get("category", "technical"))
+        matcher.add(skill, skill)
+    # Aliases after every ID, so an alias can never shadow another skill's own name
+    ambiguous = {}
+    for entry in source.get("skills", []):
+        for alias in entry.get("aliases", []):
+            matcher.add(alias, entry["id"].strip().lower())
+        context = frozenset(word.strip().lower().encode() for word in entry.get("context", []))
+        for name in entry.get("ambiguous", []):
+            ambiguous[phrase_tokens(name)] = context
+    return SkillTaxonomy(str(source.get("version", "")), categories, matcher.trie, digest, ambiguous)
+
+def artifact_path(digest, artifact_dir=None):
+    """Where the compiled artifact for a taxonomy file with this digest lives"""
+    directory = artifact_dir or os.getenv("RESUME_SKILL_ARTIFACT_DIR") or DEFAULT_ARTIFACT_DIR
+    return os.path.join(directory, f"skill_taxonomy-{ARTIFACT_FORMAT}-{digest[:16]}.bin")
+
+def load_taxonomy(path=None, artifact_dir=None):
+    """
+    Load a taxonomy, preferring its compiled artifact.
+
+    The artifact is keyed by the SHA-256 of the taxonomy file, so editing the
+    file (or bumping ARTIFACT_FORMAT) triggers exactly one rebuild; every other
+    process just loads the artifact.
+    """
+    path = path or os.getenv("RESUME_SKILL_TAXONOMY") or DEFAULT_TAXONOMY_PATH
+    with open(path, 'rb') as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).hexdigest()
+    compiled_path = artifact_path(digest, artifact_dir)
+
+    try:
+        with open(compiled_path, 'rb') as f:
+            return SkillTaxonomy.from_bytes(f.read())
+    except (OSError, ValueError, EOFError, TypeError):
+        pass
+
+    taxonomy = compile_taxonomy(json.loads(raw), digest)
+    try:
+        os.makedirs(os.path.dirname(compiled_path), exist_ok=True)
+        # Write then rename so concurrent processes never read a partial artifact
+        temp_path = f"{compiled_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(taxonomy.to_bytes())
+        os.replace(temp_path, compiled_path)
+    except OSError as e:
+        print(f"Warning: could not write skill taxonomy artifact: {e}")
+    return taxonomy
+
+_taxonomy = None
+_taxonomy_loaded = False
+_taxonomy_lock = threading.Lock()
+
+def get_skill_taxonomy():
+    """
+    Shared taxonomy for this process, loaded on first use from
+    RESUME_SKILL_TAXONOMY (default data/skills/taxonomy.json). None if it
+    cannot be loaded; callers then fall back to their built-in skill lists.
+    """
+    global _taxonomy, _taxonomy_loaded
+    with _taxonomy_lock:
+        if not _taxonomy_loaded:
+            try:
+                _taxonomy = load_taxonomy()
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Warning: skill taxonomy not available ({e}). Using built-in skill lists.")
+                _taxonomy = None
+            _taxonomy_loaded = True
+        return _taxonomy
+
+if __name__ == "__main__":
+    # Prebuild the artifact, e.g. during an image build: python script/skill_taxonomy.py [taxonomy.json]
+    taxonomy = load_taxonomy(sys.argv[1] if len(sys.argv) > 1 else None)
+    print(f"Skill taxonomy {taxonomy.version}: {len(taxonomy)} skills -> "
+          f"{artifact_path(taxonomy.digest)}")
@@ -0,0 +1,72 @@
+# Import-time report and budget check for the pipeline's startup cost
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Import budget for `import script.pipeline` in milliseconds (RESUME_IMPORT_BUDGET_MS overrides)
+DEFAULT_IMPORT_BUDGET_MS = 500
+
+# Packages that must only be imported by the code paths that use them
+HEAVY_MODULES = ("spacy", "thinc", "torch", "transformers", "sentence_transformers", "tensorflow")
+
+_IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)")
+
+def measure_imports(module="script.pipeline"):
+    """
+    Import `module` in a fresh interpreter with -X importtime.
+    Returns [(name, self_us, cumulative_us, depth)] in import order.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=PROJECT_DIR, capture_output=True, text=True, timeout=300)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed: {result.stderr.strip().splitlines()[-1:]}")
+    entries = []
+    for line in result.stderr.splitlines():
+        match = _IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return entries
+
+def import_report(module="script.pipeline", budget_ms=None):
+    """
+    Startup cost of importing `module`: total time, time per top-level
+    package (sum of each package's own import time), heavy packages that got
+    imported, and whether the total is within budget_ms.
+    """
+    if budget_ms is None:
+        budget_ms = float(os.getenv("RESUME_IMPORT_BUDGET_MS", DEFAULT_IMPORT_BUDGET_MS))
+    entries = measure_imports(module)
+
+    per_package = defaultdict(int)
+    for name, self_us, _, _ in entries:
+        per_package[name.split(".")[0]] += self_us
+    total_ms = next((cumulative for name, _, cumulative, _ in entries if name == module), 0) / 1000
+    heavy = sorted({name.split(".")[0] for name, _, _, _ in entries} & set(HEAVY_MODULES))
+
+    return {
+        "module": module,
+        "total_ms": total_ms,
+        "budget_ms": budget_ms,
+        "packages_ms": {name: us / 1000 for name, us in sorted(per_package.items(), key=lambda item: -item[1])},
+        "heavy_modules": heavy,
+        "within_budget": total_ms <= budget_ms and not heavy,
+    }
+
+def print_report(report, top=15):
+    print(f"import {report['module']}: {report['total_ms']:.0f} ms (budget {report['budget_ms']:.0f} ms)")
+    for name, ms in list(report["packages_ms"].items())[:top]:
+        print(f"  {name:<30} {ms:8.1f} ms")
+    if report["heavy_modules"]:
+        print(f"Heavy modules imported at startup: {', '.join(report['heavy_modules'])}")
+    print("OK" if report["within_budget"] else "OVER BUDGET")
+
+if __name__ == "__main__":
+    # python script/startup_profile.py [module] -- exits 1 when over budget
+    report = import_report(sys.argv[1] if len(sys.argv) > 1 else "script.pipeline")
+    print_report(report)
+    sys.exit(0 if report["within_budget"] else 1)
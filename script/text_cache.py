@@ -0,0 +1,246 @@
+# Persistent cache of extracted resume text, keyed by the SHA-256 of the upload bytes
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "extracted_text.db"
+)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024  # 256 MB of cached text
+
+# Hits and misses are kept in memory and written with the next put, or once this many are
+# pending (skipped, not waited for, while another process holds the write lock)
+ACCESS_FLUSH_ENTRIES = 256
+
+def content_digest(data):
+    """Stable SHA-256 hex digest of an upload's bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+class TextCache:
+    """
+    Size-bounded LRU cache of extracted text stored in a SQLite file.
+
+    Every operation opens its own connection, so the same file can be shared
+    by Streamlit sessions, threads and worker processes. Entries are keyed by
+    digest and extractor version, so text extracted by different backends or
+    stop policies is cached side by side; an unknown version is a miss.
+    Reads never take the write lock: access times and hit/miss counts are
+    written in batches (see ACCESS_FLUSH_ENTRIES), so the LRU order lags
+    reads slightly. The total size is kept in cache_stats, so a put does not
+    sum the table.
+    """
+
+    def __init__(self, db_path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._accessed = {}  # (digest, extractor_version) -> last hit time not yet written
+        self._counts = {}  # 'hits' / 'misses' not yet added to cache_stats
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self):
+        if not self._initialized:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        if not self._initialized:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''CREATE TABLE IF NOT EXISTS extracted_text (
+                digest TEXT,
+                extractor_version TEXT,
+                text TEXT,
+                size INTEGER,
+                last_access REAL,
+                PRIMARY KEY (digest, extractor_version)
+            )''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_extracted_text_access ON extracted_text (last_access)')
+            conn.execute('''CREATE TABLE IF NOT EXISTS cache_stats (
+                name TEXT PRIMARY KEY,
+                value INTEGER
+            )''')
+            conn.commit()
+            self._initialized = True
+        return conn
+
+    def _count(self, conn, name, amount=1):
+        conn.execute('''INSERT INTO cache_stats (name, value) VALUES (?, ?)
+                        ON CONFLICT(name) DO UPDATE SET value = value + excluded.value''',
+                     (name, amount))
+
+    def get(self, digest, extractor_version):
+        """Return the cached text for a digest, or None on a miss"""
+        row = None
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute('SELECT text FROM extracted_text WHERE digest = ? AND extractor_version = ?',
+                                   (digest, extractor_version)).fetchone()
+                name = 'hits' if row is not None else 'misses'
+                with self._lock:
+                    if row is not None:
+                        self._accessed[(digest, extractor_version)] = time.time()
+                    self._counts[name] = self._counts.get(name, 0) + 1
+                    flush = sum(self._counts.values()) >= ACCESS_FLUSH_ENTRIES
+                if flush:
+                    self._flush_access(conn, wait=False)
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"Text cache unavailable: {e}")
+
+        with self._lock:
+            if row is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return row[0] if row is not None else None
+
+    def _flush_access(self, conn, wait=True):
+        """
+        Write pending hit times and hit/miss counts. With wait=False, gives
+        up (and keeps them pending) if another connection holds the write lock.
+        """
+        with self._lock:
+            accessed, self._accessed = self._accessed, {}
+            counts, self._counts = self._counts, {}
+        if not accessed and not counts:
+            return
+        try:
+            if not wait:
+                conn.execute('PRAGMA busy_timeout = 0')
+                conn.execute('BEGIN IMMEDIATE')
+            conn.executemany('''UPDATE extracted_text SET last_access = ?
+                                WHERE digest = ? AND extractor_version = ? AND last_access < ?''',
+                             [(at, digest, version, at) for (digest, version), at in accessed.items()])
+            for name, amount in counts.items():
+                self._count(conn, name, amount)
+            if not wait:
+                conn.commit()
+        except sqlite3.OperationalError:
+            if wait:
+                raise
+            with self._lock:
+                for key, at in accessed.items():
+                    self._accessed.setdefault(key, at)
+                for name, amount in counts.items():
+                    self._counts[name] = self._counts.get(name, 0) + amount
+
+    def put(self, digest, extractor_version, text):
+        """Store extracted text and evict least recently used entries over the size limit"""
+        size = len(text.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        try:
+            conn = self._connect()
+            try:
+                conn.execute('BEGIN IMMEDIATE')
+                self._flush_access(conn)  # so recent hits are not the entries evicted below
+                total = self._total_bytes(conn)
+                replaced = conn.execute('SELECT size FROM extracted_text WHERE digest = ? AND extractor_version = ?',
+                                        (digest, extractor_version)).fetchone()
+                conn.execute('''INSERT OR REPLACE INTO extracted_text
+                                (digest, extractor_version, text, size, last_access)
+                                VALUES (?, ?, ?, ?, ?)''',
+                             (digest, extractor_version, text, size, time.time()))
+                total += size - (replaced[0] if replaced else 0)
+                evicted, total = self._evict(conn, total)
+                conn.execute("INSERT OR REPLACE INTO cache_stats (name, value) VALUES ('bytes', ?)", (total,))
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"Text cache unavailable: {e}")
+            return
+
+        with self._lock:
+            self.evictions += evicted
+
+    def _total_bytes(self, conn):
+        """Size of every cached text, summed once per file and then kept up to date by put"""
+        row = conn.execute("SELECT value FROM cache_stats WHERE name = 'bytes'").fetchone()
+        if row is not None:
+            return row[0]
+        return conn.execute('SELECT COALESCE(SUM(size), 0) FROM extracted_text').fetchone()[0]
+
+    def _evict(self, conn, total):
+        """Delete least recently used entries until total fits; returns (evicted, new total)"""
+        if total <= self.max_bytes:
+            return 0, total
+
+        evicted = 0
+        for rowid, size in conn.execute('SELECT rowid, size FROM extracted_text ORDER BY last_access').fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute('DELETE FROM extracted_text WHERE rowid = ?', (rowid,))
+            total -= size
+            evicted += 1
+        self._count(conn, 'evictions', evicted)
+        return evicted, total
+
+    def stats(self):
+        """Hit/miss counters for this process plus totals shared by every user of the file"""
+        shared = {}
+        try:
+            conn = self._connect()
+            try:
+                shared = dict(conn.execute('SELECT name, value FROM cache_stats').fetchall())
+                entries = conn.execute('SELECT COUNT(*) FROM extracted_text').fetchone()[0]
+                size = self._total_bytes(conn)
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            entries, size = 0, 0
+
+        with self._lock:
+            # This process's counts not yet written to the file
+            pending = dict(self._counts)
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "shared_hits": shared.get('hits', 0) + pending.get('hits', 0),
+                "shared_misses": shared.get('misses', 0) + pending.get('misses', 0),
+                "shared_evictions": shared.get('evictions', 0),
+                "entries": entries,
+                "bytes": size,
+            }
+
+    def clear(self):
+        """Remove every cached entry and reset the counters"""
+        conn = self._connect()
+        try:
+            conn.execute('DELETE FROM extracted_text')
+            conn.execute('DELETE FROM cache_stats')
+            conn.commit()
+        finally:
+            conn.close()
+        with self._lock:
+            self.hits = self.misses = self.evictions = 0
+            self._accessed, self._counts = {}, {}
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_text_cache():
+    """
+    Shared cache instance configured from the environment.
+
+    RESUME_TEXT_CACHE sets the SQLite path (set it to an empty string to
+    disable caching) and RESUME_TEXT_CACHE_MB the size limit.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            path = os.getenv("RESUME_TEXT_CACHE", DEFAULT_CACHE_PATH)
+            if not path:
+                return None
+            max_mb = os.getenv("RESUME_TEXT_CACHE_MB")
+            max_bytes = int(float(max_mb) * 1024 * 1024) if max_mb else DEFAULT_MAX_BYTES
+            _cache = TextCache(path, max_bytes)
+        return _cache
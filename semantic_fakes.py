@@ -0,0 +1,105 @@
+"""
+Stand-in sentence-transformer model and semantic_match patching helpers shared by the semantic tests
+"""
+
+import os
+import re
+import sys
+import tempfile
+import zlib
+
+import numpy as np
+
+# Add script directory to path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "script"))
+
+import semantic_match  # the module the pipeline scores through
+
+class FakeEncoder:
+    """
+    Stand-in for a SentenceTransformer: bag-of-words vectors with one
+    dimension per word, hashed or looked up in `concepts` (words mapped to
+    the same dimension mean the same thing; any other word shares one more).
+    `noise` perturbs every vector like int8 rounding would, `precision` marks
+    it as a quantized model. Every encode call is recorded.
+    """
+
+    def __init__(self, dimensions=64, concepts=None, noise=0.0, precision=None):
+        self.concepts = concepts
+        self.dimensions = max(concepts.values()) + 2 if concepts else dimensions
+        self.noise = noise
+        self.calls = []  # (sentences, batch_size) per encode call
+        if precision:
+            self.resume_precision = precision
+
+    @property
+    def texts(self):
+        """Every text encoded so far, in order"""
+        return [text for sentences, _ in self.calls for text in sentences]
+
+    @property
+    def encoded(self):
+        """Number of texts encoded so far"""
+        return sum(len(sentences) for sentences, _ in self.calls)
+
+    def _dimension(self, word):
+        if self.concepts:
+            return self.concepts.get(word, self.dimensions - 1)
+        return zlib.crc32(word.encode()) % self.dimensions
+
+    def encode(self, sentences, batch_size=32, normalize_embeddings=False, **kwargs):
+        self.calls.append((list(sentences), batch_size))
+        embeddings = np.zeros((len(sentences), self.dimensions), dtype=np.float32)
+        for row, sentence in enumerate(sentences):
+            for word in re.findall(r"\w+", sentence.lower()):
+                embeddings[row, self._dimension(word)] += 1
+            if self.noise:
+                embeddings[row] += self.noise * np.random.default_rng(row).standard_normal(self.dimensions)
+        if normalize_embeddings:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings /= np.where(norms == 0, 1, norms)
+        return embeddings
+
+def with_semantic_match(test, **attributes):
+    """Run test() with semantic_match attributes replaced and per-process skill embeddings cleared, then restore"""
+    saved = {name: getattr(semantic_match, name) for name in attributes}
+    skill_embeddings = dict(semantic_match._skill_embeddings)
+    for name, value in attributes.items():
+        setattr(semantic_match, name, value)
+    semantic_match._skill_embeddings.clear()
+    try:
+        return test()
+    finally:
+        for name, value in saved.items():
+            setattr(semantic_match, name, value)
+        semantic_match._skill_embeddings.clear()
+        semantic_match._skill_embeddings.update(skill_embeddings)
+
+def with_encoder(encoder, test, **attributes):
+    """Run test() with encoder installed as the loaded model"""
+    return with_semantic_match(test, model=encoder, SENTENCE_TRANSFORMERS_AVAILABLE=True, **attributes)
+
+def with_fresh_model(test, **attributes):
+    """Run test() with no model loaded yet, so get_model() loads one through the patched attributes"""
+    def fresh():
+        semantic_match._reset_model()
+        try:
+            return test()
+        finally:
+            semantic_match._reset_model()
+
+    attributes.setdefault("SENTENCE_TRANSFORMERS_AVAILABLE", True)
+    return with_semantic_match(fresh, **attributes)
+
+def with_loader(loader, test, **attributes):
+    """Run test() with a fresh, unloaded model that loader() provides"""
+    return with_fresh_model(test, _load_model=loader, **attributes)
+
+def with_embedding_cache(test):
+    """Run test() with the embedding cache enabled in a temporary directory"""
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["RESUME_EMBEDDING_CACHE_DIR"] = directory
+        try:
+            return test()
+        finally:
+            del os.environ["RESUME_EMBEDDING_CACHE_DIR"]
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Test script to verify batch processing on the sample resume corpus
+"""
+
+import sys
+import os
+import glob
+import io
+import time
+
+# Add script directory to path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "script"))
+
+try:
+    from script.pipeline import evaluate_resumes_batch
+    import script.extraction_sandbox as extraction_sandbox
+    from test_pdf_extraction import build_scanned_pdf, build_long_cv, with_text_cache
+    print("✅ All imports successful")
+except ImportError as e:
+    print(f"❌ Import failed: {e}")
+    sys.exit(1)
+
+RESUME_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "resumes")
+
+JD_TEXT = """
+Software Engineer
+Required: experience with python, java, sql, react and git.
+Knowledge of machine learning, docker and aws is a plus.
+Strong communication and teamwork skills.
+"""
+
+class MockUpload:
+    """Mimics a Streamlit UploadedFile backed by a file on disk"""
+    def __init__(self, path):
+        self.name = os.path.basename(path)
+        with open(path, 'rb') as f:
+            self._content = f.read()
+        self._position = 0
+
+    def read(self, size=-1):
+        if size == -1:
+            result = self._content[self._position:]
+        else:
+            result = self._content[self._position:self._position + size]
+        self._position += len(result)
+        return result
+
+    def seek(self, position, whence=0):
+        self._position = position if whence == 0 else len(self._content) + position
+        return self._position
+
+    def tell(self):
+        return self._position
+
+    def getvalue(self):
+        return self._content
+
+def load_corpus(limit=None):
+    """Load the sample resumes as mock uploads"""
+    paths = sorted(glob.glob(os.path.join(RESUME_DIR, "*.pdf")))
+    return [MockUpload(path) for path in paths[:limit]]
+
+def test_process_pool_matches_threads():
+    """Process-pool mode should return the same scores, in the same order, as thread mode"""
+    print("\n⚙️  Testing process-pool batch mode...")
+
+    # Each mode extracts into its own empty cache, so neither reads the other's text
+    uploads = load_corpus(limit=4)
+    thread_results = with_text_cache(lambda: evaluate_resumes_batch(uploads, JD_TEXT, max_workers=2))
+    process_results = with_text_cache(lambda: evaluate_resumes_batch(uploads, JD_TEXT, max_workers=4,
+                                                                     use_processes=True))
+
+    assert [r["Resume"] for r in process_results] == [u.name for u in uploads]
+    for thread_res, process_res in zip(thread_results, process_results):
+        print(f"   📊 {process_res['Resume']}: {process_res['Total Score']} ({process_res['Verdict']})")
+        assert process_res["Total Score"] == thread_res["Total Score"]
+        assert process_res["Missing Skills"] == thread_res["Missing Skills"]
+
+    print("   ✅ Process-pool results match thread results")
+
+def test_process_pool_handles_bad_files():
+    """A broken upload should come back as an error result, not break the batch"""
+    print("\n📭 Testing process-pool batch mode with a broken file...")
+
+    class BrokenUpload:
+        name = "broken.pdf"
+
+        def getvalue(self):
+            raise IOError("upload was discarded")
+
+    uploads = load_corpus(limit=2) + [BrokenUpload()]
+    results = with_text_cache(lambda: evaluate_resumes_batch(uploads, JD_TEXT, max_workers=2, use_processes=True))
+
+    assert len(results) == 3
+    assert results[-1]["Verdict"] == "Error"
+    assert all(r["Verdict"] != "Error" for r in results[:2])
+    print("   ✅ Broken upload reported without affecting the rest of the batch")
+
+def _poisoned_pages(resume_file, max_pages):
+    """PDF backend that hangs or balloons memory for documents carrying a marker"""
+    content = resume_file.read()
+    if b"%HANG" in content:
+        time.sleep(60)
+    if b"%HOG" in content:
+        hog = []
+        for _ in range(400):
+            hog.append(b"x" * (5 * 1024 * 1024))
+            time.sleep(0.005)
+    yield "python sql react git developer"
+
+def test_sandbox_contains_poisoned_files():
+    """Hanging and memory-hungry documents come back as errors within budget"""
+    print("\n☣️  Testing sandboxed extraction with poisoned files...")
+
+    # Register the backend in the module the sandbox workers extract with
+    parse_resume = sys.modules[extraction_sandbox.extract_text.__module__]
+    parse_resume.register_pdf_backend("poisoned", _poisoned_pages)
+
+    with open(os.path.join(RESUME_DIR, "resume - 1.pdf"), 'rb') as f:
+        pdf = f.read()
+    documents = [
+        ("good-1.pdf", pdf + b"\n%OK-1"),
+        ("hang.pdf", pdf + b"\n%HANG"),
+        ("good-2.pdf", pdf + b"\n%OK-2"),
+        ("hog.pdf", pdf + b"\n%HOG"),
+        ("good-3.pdf", pdf + b"\n%OK-3"),
+    ]
+
+    def extract():
+        with extraction_sandbox.ExtractionSandbox(workers=2, timeout=5, memory_limit_mb=100) as sandbox:
+            outcomes = sandbox.extract_many(documents, backend="poisoned")
+            respawns = sandbox.respawns
+            workers_alive = all(worker.process.is_alive() for worker in sandbox._workers)
+            after = sandbox.extract_many([("good-4.pdf", pdf + b"\n%OK-4")], backend="poisoned")
+        return outcomes, respawns, workers_alive, after
+
+    try:
+        outcomes, respawns, workers_alive, after = with_text_cache(extract)
+    finally:
+        parse_resume.PDF_BACKENDS.pop("poisoned", None)
+
+    for (name, _), (text, error, elapsed) in zip(documents, outcomes):
+        print(f"   📊 {name}: {error or 'ok'} ({elapsed:.2f}s)")
+
+    assert [error is None for _, error, _ in outcomes] == [True, False, True, False, True]
+    assert "timed out" in outcomes[1][1]
+    assert "memory" in outcomes[3][1]
+    # Both poisoned workers were killed and replaced, and the pool keeps working
+    assert respawns >= 2 and workers_alive
+    assert after[0][1] is None and "python" in after[0][0]
+    print(f"   ✅ Poisoned files isolated, {respawns} workers replaced")
+
+def test_sandbox_full_document():
+    """Sandbox workers extract every page in full-document mode"""
+    print("\n📚 Testing sandboxed full-document extraction...")
+
+    long_cv = build_long_cv()
+    parse_resume = sys.modules[extraction_sandbox.extract_text.__module__]
+    expected = parse_resume.extract_text(io.BytesIO(long_cv), use_cache=False, full_document=True)
+
+    def extract():
+        with extraction_sandbox.ExtractionSandbox(workers=1, timeout=120) as sandbox:
+            return sandbox.extract_many([("long.pdf", long_cv)], full_document=True)
+
+    (text, error, _), = with_text_cache(extract)
+
+    assert error is None and text == expected
+    assert len(text) > 3000
+    print(f"   📊 {len(text)} characters")
+    print("   ✅ Every page extracted in the sandbox")
+
+def test_isolated_batch_matches_threads():
+    """Sandboxed batch evaluation scores like the regular path"""
+    print("\n🛡️  Testing isolated batch mode...")
+
+    uploads = load_corpus(limit=3)
+    thread_results = with_text_cache(lambda: evaluate_resumes_batch(uploads, JD_TEXT, max_workers=2))
+    isolated_results = with_text_cache(lambda: evaluate_resumes_batch(uploads, JD_TEXT, max_workers=2,
+                                                                      isolate_extraction=True))
+
+    assert [r["Total Score"] for r in isolated_results] == [r["Total Score"] for r in thread_results]
+    print("   ✅ Isolated results match thread results")
+
+def test_scanned_resume_needs_ocr():
+    """Image-only PDFs get a distinct Needs OCR verdict in every batch mode"""
+    print("\n🖼️  Testing scanned resumes in a batch...")
+
+    class ScannedUpload(MockUpload):
+        def __init__(self):
+            self.name = "scanned.pdf"
+            self._content = build_scanned_pdf()
+            self._position = 0
+
+    for mode in ({}, {"use_processes": True}, {"isolate_extraction": True}):
+        uploads = load_corpus(limit=1) + [ScannedUpload()]
+        results = with_text_cache(lambda: evaluate_resumes_batch(uploads, JD_TEXT, max_workers=2, **mode))
+        print(f"   📊 {mode or 'threads'}: {[r['Verdict'] for r in results]}")
+        assert results[0]["Verdict"] not in ("Error", "Needs OCR")
+        assert results[1]["Verdict"] == "Needs OCR"
+
+    # The sandbox reports a scanned PDF as its own kind of error, not by message
+    def extract():
+        with extraction_sandbox.ExtractionSandbox(workers=1) as sandbox:
+            return sandbox.extract_many([("scanned.pdf", build_scanned_pdf())])
+
+    (text, error, _), = with_text_cache(extract)
+    assert text is None and isinstance(error, extraction_sandbox.ImageOnlyPDFError)
+
+    print("   ✅ Scanned resume flagged for OCR")
+
+def main():
+    """Run all batch processing tests"""
+    print("📦 Starting Batch Processing Tests")
+    print("=" * 50)
+
+    tests = [
+        test_process_pool_matches_threads,
+        test_process_pool_handles_bad_files,
+        test_sandbox_contains_poisoned_files,
+        test_sandbox_full_document,
+        test_isolated_batch_matches_threads,
+        test_scanned_resume_needs_ocr,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ Test {test.__name__} failed: {e}")
+
+    print("\n" + "=" * 50)
+    print(f"📈 Batch Processing Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the persistent embedding cache
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+import threading
+import multiprocessing
+
+import numpy as np
+
+# Add script directory to path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "script"))
+
+try:
+    import semantic_match  # the module the pipeline scores through
+    from semantic_fakes import FakeEncoder, with_encoder, with_embedding_cache
+    import script.embedding_cache as embedding_cache
+    from script.embedding_cache import EmbeddingCache, embedding_key
+    print("✅ All imports successful")
+except ImportError as e:
+    print(f"❌ Import failed: {e}")
+    sys.exit(1)
+
+def vector(seed, dimensions=8):
+    return np.random.default_rng(seed).standard_normal(dimensions).astype(np.float32)
+
+def _store_in_worker(directory):
+    EmbeddingCache(directory).put_many(["shared"], [vector(7)])
+
+def test_round_trip_and_keys():
+    """Vectors come back as float16-rounded float32, keyed by text, model and truncation"""
+    print("\n💾 Testing round trip...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = EmbeddingCache(directory)
+        key = embedding_key("Python developer", "model-a", "chars:500")
+        assert key != embedding_key("Python developer", "model-b", "chars:500")
+        assert key != embedding_key("Python developer", "model-a", "chars:300")
+
+        cache.put_many([key], [vector(1)])
+        stored, missing = cache.get_many([key, embedding_key("Other", "model-a", "chars:500")])
+        assert missing is None
+        assert stored.dtype == np.float32 and np.allclose(stored, vector(1), atol=1e-2)
+        assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+    print("   ✅ Round trip and keys work")
+
+def test_lru_eviction():
+    """A full cache recycles the least recently used slot"""
+    print("\n📏 Testing LRU eviction...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = EmbeddingCache(directory, max_entries=2)
+        cache.put_many(["a"], [vector(1)])
+        cache.put_many(["b"], [vector(2)])
+        assert cache.get_many(["a"])[0] is not None  # "b" is now least recently used
+        cache.put_many(["c"], [vector(3)])
+        a, b, c = cache.get_many(["a", "b", "c"])
+        assert b is None and np.allclose(a, vector(1), atol=1e-2) and np.allclose(c, vector(3), atol=1e-2)
+        stats = cache.stats()
+        assert stats["evictions"] == 1 and stats["entries"] == 2
+    print("   ✅ Least recently used entry evicted")
+
+def test_reads_do_not_wait_for_writers():
+    """Hits are served while another process holds the write lock; their access times are written later"""
+    print("\n🔓 Testing lock-free reads...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = EmbeddingCache(directory)
+        cache.put_many(["a"], [vector(1)])
+        writer = sqlite3.connect(os.path.join(directory, "index.db"))
+        writer.execute("BEGIN IMMEDIATE")
+        saved = embedding_cache.ACCESS_FLUSH_ENTRIES
+        embedding_cache.ACCESS_FLUSH_ENTRIES = 1  # try to flush on every hit
+        try:
+            reads = []
+            reader = threading.Thread(target=lambda: reads.append(cache.get_many(["a"])[0]))
+            reader.start()
+            reader.join(10)
+            assert reads and reads[0] is not None
+            assert list(cache._accessed) == ["a"]  # kept pending, not waited for
+        finally:
+            embedding_cache.ACCESS_FLUSH_ENTRIES = saved
+            writer.rollback()
+            writer.close()
+
+        cache.put_many(["b"], [vector(2)])
+        assert not cache._accessed
+    print("   ✅ Reads served without the write lock")
+
+def test_rewritten_slot_is_a_miss():
+    """A reader whose slot was rewritten underneath it gets a miss, not the wrong vector"""
+    print("\n🛡️  Testing torn-read detection...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = EmbeddingCache(directory)
+        cache.put_many(["a"], [vector(1)])
+        other = EmbeddingCache(directory)
+        other._array(8)[0] = vector(2)  # another writer reusing the slot
+        assert cache.get_many(["a"])[0] is None
+    print("   ✅ Checksum mismatch treated as a miss")
+
+def test_shared_between_processes():
+    """A vector written by one worker process is a hit in another"""
+    print("\n🗄️  Testing shared cache files...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        worker = multiprocessing.get_context("spawn").Process(target=_store_in_worker, args=(directory,))
+        worker.start()
+        worker.join(60)
+        assert worker.exitcode == 0
+        assert np.allclose(EmbeddingCache(directory).get_many(["shared"])[0], vector(7), atol=1e-2)
+    print("   ✅ Cache shared through the files")
+
+def test_repeat_texts_skip_the_model():
+    """Scoring the same resumes and JD again encodes nothing"""
+    print("\n🔁 Testing semantic_match integration...")
+
+    encoder = FakeEncoder()
+    resumes = ["python developer", "java developer with python", "designer"]
+
+    def score_twice():
+        first = semantic_match.calculate_semantic_scores_batch(resumes, ["python"], advanced=True)
+        assert encoder.encoded == 4
+        second = semantic_match.calculate_semantic_scores_batch(resumes + ["new resume"], ["python"], advanced=True)
+        assert encoder.encoded == 5  # only the new resume
+        return first, second
+
+    first, second = with_embedding_cache(lambda: with_encoder(encoder, score_twice))
+    assert np.allclose(first, second[:3], atol=0.05)
+    print("   ✅ Cached embeddings reused")
+
+def main():
+    """Run all embedding cache tests"""
+    print("🧊 Starting Embedding Cache Tests")
+    print("=" * 50)
+
+    tests = [
+        test_round_trip_and_keys,
+        test_lru_eviction,
+        test_reads_do_not_wait_for_writers,
+        test_rewritten_slot_is_a_miss,
+        test_shared_between_processes,
+        test_repeat_texts_skip_the_model,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ Test {test.__name__} failed: {e}")
+
+    print("\n" + "=" * 50)
+    print(f"📈 Embedding Cache Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the per-resume fuzzy matching index
+"""
+
+import sys
+import os
+
+# Add script directory to path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "script"))
+
+try:
+    from fuzzywuzzy import fuzz
+    from script.fuzzy_index import FuzzyIndex
+    from script.hard_match import calculate_hard_score
+    print("✅ All imports successful")
+except ImportError as e:
+    print(f"❌ Import failed: {e}")
+    sys.exit(1)
+
+RESUME_TEXT = """
+jane doe - backend engineer
+built kubernets clusters and terraform modules, ran postgre sql and mongo db in production.
+wrote micro-services in python and javascript; set up ci pipelines and tensor flow models.
+""" * 20
+
+def test_scores_match_partial_ratio():
+    """Index scores are identical to fuzz.partial_ratio, for near misses and unrelated skills"""
+    print("\n🔍 Testing partial_ratio parity...")
+
+    index = FuzzyIndex(RESUME_TEXT)
+    skills = ["kubernetes", "terraform", "postgresql", "mongodb", "microservices", "tensorflow",
+              "machine learning", "react native", "salesforce", "jane doe - backend engineer"]
+    for skill in skills:
+        assert index.partial_ratio(skill) == fuzz.partial_ratio(skill, RESUME_TEXT), skill
+    assert FuzzyIndex("go").partial_ratio("golang") == fuzz.partial_ratio("golang", "go")
+    assert FuzzyIndex("").partial_ratio("golang") == 0
+    print(f"   📊 {len(skills)} skills, {index.windows_compared} windows compared")
+    print("   ✅ Identical scores")
+
+def test_hard_score_unchanged():
+    """calculate_hard_score gives the same result as with a partial_ratio call per skill"""
+    print("\n🎯 Testing hard score...")
+
+    must_have = ["kubernetes", "terraform", "postgresql", "microservices", "salesforce", "python"]
+    score, missing = calculate_hard_score(RESUME_TEXT, must_have)
+    exact = {"terraform", "python"}
+    fuzzy = {skill for skill in must_have if skill not in exact
+             and fuzz.partial_ratio(skill, RESUME_TEXT.lower()) > 70}
+    print(f"   📊 Score {score}, missing {missing}")
+    assert score == min(10 * len(exact) + 8 * len(fuzzy), 50)
+    assert missing == [skill for skill in must_have if skill not in exact | fuzzy]
+    print("   ✅ Hard score unchanged")
+
+def main():
+    """Run all fuzzy index tests"""
+    print("🔍 Starting Fuzzy Index Tests")
+    print("=" * 50)
+
+    tests = [
+        test_scores_match_partial_ratio,
+        test_hard_score_unchanged,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ Test {test.__name__} failed: {e}")
+
+    print("\n" + "=" * 50)
+    print(f"📈 Fuzzy Index Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the N x M batch hard-match scoring
+"""
+
+import sys
+import os
+import threading
+
+# Add script directory to path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "script"))
+
+try:
+    import script.hard_match as hard_match
+    import script.pipeline as pipeline
+    from script.hard_match import (calculate_hard_score, calculate_hard_scores_batch,
+                                   MATCH_MISSING, MATCH_EXACT, MATCH_FUZZY)
+    from script.pipeline import evaluate_resumes_batch
+    from test_pdf_extraction import with_text_cache
+    print("✅ All imports successful")
+except ImportError as e:
+    print(f"❌ Import failed: {e}")
+    sys.exit(1)
+
+SKILLS = ["Python", "SQL", "Kubernetes", "Machine Learning", "AI", "Docker"]
+
+RESUMES = [
+    "Senior engineer: Python, SQL and k8s clusters, machine learning pipelines.",
+    "Frontend developer with React and CSS. Some exposure to kubernets and dockr.",
+    "",
+    "Data scientist. python, pandas, ai research, Docker.",
+]
+
+class MockFile:
+    def __init__(self, content, name):
+        self.content = content.encode()
+        self.name = name
+
+    def read(self):
+        return self.content
+
+    def getvalue(self):
+        return self.content
+
+def test_matrix_states():
+    """Each cell records whether the skill was exact, fuzzy or missing"""
+    print("\n🧮 Testing match matrix...")
+
+    matrix, scores, missing = calculate_hard_scores_batch(RESUMES, SKILLS)
+    assert matrix.shape == (len(RESUMES), len(SKILLS))
+    assert list(matrix[0]) == [MATCH_EXACT, MATCH_EXACT, MATCH_EXACT, MATCH_EXACT, MATCH_MISSING, MATCH_MISSING]
+    assert matrix[1, 2] == MATCH_FUZZY  # 'kubernets'
+    assert not matrix[2].any()  # empty resume
+    assert missing[2] == SKILLS and scores[2] == 0
+    print(f"   📊 Scores: {scores.tolist()}")
+    print("   ✅ Matrix states are correct")
+
+def test_matches_single_resume_scoring():
+    """Every row equals calculate_hard_score for that resume, with and without fuzzywuzzy"""
+    print("\n🔁 Testing parity with calculate_hard_score...")
+
+    fuzzy_available = hard_match.FUZZYWUZZY_AVAILABLE
+    try:
+        for available in (fuzzy_available, False):
+            hard_match.FUZZYWUZZY_AVAILABLE = available
+            _, scores, missing = calculate_hard_scores_batch(RESUMES, SKILLS)
+            for text, score, row_missing in zip(RESUMES, scores, missing):
+                assert (int(score), row_missing) == calculate_hard_score(text, SKILLS)
+    finally:
+        hard_match.FUZZYWUZZY_AVAILABLE = fuzzy_available
+    print("   ✅ Batch rows match single-resume scores")
+
+def test_exact_phrases():
+    """Punctuated, multi-word and aliased skills match exactly as the single-resume matcher finds them"""
+    print("\n🔤 Testing exact phrase matching...")
+
+    skills = ["C++", ".NET", "Node.js", "CI/CD", "Machine Learning", "k8s", "C#", "Go"]
+    resumes = [
+        "Wrote C++ and C# services; ASP.NET front end.",
+        "c++x builds, dotnet, node.js and ci / cd",
+        "Machine\n   learning with kubernetes on CI/CD, written in go.",
+        "Golang, c, nodejs, .NET Core",
+    ]
+    matrix, scores, missing = calculate_hard_scores_batch(resumes, skills)
+    for text, row, score, row_missing in zip(resumes, matrix, scores, missing):
+        assert (int(score), row_missing) == calculate_hard_score(text, skills)
+    assert matrix[0, 1] != MATCH_EXACT  # ".net" glued to "asp"
+    assert matrix[2, 4] == MATCH_EXACT and matrix[2, 5] == MATCH_EXACT  # across a line break; alias of kubernetes
+    assert matrix[3, 1] == MATCH_EXACT
+    print("   ✅ Phrase boundaries and aliases honoured")
+
+def test_pipeline_isolates_failures():
+    """A resume that breaks batch scoring only fails itself, and feedback runs on worker threads"""
+    print("\n🧯 Testing per-resume isolation...")
+
+    batch_scorer, feedback = pipeline.calculate_hard_scores_batch, pipeline.generate_feedback
+    threads = set()
+
+    def failing_scorer(texts, skills):
+        if any("poison" in text.lower() for text in texts):
+            raise ValueError("unscorable resume")
+        return batch_scorer(texts, skills)
+
+    def recording_feedback(resume_text, jd_text):
+        threads.add(threading.current_thread().name)
+        return "feedback"
+
+    def evaluate(texts):
+        files = [MockFile(text, f"resume_{i}.txt") for i, text in enumerate(texts)]
+        return with_text_cache(lambda: evaluate_resumes_batch(files, "Required: Python, SQL and Docker.",
+                                                              skip_feedback=False))
+
+    pipeline.calculate_hard_scores_batch, pipeline.generate_feedback = failing_scorer, recording_feedback
+    try:
+        evaluate([RESUMES[0], RESUMES[1], RESUMES[3]])
+        feedback_threads = set(threads)
+        results = evaluate([RESUMES[0], "POISON " + RESUMES[0], RESUMES[3]])
+    finally:
+        pipeline.calculate_hard_scores_batch, pipeline.generate_feedback = batch_scorer, feedback
+    assert feedback_threads and threading.current_thread().name not in feedback_threads
+    assert [result["Verdict"] for result in results].count("Error") == 1
+    assert results[1]["Verdict"] == "Error" and "unscorable resume" in results[1]["Feedback"]
+    assert results[0]["Feedback"] == results[2]["Feedback"] == "feedback"
+    print("   ✅ One Error row, feedback generated off the caller thread")
+
+def test_pipeline_batch_scoring():
+    """evaluate_resumes_batch scores the batch with the same hard scores"""
+    print("\n📦 Testing pipeline integration...")
+
+    jd_text = "Required: Python, SQL, Kubernetes, Docker and machine learning experience."
+    files = [MockFile(text, f"resume_{i}.txt") for i, text in enumerate(RESUMES)]
+    results = with_text_cache(lambda: evaluate_resumes_batch(files, jd_text, skip_feedback=True))
+    assert [result["Resume"] for result in results] == [f.name for f in files]
+    assert results[2]["Verdict"] == "Error"
+    assert "kubernetes" not in results[0]["Missing Skills"]
+    print("   ✅ Batch evaluation uses the batch scorer")
+
+def main():
+    """Run all batch hard-match tests"""
+    print("🧮 Starting Batch Hard Match Tests")
+    print("=" * 50)
+
+    tests = [
+        test_matrix_states,
+        test_matches_single_resume_scoring,
+        test_exact_phrases,
+        test_pipeline_batch_scoring,
+        test_pipeline_isolates_failures,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ Test {test.__name__} failed: {e}")
+
+    print("\n" + "=" * 50)
+    print(f"📈 Batch Hard Match Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
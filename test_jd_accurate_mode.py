@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Test script to verify batched spaCy accurate mode for job description parsing
+"""
+
+import sys
+import os
+import time
+import multiprocessing
+
+# Add script directory to path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "script"))
+
+try:
+    import spacy
+    from spacy.tokens import Doc
+    import script.parse_jd as parse_jd
+    from script.parse_jd import extract_skills, extract_skills_batch
+    print("✅ All imports successful")
+except ImportError as e:
+    print(f"❌ Import failed: {e}")
+    sys.exit(1)
+
+JD_TEXT = "Requires experience with distributed systems and Kafka . Event sourcing is a plus ."
+
+def parsed_jd(vocab):
+    """JD_TEXT with the tags and dependency parse en_core_web_sm would give it"""
+    return Doc(vocab, words=JD_TEXT.split(),
+               pos=["VERB", "NOUN", "ADP", "ADJ", "NOUN", "CCONJ", "PROPN", "PUNCT",
+                    "NOUN", "NOUN", "AUX", "DET", "NOUN", "PUNCT"],
+               deps=["ROOT", "dobj", "prep", "amod", "pobj", "cc", "conj", "punct",
+                     "compound", "nsubj", "ROOT", "det", "attr", "punct"],
+               heads=[0, 0, 1, 4, 2, 4, 4, 0, 9, 10, 10, 12, 10, 10])
+
+class ParsedPipeline:
+    """
+    Stands in for a trained English pipeline (no model download needed) and
+    records pipe() calls. JDs containing HANG never finish parsing, JDs
+    containing E088 are rejected. With batched=True every JD of a call is
+    parsed before the first one is returned, as spaCy does.
+    """
+    pipe_names = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "ner"]
+
+    def __init__(self, delay=0, batched=False):
+        self.vocab = spacy.blank("en").vocab
+        self.delay = delay
+        self.batched = batched
+        self._calls = multiprocessing.get_context().SimpleQueue()  # pipe() runs in the worker process
+
+    def has_pipe(self, name):
+        return name in self.pipe_names
+
+    def pipe(self, texts, batch_size=1000, disable=()):
+        self._calls.put({"texts": len(texts), "batch_size": batch_size, "disable": list(disable)})
+        if self.batched:
+            time.sleep(self.delay * len(texts))
+        for text in texts:
+            if "E088" in text:
+                raise ValueError("[E088] Text of length 1000001 exceeds maximum of 1000000.")
+            time.sleep(60 if "HANG" in text else 0 if self.batched else self.delay)
+            yield parsed_jd(self.vocab)
+
+    @property
+    def calls(self):
+        calls = []
+        while not self._calls.empty():
+            calls.append(self._calls.get())
+        return calls
+
+class CountingWorker(parse_jd._SpacyWorker):
+    """_SpacyWorker that counts the worker processes started"""
+    started = 0
+
+    def __init__(self, *args):
+        CountingWorker.started += 1
+        super().__init__(*args)
+
+def with_pipeline(nlp, function):
+    original = parse_jd.get_nlp
+    parse_jd.get_nlp = lambda: nlp
+    try:
+        return function()
+    finally:
+        parse_jd.get_nlp = original
+
+def test_noun_chunk_requirements():
+    """Accurate mode adds requirement phrases the keyword vocabulary misses"""
+    print("\n🎯 Testing noun-chunk requirement phrases...")
+
+    nlp = ParsedPipeline()
+    results = with_pipeline(nlp, lambda: extract_skills_batch([JD_TEXT] * 3, accurate=True))
+    print(f"   📊 Accurate: {results[0]}  keyword: {extract_skills(JD_TEXT)}")
+    assert results == [(["kafka", "distributed systems"], ["event sourcing"])] * 3
+    assert nlp.calls == [{"texts": 3, "batch_size": parse_jd.ACCURATE_BATCH_SIZE,
+                          "disable": ["ner", "lemmatizer"]}]
+    print("   ✅ One batched nlp.pipe call with unneeded pipes disabled")
+
+def test_budget_falls_back_to_keywords():
+    """JDs that take longer than the time budget keep their keyword results"""
+    print("\n⏱️  Testing per-JD time budget...")
+
+    # Each JD takes far longer than its budget, so no result can arrive before the deadline check
+    nlp = ParsedPipeline(delay=5)
+    results = with_pipeline(nlp, lambda: extract_skills_batch([JD_TEXT] * 4, accurate=True, time_budget=0.1))
+    assert results == [extract_skills(JD_TEXT)] * 4
+    print("   ✅ Over-budget JDs fell back to keyword extraction")
+
+def test_hanging_jd_killed():
+    """A JD that never finishes parsing is cut off at its budget; the rest of the batch is still parsed"""
+    print("\n🪓 Testing a hanging JD...")
+
+    nlp = ParsedPipeline()
+    jd_texts = [JD_TEXT, JD_TEXT + " HANG", JD_TEXT]
+    results = with_pipeline(nlp, lambda: extract_skills_batch(jd_texts, accurate=True, time_budget=0.5))
+    accurate = (["kafka", "distributed systems"], ["event sourcing"])
+    assert results == [accurate, extract_skills(jd_texts[1]), accurate]
+    # The batch overran after answering the first JD, then the other two were retried on their own
+    assert [call["texts"] for call in nlp.calls] == [3, 1, 1]
+    print("   ✅ Hanging JD fell back to keywords, the others were parsed")
+
+    # Once nothing is left to parse, the killed worker is not replaced
+    CountingWorker.started = 0
+    original_worker = parse_jd._SpacyWorker
+    parse_jd._SpacyWorker = CountingWorker
+    try:
+        results = with_pipeline(ParsedPipeline(), lambda: extract_skills_batch(jd_texts[:2], accurate=True,
+                                                                               time_budget=0.5))
+    finally:
+        parse_jd._SpacyWorker = original_worker
+    assert results == [accurate, extract_skills(jd_texts[1])]
+    assert CountingWorker.started == 1
+    print("   ✅ No replacement worker started after the last batch")
+
+def test_budget_is_per_jd():
+    """A batch gets one JD's budget; when spaCy answers it all at once too late, its JDs are retried alone"""
+    print("\n⏲️  Testing budget per JD...")
+
+    nlp = ParsedPipeline(delay=0.4, batched=True)
+    results = with_pipeline(nlp, lambda: extract_skills_batch([JD_TEXT] * 3, accurate=True, time_budget=1.0))
+    assert results == [(["kafka", "distributed systems"], ["event sourcing"])] * 3
+    assert [call["texts"] for call in nlp.calls] == [3, 1, 1, 1]
+    print("   ✅ Batch overran one JD's budget, each JD then parsed within its own")
+
+def test_rejected_jd_keeps_accurate_mode():
+    """A JD spaCy rejects (E088) keeps its keyword result; the other JDs are still parsed"""
+    print("\n📏 Testing a rejected JD...")
+
+    jd_texts = [JD_TEXT, JD_TEXT + " E088", JD_TEXT]
+    results = with_pipeline(ParsedPipeline(), lambda: extract_skills_batch(jd_texts, accurate=True))
+    accurate = (["kafka", "distributed systems"], ["event sourcing"])
+    assert results == [accurate, extract_skills(jd_texts[1]), accurate]
+    print("   ✅ Only the rejected JD fell back to keywords")
+
+def test_missing_model_and_default_mode():
+    """Without a spaCy model, or with accurate mode off, results equal the keyword path"""
+    print("\n🔁 Testing fallbacks...")
+
+    keyword = [extract_skills(JD_TEXT)]
+    assert with_pipeline(None, lambda: extract_skills_batch([JD_TEXT], accurate=True)) == keyword
+    assert extract_skills_batch([JD_TEXT], accurate=False) == keyword
+    assert with_pipeline(spacy.blank("en"), lambda: extract_skills_batch([JD_TEXT], accurate=True)) == keyword
+    print("   ✅ Keyword results used when accurate mode cannot run")
+
+def main():
+    """Run all accurate mode tests"""
+    print("🎯 Starting JD Accurate Mode Tests")
+    print("=" * 50)
+
+    tests = [
+        test_noun_chunk_requirements,
+        test_budget_falls_back_to_keywords,
+        test_hanging_jd_killed,
+        test_budget_is_per_jd,
+        test_rejected_jd_keeps_accurate_mode,
+        test_missing_model_and_default_mode,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ Test {test.__name__} failed: {e}")
+
+    print("\n" + "=" * 50)
+    print(f"📈 JD Accurate Mode Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
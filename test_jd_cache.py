@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the bounded job description skills cache
+"""
+
+import sys
+import os
+import tempfile
+import time
+import multiprocessing
+
+# Add script directory to path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "script"))
+
+try:
+    from script.jd_cache import JDSkillsCache, jd_digest
+    from script.pipeline import extract_skills_cached, get_jd_cache_stats
+    print("✅ All imports successful")
+except ImportError as e:
+    print(f"❌ Import failed: {e}")
+    sys.exit(1)
+
+SKILLS = (["python", "sql"], ["teamwork"])
+
+def _store_in_worker(db_path):
+    JDSkillsCache(db_path=db_path).put("Shared JD", "v1", SKILLS)
+
+def test_lru_and_ttl_bounds():
+    """The memory tier evicts least recently used entries and expires old ones"""
+    print("\n📏 Testing size and TTL bounds...")
+
+    cache = JDSkillsCache(max_entries=2, ttl=0.2)
+    cache.put("JD one", "v1", SKILLS)
+    cache.put("JD two", "v1", SKILLS)
+    assert cache.get("JD one", "v1") == (["python", "sql"], ["teamwork"])
+    cache.put("JD three", "v1", SKILLS)  # evicts "JD two", the least recently used
+    assert cache.get("JD two", "v1") is None
+    assert cache.get("JD one", "v1") is not None
+    assert cache.get("JD one", "v2") is None  # other extractor version
+
+    time.sleep(0.3)
+    assert cache.get("JD three", "v1") is None
+
+    stats = cache.stats()
+    print(f"   📊 Stats: {stats}")
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["expirations"]) == (2, 3, 1, 1)
+    assert stats["entries"] == 1
+    print("   ✅ LRU eviction, TTL expiry and metrics work")
+
+def test_stable_digest():
+    """Keys are content digests, identical across processes"""
+    print("\n🔑 Testing stable digest...")
+
+    assert jd_digest("Python developer") == jd_digest("Python developer")
+    assert jd_digest("Python developer") != jd_digest("Python developer ")
+    assert len(jd_digest("Python developer")) == 64
+    print("   ✅ Digest is stable")
+
+def test_persistent_tier_shared_between_processes():
+    """An entry written by one worker process is a hit in another"""
+    print("\n🗄️  Testing shared SQLite tier...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, "jd_cache.db")
+        worker = multiprocessing.get_context("spawn").Process(target=_store_in_worker, args=(db_path,))
+        worker.start()
+        worker.join(60)
+        assert worker.exitcode == 0
+
+        cache = JDSkillsCache(db_path=db_path, db_max_entries=2)
+        assert cache.get("Shared JD", "v1") == (["python", "sql"], ["teamwork"])
+        assert cache.get("Shared JD", "v2") is None
+        assert cache.stats()["shared_hits"] == 1
+
+        cache.put("JD two", "v1", SKILLS)
+        cache.put("JD three", "v1", SKILLS)
+        fresh = JDSkillsCache(db_path=db_path)
+        assert fresh.get("Shared JD", "v1") is None  # oldest row trimmed at db_max_entries
+        assert fresh.get("JD three", "v1") is not None
+    print("   ✅ SQLite tier shared and bounded")
+
+def test_pipeline_uses_cache():
+    """extract_skills_cached hits the cache on a repeated JD"""
+    print("\n🔁 Testing pipeline integration...")
+
+    jd_text = "Looking for a Python developer with Docker and SQL experience"
+    before = get_jd_cache_stats()
+    first = extract_skills_cached(jd_text)
+    second = extract_skills_cached(jd_text)
+    after = get_jd_cache_stats()
+    assert first == second and "python" in first[0]
+    assert after["hits"] - before["hits"] >= 1
+    print("   ✅ Repeated JD served from cache")
+
+def main():
+    """Run all JD cache tests"""
+    print("🗃️  Starting JD Cache Tests")
+    print("=" * 50)
+
+    tests = [
+        test_lru_and_ttl_bounds,
+        test_stable_digest,
+        test_persistent_tier_shared_between_processes,
+        test_pipeline_uses_cache,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ Test {test.__name__} failed: {e}")
+
+    print("\n" + "=" * 50)
+    print(f"📈 JD Cache Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the semantic model singleton, warm-up and readiness reporting
+"""
+
+import sys
+import os
+import threading
+import time
+
+# Add script directory to path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "script"))
+
+try:
+    import semantic_match  # the module the pipeline scores through
+    from semantic_match import get_model, warm_up, model_status
+    from semantic_fakes import FakeEncoder, with_loader
+    import script.pipeline as pipeline
+    print("✅ All imports successful")
+except ImportError as e:
+    print(f"❌ Import failed: {e}")
+    sys.exit(1)
+
+def test_concurrent_callers_load_once():
+    """Threads asking for the model during its load share one load"""
+    print("\n🔒 Testing one-time load...")
+
+    loads = []
+
+    def loader():
+        loads.append(threading.current_thread().name)
+        time.sleep(0.2)
+        return FakeEncoder()
+
+    def load_from_threads():
+        models = []
+        threads = [threading.Thread(target=lambda: models.append(get_model())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        loading = model_status()["state"]
+        for thread in threads:
+            thread.join()
+        return models, loading, model_status()
+
+    models, loading, status = with_loader(loader, load_from_threads)
+    assert len(loads) == 1
+    assert len(models) == 8 and all(m is models[0] for m in models)
+    assert loading == semantic_match.MODEL_LOADING
+    assert status["state"] == semantic_match.MODEL_LOADED and not status["ready"]
+    print(f"   📊 {len(models)} callers, {len(loads)} load, {status['load_seconds']}s")
+    print("   ✅ Model loaded once")
+
+def test_warm_up_reports_ready():
+    """warm_up runs one dummy encode and marks the model ready, in the foreground or background"""
+    print("\n🔥 Testing warm-up...")
+
+    model = FakeEncoder()
+
+    def warm_twice():
+        before = model_status()["state"]
+        thread = warm_up(background=True)
+        thread.join(10)
+        assert warm_up() is True
+        return before, model_status()
+
+    before, status = with_loader(lambda: model, warm_twice)
+    assert before == semantic_match.MODEL_UNLOADED
+    assert status["state"] == semantic_match.MODEL_READY and status["ready"] and status["warm"]
+    assert len(model.calls) == 1
+    print("   ✅ Warm-up ran once and the model reports ready")
+
+def test_failed_load_reported():
+    """A load error is reported and scoring falls back to word overlap"""
+    print("\n🚧 Testing failed load...")
+
+    def loader():
+        raise OSError("model files missing")
+
+    def load_and_score():
+        assert warm_up() is False
+        status = model_status()
+        score = semantic_match.calculate_semantic_score_advanced("python developer", ["python"])
+        return status, score
+
+    status, score = with_loader(loader, load_and_score)
+    assert status["state"] == semantic_match.MODEL_FAILED and "model files missing" in status["error"]
+    assert score == semantic_match.calculate_basic_semantic_score("python developer", ["python"])
+    print("   ✅ Failure reported, basic scoring used")
+
+def test_unusable_lock_file():
+    """A lock file that cannot be opened only costs the cross-process lock, not the model"""
+    print("\n🔐 Testing unusable lock file...")
+
+    model = FakeEncoder()
+    lock_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "missing-directory", "model.lock")
+    loaded, status, available = with_loader(lambda: model, lambda: (
+        get_model(), model_status(), semantic_match.SENTENCE_TRANSFORMERS_AVAILABLE), MODEL_LOCK_FILE=lock_file)
+    assert loaded is model and status["state"] == semantic_match.MODEL_LOADED
+    assert available  # semantic scoring stays enabled
+    print("   ✅ Model loaded without the lock")
+
+def test_one_model_for_app_and_pipeline():
+    """The warm-up and status the app uses act on the module the pipeline scores with"""
+    print("\n🔗 Testing shared model module...")
+
+    scoring_module = sys.modules[pipeline.calculate_semantic_batch.__module__]
+    assert scoring_module is semantic_match
+    assert pipeline.warm_up is semantic_match.warm_up and pipeline.model_status is semantic_match.model_status
+    print("   ✅ One semantic_match module, one model")
+
+def main():
+    """Run all model lifecycle tests"""
+    print("🧠 Starting Model Lifecycle Tests")
+    print("=" * 50)
+
+    tests = [
+        test_concurrent_callers_load_once,
+        test_warm_up_reports_ready,
+        test_failed_load_reported,
+        test_unusable_lock_file,
+        test_one_model_for_app_and_pipeline,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ Test {test.__name__} failed: {e}")
+
+    print("\n" + "=" * 50)
+    print(f"📈 Model Lifecycle Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test script to verify local model loading and memory-mapped weights
+"""
+
+import sys
+import os
+import json
+import struct
+import tempfile
+import importlib.util
+
+import numpy as np
+
+# Add script directory to path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "script"))
+
+try:
+    import semantic_match  # the module the pipeline scores through
+    from semantic_fakes import with_fresh_model
+    from script.model_store import local_model_path, local_model_name, read_safetensors_header, mmap_state_dict, MODEL_INFO_FILE
+    from script.memory_usage import shared_memory
+    print("✅ All imports successful")
+except ImportError as e:
+    print(f"❌ Import failed: {e}")
+    sys.exit(1)
+
+def write_safetensors(path, arrays):
+    """Minimal .safetensors writer for float32 arrays"""
+    header, offset, data = {}, 0, b""
+    for name, array in arrays.items():
+        raw = np.ascontiguousarray(array, dtype="<f4").tobytes()
+        header[name] = {"dtype": "F32", "shape": list(array.shape), "data_offsets": [offset, offset + len(raw)]}
+        offset += len(raw)
+        data += raw
+    header["__metadata__"] = {"format": "pt"}
+    encoded = json.dumps(header).encode()
+    encoded += b" " * (-len(encoded) % 8)
+    with open(path, "wb") as f:
+        f.write(struct.pack("<Q", len(encoded)) + encoded + data)
+
+ARRAYS = {"embeddings.weight": np.arange(12, dtype=np.float32).reshape(3, 4), "pooler.bias": np.ones(4)}
+
+def test_safetensors_layout():
+    """The header gives each tensor's dtype, shape and byte range"""
+    print("\n📐 Testing safetensors header...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "model.safetensors")
+        write_safetensors(path, ARRAYS)
+        tensors, data_start = read_safetensors_header(path)
+        assert tensors["embeddings.weight"] == ("F32", (3, 4), 0, 48)
+        assert tensors["pooler.bias"] == ("F32", (4,), 48, 64)
+        with open(path, "rb") as f:
+            f.seek(data_start)
+            assert np.array_equal(np.frombuffer(f.read(48), dtype="<f4").reshape(3, 4), ARRAYS["embeddings.weight"])
+    print("   ✅ Tensor layout read without loading the weights")
+
+def test_mmap_state_dict():
+    """Mapped tensors hold the file's values (needs torch)"""
+    print("\n🗺️  Testing mapped weights...")
+
+    if importlib.util.find_spec("torch") is None:
+        print("   ⏭️  torch not installed, skipped")
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "model.safetensors")
+        write_safetensors(path, ARRAYS)
+        state_dict = mmap_state_dict(path)
+        for name, array in ARRAYS.items():
+            assert np.array_equal(state_dict[name].numpy(), array)
+    print("   ✅ Mapped tensors match")
+
+def test_local_directory_used():
+    """get_model loads from the configured directory when it holds an exported model"""
+    print("\n📁 Testing local model directory...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        assert local_model_path(directory) is None
+        with open(os.path.join(directory, "modules.json"), "w") as f:
+            json.dump([], f)
+        assert local_model_path(directory) == directory
+
+        loaded_from = []
+        model = with_fresh_model(semantic_match.get_model, local_model_path=lambda: local_model_path(directory),
+                                 load_local_model=lambda path: loaded_from.append(path) or object())
+        assert model is not None and loaded_from == [directory]
+    print("   ✅ Model loaded from the local directory")
+
+def test_unusable_directory_not_bypassed():
+    """A configured directory without a model fails the load instead of fetching the model by name"""
+    print("\n🚫 Testing unusable model directory...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        model, status = with_fresh_model(lambda: (semantic_match.get_model(), semantic_match.model_status()),
+                                         MODEL_DIR=directory, local_model_path=lambda: local_model_path(directory))
+        assert model is None and status["state"] == semantic_match.MODEL_FAILED and directory in status["error"]
+    print("   ✅ Load failed with the directory named")
+
+def test_local_model_identity():
+    """An exported model keys cached embeddings by its own name, not MiniLM's"""
+    print("\n🏷️  Testing local model identity...")
+
+    with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second:
+        for directory, dimension in ((first, 384), (second, 768)):
+            with open(os.path.join(directory, "config.json"), "w") as f:
+                json.dump({"hidden_size": dimension}, f)
+        assert local_model_name(first) != local_model_name(second)
+        assert local_model_name(first) != semantic_match.MODEL_NAME
+        with open(os.path.join(second, MODEL_INFO_FILE), "w") as f:
+            json.dump({"model_name": "all-mpnet-base-v2"}, f)
+        assert local_model_name(second) == "all-mpnet-base-v2"
+
+    class Exported:
+        resume_model_name = "all-mpnet-base-v2"
+
+    assert semantic_match._model_id(Exported()) == "all-mpnet-base-v2"
+    assert semantic_match._model_id(object()) == semantic_match.MODEL_NAME
+    print("   ✅ Exported models get their own embedding cache keys")
+
+def test_shared_memory_reading():
+    """Per-process RSS, PSS and shared bytes are readable for the startup benchmark"""
+    print("\n📊 Testing memory readings...")
+
+    rss, pss, shared = shared_memory()
+    assert rss and rss > 0
+    assert pss is None or 0 < pss <= rss
+    print(f"   📊 RSS {rss // 1024} kB, PSS {pss and pss // 1024} kB, shared {shared and shared // 1024} kB")
+    print("   ✅ Memory readings available")
+
+def main():
+    """Run all model store tests"""
+    print("📦 Starting Model Store Tests")
+    print("=" * 50)
+
+    tests = [
+        test_safetensors_layout,
+        test_mmap_state_dict,
+        test_local_directory_used,
+        test_unusable_directory_not_bypassed,
+        test_local_model_identity,
+        test_shared_memory_reading,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ Test {test.__name__} failed: {e}")
+
+    print("\n" + "=" * 50)
+    print(f"📈 Model Store Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Test script to verify PDF text extraction backends
+"""
+
+import sys
+import os
+import io
+import glob
+import tempfile
+
+# Add script directory to path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "script"))
+
+try:
+    from script.parse_resume import (extract_text_fast, extract_text, PDF_BACKENDS, resolve_pdf_backend,
+                                     StopPolicy, extract_text_streaming, register_pdf_backend,
+                                     count_pdf_pages, split_page_range, plan_page_chunks,
+                                     extract_page_range, extract_text_parallel, get_memory_stats,
+                                     probe_pdf_text_layer, ImageOnlyPDFError)
+    import script.parse_resume as parse_resume
+    from script.text_cache import TextCache
+    print("✅ All imports successful")
+except ImportError as e:
+    print(f"❌ Import failed: {e}")
+    sys.exit(1)
+
+RESUME_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "resumes")
+
+def resume_paths():
+    """Sample resumes shipped with the repo"""
+    return sorted(glob.glob(os.path.join(RESUME_DIR, "*.pdf")))
+
+def with_text_cache(test):
+    """
+    Run test() with extract_text on an empty text cache in a temporary directory
+    (in both module names parse_resume is imported under, and in forked workers)
+    """
+    modules = [sys.modules[name] for name in ("parse_resume", "script.parse_resume") if name in sys.modules]
+    originals = [module.get_text_cache for module in modules]
+    with tempfile.TemporaryDirectory() as directory:
+        cache = TextCache(os.path.join(directory, "extracted_text.db"))
+        for module in modules:
+            module.get_text_cache = lambda: cache
+        try:
+            return test()
+        finally:
+            for module, original in zip(modules, originals):
+                module.get_text_cache = original
+
+def build_long_cv():
+    """Concatenate the sample resumes into one multi-page PDF"""
+    import pypdfium2
+
+    document = pypdfium2.PdfDocument.new()
+    for path in resume_paths():
+        document.import_pages(pypdfium2.PdfDocument(path))
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+def build_scanned_pdf():
+    """One-page PDF whose only content is an image, like a scanned resume"""
+    content = b"q 612 0 0 792 0 0 cm /Im0 Do Q"
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+        b"/Resources << /XObject << /Im0 4 0 R >> >> /Contents 5 0 R >>",
+        b"<< /Type /XObject /Subtype /Image /Width 2 /Height 2 /ColorSpace /DeviceGray "
+        b"/BitsPerComponent 8 /Length 4 >>\nstream\n\x00\xff\xff\x00\nendstream",
+        b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content),
+    ]
+    pdf = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return pdf
+
+def test_backend_selection():
+    """Backends are chosen per call, then from RESUME_PDF_BACKEND, then the default"""
+    print("\n🔧 Testing backend selection...")
+
+    assert {"pdfplumber", "pdfminer"} <= set(PDF_BACKENDS)
+    assert resolve_pdf_backend("pdfminer") == "pdfminer"
+
+    original = os.environ.get("RESUME_PDF_BACKEND")
+    try:
+        os.environ["RESUME_PDF_BACKEND"] = "pdfminer"
+        assert resolve_pdf_backend() == "pdfminer"
+        assert resolve_pdf_backend("pdfplumber") == "pdfplumber"
+        os.environ["RESUME_PDF_BACKEND"] = "no-such-backend"
+        assert resolve_pdf_backend() == "pdfplumber"
+    finally:
+        if original is None:
+            os.environ.pop("RESUME_PDF_BACKEND", None)
+        else:
+            os.environ["RESUME_PDF_BACKEND"] = original
+
+    print("   ✅ Backend selection works")
+
+def test_pdfminer_text_parity():
+    """The layout-free backend reads lines in pdfplumber's order, so scoring sees the same text"""
+    print("\n📄 Testing pdfminer backend reading order...")
+
+    for path in resume_paths():
+        plumber = extract_text_fast(path, backend="pdfplumber")
+        miner = extract_text_fast(path, backend="pdfminer")
+        assert miner == plumber, os.path.basename(path)
+
+    print(f"   ✅ Same text as pdfplumber for {len(resume_paths())} resumes")
+
+def test_cache_is_per_backend():
+    """Switching backend must not return text cached by the other backend"""
+    print("\n🗄️  Testing per-backend cache entries...")
+
+    class Upload(io.BytesIO):
+        def __init__(self, path):
+            with open(path, 'rb') as f:
+                super().__init__(f.read())
+            self.name = os.path.basename(path)
+
+    def marked_pages(resume_file, max_pages, first_page=0):
+        yield "text from the marked backend"
+
+    path = resume_paths()[0]
+    register_pdf_backend("marked", marked_pages)
+    try:
+        plumber, marked, plumber_again = with_text_cache(lambda: (extract_text(Upload(path), backend="pdfplumber"),
+                                                                  extract_text(Upload(path), backend="marked"),
+                                                                  extract_text(Upload(path), backend="pdfplumber")))
+    finally:
+        PDF_BACKENDS.pop("marked", None)
+    assert plumber == plumber_again == extract_text_fast(path, backend="pdfplumber")
+    assert marked.strip() == "text from the marked backend"
+    print("   ✅ Cache keyed by backend")
+
+def test_stop_policy():
+    """Streaming stops when the must-haves are found or pages stop adding vocabulary"""
+    print("\n🛑 Testing streaming stop policy...")
+
+    policy = StopPolicy(["python", "machine learning"])
+    assert not policy.update("summary: python developer with ten years of experience in machine")
+    # A skill split across the page boundary still resolves
+    assert policy.update("learning projects and data pipelines")
+    assert policy.stop_reason == "skills resolved"
+
+    # Skills resolve as whole words, like hard matching scores them
+    policy = StopPolicy(["ai", "git", "java"], novelty_threshold=0)
+    assert not policy.update("maintain digital javascript platforms")
+    assert policy.unresolved == {"ai", "git", "java"} and policy.stop_reason is None
+    assert policy.update("ai tooling, git and java services")
+
+    policy = StopPolicy(min_pages=2)
+    assert not policy.update("alpha beta gamma delta")
+    assert not policy.update("epsilon zeta eta theta")
+    assert policy.update("alpha beta gamma delta epsilon zeta eta theta")
+    assert policy.stop_reason == "novelty flattened"
+    print("   ✅ Stop policy works")
+
+def test_streaming_reads_lazily_past_old_cap():
+    """Pages are pulled lazily and skills beyond 3000 characters are reached"""
+    print("\n📚 Testing lazy streaming extraction...")
+
+    consumed = []
+
+    def long_cv_pages(resume_file, max_pages):
+        for i in range(max_pages):
+            consumed.append(i)
+            filler = " ".join(f"publication{i}x{j}" for j in range(300))
+            yield filler + (" kubernetes" if i == 3 else "")
+
+    register_pdf_backend("long-cv", long_cv_pages)
+    try:
+        capped = extract_text_fast(io.BytesIO(b"%PDF-1.4"), backend="long-cv")
+        consumed.clear()
+        text = extract_text_streaming(io.BytesIO(b"%PDF-1.4"), ["kubernetes"], backend="long-cv")
+    finally:
+        PDF_BACKENDS.pop("long-cv", None)
+    assert "kubernetes" not in capped
+    assert "kubernetes" in text
+    assert consumed == [0, 1, 2, 3]
+    print(f"   ✅ Stopped after {len(consumed)} pages ({len(text)} chars)")
+
+def test_page_split_planning():
+    """Long documents are split only when workers would otherwise sit idle"""
+    print("\n🧮 Testing page split planning...")
+
+    assert split_page_range(10, 3) == [(0, 4), (4, 7), (7, 10)]
+    assert split_page_range(2, 5) == [(0, 1), (1, 2)]
+
+    assert plan_page_chunks(3, batch_size=1, workers=16, threshold=8) == 1
+    assert plan_page_chunks(20, batch_size=1, workers=16, threshold=8) == 10
+    assert plan_page_chunks(20, batch_size=4, workers=16, threshold=8) == 4
+    assert plan_page_chunks(20, batch_size=32, workers=16, threshold=8) == 1
+    print("   ✅ Split planning works")
+
+def test_parallel_page_extraction_keeps_order():
+    """Page ranges extracted in parallel reassemble to the sequential text"""
+    print("\n📚 Testing parallel page extraction...")
+
+    class Upload(io.BytesIO):
+        name = "long-cv.pdf"
+
+    data = build_long_cv()
+    page_count = count_pdf_pages(data)
+    sequential = "\n".join(p for p in extract_page_range(data, 0, page_count) if p)
+    parallel = extract_text_parallel(Upload(data), workers=3, threshold=4)
+
+    assert page_count >= 10
+    assert parallel == sequential
+    print(f"   ✅ {page_count} pages reassembled in order ({len(parallel)} chars)")
+
+    # A batch that already keeps the workers busy extracts each document in its caller
+    def no_pool(*args, **kwargs):
+        raise AssertionError("nested process pool started")
+
+    original_pool = parse_resume.ProcessPoolExecutor
+    parse_resume.ProcessPoolExecutor = no_pool
+    try:
+        assert extract_text_parallel(Upload(data), workers=3, threshold=4, batch_size=3) == sequential
+    finally:
+        parse_resume.ProcessPoolExecutor = original_pool
+    print("   ✅ No per-document pool inside a full batch")
+
+def test_lowmem_backend_matches_pdfplumber():
+    """The memory-capped backend returns the same text and records per-document stats"""
+    print("\n🧠 Testing memory-capped pdfplumber backend...")
+
+    before = get_memory_stats()["documents"]
+    for path in resume_paths():
+        assert extract_text_fast(path, backend="pdfplumber-lowmem") == extract_text_fast(path, backend="pdfplumber")
+
+    stats = get_memory_stats()
+    assert stats["documents"] == before + len(resume_paths())
+    assert all(r["action"] == "ok" and r["objects"] for r in stats["recent"])
+    print(f"   ✅ Text identical, max per-document RSS growth {stats['max_peak_rss_mb']} MB")
+
+def test_object_count_guards():
+    """PDFs with too many objects are downgraded to pdfminer or refused outright"""
+    print("\n💣 Testing object-count memory guards...")
+
+    with open(resume_paths()[0], 'rb') as f:
+        data = f.read()
+    original = (parse_resume.PDF_DOWNGRADE_OBJECTS, parse_resume.PDF_MAX_OBJECTS)
+    try:
+        parse_resume.PDF_DOWNGRADE_OBJECTS = 10
+        downgraded = extract_text_fast(io.BytesIO(data), backend="pdfplumber-lowmem")
+        assert get_memory_stats()["recent"][-1]["action"] == "downgraded"
+        assert downgraded == extract_text_fast(io.BytesIO(data), backend="pdfminer")
+
+        parse_resume.PDF_MAX_OBJECTS = 20
+        assert extract_text_fast(io.BytesIO(data), backend="pdfplumber-lowmem") == ""
+        assert get_memory_stats()["recent"][-1]["action"] == "refused"
+    finally:
+        parse_resume.PDF_DOWNGRADE_OBJECTS, parse_resume.PDF_MAX_OBJECTS = original
+
+    print("   ✅ Memory bombs downgraded or refused")
+
+def test_image_only_probe():
+    """Scanned PDFs are recognised from the first page and never reach full extraction"""
+    print("\n🖼️  Testing image-only PDF probe...")
+
+    for path in resume_paths():
+        assert probe_pdf_text_layer(path) == "text"
+
+    scanned = build_scanned_pdf()
+    assert probe_pdf_text_layer(io.BytesIO(scanned)) == "image"
+    assert extract_text_fast(io.BytesIO(scanned)) == ""
+
+    def fail(resume_file, max_pages, first_page=0):
+        raise AssertionError("image-only PDF was fully extracted")
+
+    register_pdf_backend("must-not-run", fail)
+    try:
+        with_text_cache(lambda: extract_text(io.BytesIO(scanned), backend="must-not-run"))
+        raise AssertionError("image-only PDF was not flagged")
+    except ImageOnlyPDFError as e:
+        print(f"   📊 {e}")
+    finally:
+        PDF_BACKENDS.pop("must-not-run", None)
+    print("   ✅ Image-only PDF flagged before extraction")
+
+def main():
+    """Run all PDF extraction tests"""
+    print("📄 Starting PDF Extraction Tests")
+    print("=" * 50)
+
+    tests = [
+        test_backend_selection,
+        test_pdfminer_text_parity,
+        test_cache_is_per_backend,
+        test_stop_policy,
+        test_streaming_reads_lazily_past_old_cap,
+        test_page_split_planning,
+        test_parallel_page_extraction_keeps_order,
+        test_lowmem_backend_matches_pdfplumber,
+        test_object_count_guards,
+        test_image_only_probe,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ Test {test.__name__} failed: {e}")
+
+    print("\n" + "=" * 50)
+    print(f"📈 PDF Extraction Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the int8 model option and its fp32 parity harness
+"""
+
+import sys
+import os
+
+# Add script directory to path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "script"))
+
+try:
+    import semantic_match  # the module the pipeline scores through
+    from semantic_fakes import FakeEncoder, with_semantic_match, with_embedding_cache
+    from script.quantization import score_deviation, parity_report, model_precision
+    print("✅ All imports successful")
+except ImportError as e:
+    print(f"❌ Import failed: {e}")
+    sys.exit(1)
+
+RESUMES = [
+    "Python developer. Django, SQL and Docker in production.",
+    "Graphic designer with Photoshop and Illustrator.",
+    "Data engineer: python, spark, sql, airflow and aws.",
+    "Sales manager, communication and negotiation.",
+]
+
+SKILLS = ["python", "sql", "docker", "aws"]
+
+def test_score_deviation():
+    """Deviation is reported in score points, with the rank agreement"""
+    print("\n📏 Testing score deviation...")
+
+    report = score_deviation([10, 20, 30, 40], [10.5, 19.0, 31.5, 40.0])
+    assert report["max_deviation"] == 1.5 and report["mean_deviation"] == 0.75
+    assert report["over_tolerance"] == 0.25 and report["rank_correlation"] == 1.0
+    assert abs(score_deviation([10, 20], [20, 10])["rank_correlation"] + 1) < 1e-9
+    print("   ✅ Deviation and rank correlation computed")
+
+def test_parity_report():
+    """The harness scores both models on the same resumes and reports throughput and deviation"""
+    print("\n⚖️  Testing parity harness...")
+
+    reference, candidate = FakeEncoder(), FakeEncoder(noise=0.05, precision="int8")
+    report = parity_report(RESUMES, SKILLS, reference, candidate)
+    assert report["resumes"] == len(RESUMES) and report["chunks"] == len(RESUMES)
+    assert 0 < report["max_deviation"] < 10
+    assert report["fp32_chunks_per_second"] > 0 and report["int8_chunks_per_second"] > 0
+    assert report["scores"]["fp32"] != report["scores"]["int8"]
+    identical = parity_report(RESUMES, SKILLS, reference, FakeEncoder(precision="int8"))
+    assert identical["max_deviation"] < 1e-4 and identical["rank_correlation"] == 1.0
+    print(f"   📊 max deviation {report['max_deviation']:.2f} points, "
+          f"rank correlation {report['rank_correlation']:.2f}")
+    print("   ✅ Parity report produced")
+
+def test_parity_bypasses_cache():
+    """The harness times the models: cached embeddings are not used and the cache setting is left alone"""
+    print("\n⏱️  Testing parity without the cache...")
+
+    reference, candidate = FakeEncoder(), FakeEncoder(precision="int8")
+
+    def run_twice():
+        directory = os.environ["RESUME_EMBEDDING_CACHE_DIR"]
+        for _ in range(2):
+            parity_report(RESUMES, SKILLS, reference, candidate)
+        assert os.environ["RESUME_EMBEDDING_CACHE_DIR"] == directory
+
+    with_embedding_cache(run_twice)
+    # Each run: one warm-up sentence, the JD and every resume
+    assert reference.encoded == candidate.encoded == 2 * (len(RESUMES) + 2)
+    print("   ✅ Every run encoded by the models")
+
+def test_int8_embeddings_cached_separately():
+    """Quantized and fp32 embeddings of the same text never share a cache entry"""
+    print("\n🗂️  Testing cache separation...")
+
+    fp32, int8 = FakeEncoder(), FakeEncoder(precision="int8")
+    assert model_precision(fp32) == "fp32" and model_precision(int8) == "int8"
+    assert semantic_match._model_id(fp32) != semantic_match._model_id(int8)
+
+    def score_each_twice():
+        for model in (fp32, int8, fp32, int8):
+            semantic_match.calculate_semantic_batch(RESUMES, SKILLS, advanced=True, coverage=False, model=model)
+
+    with_embedding_cache(score_each_twice)
+    assert fp32.encoded == int8.encoded == len(RESUMES) + 1  # second round served from the cache
+    print("   ✅ Cache keys include the precision")
+
+def test_load_quantizes_in_place():
+    """The int8 model is the loaded model quantized in place, not a second copy of it"""
+    print("\n🧩 Testing in-place quantization at load...")
+
+    loaded, calls = FakeEncoder(), []
+
+    def quantize(model, inplace=False):
+        calls.append((model, inplace))
+        model.resume_precision = "int8"
+        return model
+
+    model = with_semantic_match(lambda: semantic_match._load_model("int8"), local_model_path=lambda: "exported-model",
+                                load_local_model=lambda directory: loaded, quantize_dynamic_int8=quantize)
+    assert model is loaded and calls == [(loaded, True)]
+    print("   ✅ Quantized in place")
+
+def main():
+    """Run all quantization tests"""
+    print("🔢 Starting Quantization Tests")
+    print("=" * 50)
+
+    tests = [
+        test_score_deviation,
+        test_parity_report,
+        test_parity_bypasses_cache,
+        test_int8_embeddings_cached_separately,
+        test_load_quantizes_in_place,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ Test {test.__name__} failed: {e}")
+
+    print("\n" + "=" * 50)
+    print(f"📈 Quantization Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Test script to verify batched semantic scoring with a shared JD embedding
+"""
+
+import sys
+import os
+
+import numpy as np
+
+# Add script directory to path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "script"))
+
+try:
+    from semantic_fakes import FakeEncoder, with_encoder
+    from semantic_match import (calculate_semantic_scores_batch, calculate_semantic_score_advanced,
+                                calculate_basic_semantic_score, split_chunks)
+    print("✅ All imports successful")
+except ImportError as e:
+    print(f"❌ Import failed: {e}")
+    sys.exit(1)
+
+JD_SKILLS = ["python", "sql", "docker", "machine learning"]
+
+RESUMES = [
+    "Python developer with SQL and Docker experience",
+    "Graphic designer, Photoshop and Illustrator",
+    "Machine learning engineer: python, pytorch, docker",
+]
+
+def test_jd_encoded_once():
+    """A batch encodes the JD once and all resumes in one batched call"""
+    print("\n📦 Testing shared JD embedding...")
+
+    encoder = FakeEncoder()
+    scores = with_encoder(encoder, lambda: calculate_semantic_scores_batch(
+        RESUMES * 10, JD_SKILLS, advanced=True, batch_size=8))
+    assert len(scores) == 30
+    assert len(encoder.calls) == 2
+    assert encoder.calls[0][0] == [" ".join(JD_SKILLS)]
+    assert len(encoder.calls[1][0]) == 30 and encoder.calls[1][1] == 8
+    assert all(0 <= score <= 50 for score in scores)
+    assert scores[0] > scores[1] and scores[2] > scores[1]
+    print(f"   📊 Scores: {[round(score, 1) for score in scores[:3]]}")
+    print("   ✅ One JD encode, one batched resume encode")
+
+def pairwise_score(encoder, resume_text, jd_skills):
+    """The per-pair score: cosine of separately encoded resume and JD, x 50, clipped to 0-50"""
+    resume_embedding = encoder.encode([resume_text[:500]])[0]
+    jd_embedding = encoder.encode([" ".join(jd_skills)[:300]])[0]
+    cosine = resume_embedding @ jd_embedding / (np.linalg.norm(resume_embedding) * np.linalg.norm(jd_embedding))
+    return min(max(cosine * 50, 0), 50)
+
+def test_matches_pairwise_scores():
+    """Batch scores equal encoding and comparing each resume-JD pair separately"""
+    print("\n🔁 Testing parity with pairwise scoring...")
+
+    encoder = FakeEncoder()
+    batch = with_encoder(encoder, lambda: calculate_semantic_scores_batch(RESUMES, JD_SKILLS, advanced=True))
+    single = with_encoder(encoder, lambda: [calculate_semantic_score_advanced(text, JD_SKILLS) for text in RESUMES])
+    expected = [pairwise_score(encoder, text, JD_SKILLS) for text in RESUMES]
+    assert np.allclose(batch, expected, atol=1e-4) and np.allclose(single, expected, atol=1e-4)
+    print("   ✅ Batch and pairwise scores agree")
+
+def test_basic_fallback():
+    """Without advanced mode (or a model) every resume gets the word-overlap score"""
+    print("\n📝 Testing basic fallback...")
+
+    encoder = FakeEncoder()
+    scores = with_encoder(encoder, lambda: calculate_semantic_scores_batch(RESUMES, JD_SKILLS, advanced=False))
+    assert scores == [calculate_basic_semantic_score(text, JD_SKILLS) for text in RESUMES]
+    assert not encoder.calls
+    assert calculate_semantic_scores_batch(RESUMES, []) == [0, 0, 0]
+    print("   ✅ Basic scores used when advanced mode is off")
+
+def test_split_chunks():
+    """Chunks cover the whole text in order, within the size and count budgets"""
+    print("\n✂️  Testing chunking...")
+
+    text = "Jane Doe. jane@example.com\nSummary: backend engineer.\n" + "Built services. " * 300 + "\nSkills: kubernetes"
+    chunks = split_chunks(text, chunk_chars=200, max_chunks=1000)
+    assert all(len(chunk) <= 200 for chunk in chunks)
+    assert " ".join(chunks).split() == text.split()
+
+    budgeted = split_chunks(text, chunk_chars=200, max_chunks=5)
+    assert len(budgeted) == 5 and budgeted[0] == chunks[0] and budgeted[-1] == chunks[-1]
+    print(f"   📊 {len(text)} chars -> {len(chunks)} chunks, {len(budgeted)} within budget")
+    print("   ✅ Chunks cover the text")
+
+def test_long_resume_pooling():
+    """Skills past the first 500 characters count; all chunks of a batch are encoded in one call"""
+    print("\n🏊 Testing chunk pooling...")
+
+    long_resume = "Jane Doe, 12 Main Street, jane@example.com. " + "Managed stakeholder meetings. " * 40
+    long_resume += "\nTechnical skills: python sql docker machine learning"
+    encoder = FakeEncoder()
+    best, average = with_encoder(encoder, lambda: (
+        calculate_semantic_scores_batch([long_resume, RESUMES[1]], JD_SKILLS, advanced=True, pooling="max"),
+        calculate_semantic_scores_batch([long_resume], JD_SKILLS, advanced=True, pooling="mean")))
+    truncated = pairwise_score(encoder, long_resume, JD_SKILLS)
+    assert len(encoder.calls[1][0]) == len(split_chunks(long_resume)) + 1  # every chunk, one call
+    assert best[0] > truncated + 5
+    assert best[0] > average[0] > 0
+    print(f"   📊 max {best[0]:.1f}, mean {average[0]:.1f}, first 500 chars {truncated:.1f}")
+    print("   ✅ Max pooling finds skills anywhere in the resume")
+
+def main():
+    """Run all batch semantic tests"""
+    print("🧠 Starting Batch Semantic Tests")
+    print("=" * 50)
+
+    tests = [
+        test_jd_encoded_once,
+        test_matches_pairwise_scores,
+        test_basic_fallback,
+        test_split_chunks,
+        test_long_resume_pooling,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ Test {test.__name__} failed: {e}")
+
+    print("\n" + "=" * 50)
+    print(f"📈 Batch Semantic Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
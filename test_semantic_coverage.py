@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test script to verify semantic skill coverage for missing-skill detection
+"""
+
+import sys
+import os
+
+# Add script directory to path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "script"))
+
+try:
+    import semantic_match  # the module the pipeline scores through
+    from semantic_fakes import FakeEncoder, with_encoder
+    from semantic_match import calculate_semantic_batch
+    from script.pipeline import score_resume_texts
+    print("✅ All imports successful")
+except ImportError as e:
+    print(f"❌ Import failed: {e}")
+    sys.exit(1)
+
+# Words that mean the same thing to the stand-in model
+CONCEPTS = {
+    "kubernetes": 0, "container": 0, "orchestration": 0, "k8s": 0,
+    "python": 1, "django": 1,
+    "sql": 2, "postgresql": 2, "databases": 2,
+}
+
+SKILLS = ["kubernetes", "python", "sql"]
+
+RESUMES = [
+    "Container orchestration.\nDjango.",
+    "Relational databases.",
+]
+
+def test_coverage_matrix():
+    """Each skill is covered by a resume chunk that means the same thing"""
+    print("\n🧭 Testing coverage matrix...")
+
+    encoder = FakeEncoder(concepts=CONCEPTS)
+    scores, covered = with_encoder(encoder, lambda: calculate_semantic_batch(RESUMES, SKILLS, SKILLS, advanced=False),
+                                  SEMANTIC_COVERAGE=True)
+    assert covered.shape == (2, 3) and covered.dtype == bool
+    assert covered.tolist() == [[True, True, False], [False, False, True]]
+    assert len(scores) == 2  # basic scores, advanced mode off
+    print("   ✅ Skills covered by meaning, not spelling")
+
+def test_skill_embeddings_reused():
+    """Skills are embedded once; later resumes only encode their own chunks"""
+    print("\n♻️  Testing skill embedding reuse...")
+
+    encoder = FakeEncoder(concepts=CONCEPTS)
+
+    def score_twice():
+        calculate_semantic_batch(RESUMES[:1], SKILLS, SKILLS, advanced=False)
+        encoder.calls.clear()
+        calculate_semantic_batch(RESUMES[1:], SKILLS, SKILLS, advanced=False)
+        return list(semantic_match._skill_embeddings)
+
+    versions = with_encoder(encoder, score_twice, SEMANTIC_COVERAGE=True)
+    assert not set(SKILLS) & set(encoder.texts)
+    assert len(versions) == 1 and versions[0][0] == semantic_match.MODEL_NAME
+    print("   ✅ Skill embeddings cached per model and taxonomy version")
+
+def test_missing_skills_use_coverage():
+    """With coverage on, the pipeline no longer reports covered skills as missing"""
+    print("\n📋 Testing pipeline missing skills...")
+
+    jd_text = "Required skills: Kubernetes, Python and SQL."
+    resume = "Container orchestration at scale."
+    encoder = FakeEncoder(concepts=CONCEPTS)
+    string_only = with_encoder(encoder, lambda: score_resume_texts(["a.txt"], [resume], jd_text, True),
+                               SEMANTIC_COVERAGE=False)
+    semantic = with_encoder(encoder, lambda: score_resume_texts(["a.txt"], [resume], jd_text, True),
+                            SEMANTIC_COVERAGE=True)
+    assert "kubernetes" in string_only[0]["Missing Skills"]
+    assert "kubernetes" not in semantic[0]["Missing Skills"]
+    assert "python" in semantic[0]["Missing Skills"]
+    print(f"   📊 Missing: {string_only[0]['Missing Skills']} -> {semantic[0]['Missing Skills']}")
+    print("   ✅ Covered skills dropped from Missing Skills")
+
+def main():
+    """Run all semantic coverage tests"""
+    print("🧭 Starting Semantic Coverage Tests")
+    print("=" * 50)
+
+    tests = [
+        test_coverage_matrix,
+        test_skill_embeddings_reused,
+        test_missing_skills_use_coverage,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ Test {test.__name__} failed: {e}")
+
+    print("\n" + "=" * 50)
+    print(f"📈 Semantic Coverage Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the compiled skill matcher and the modules that use it
+"""
+
+import sys
+import os
+
+# Add script directory to path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "script"))
+
+try:
+    from script.skill_matcher import SkillMatcher, get_skill_matcher
+    import script.skill_matcher as skill_matcher
+    from script.parse_jd import extract_skills
+    from script.hard_match import calculate_hard_score
+    from script.feedback import generate_simple_feedback
+    print("✅ All imports successful")
+except ImportError as e:
+    print(f"❌ Import failed: {e}")
+    sys.exit(1)
+
+def test_whole_word_matching():
+    """Skills match whole words only, including skills with punctuation"""
+    print("\n🔤 Testing whole-word matching...")
+
+    matcher = SkillMatcher(['ai', 'git', 'java', 'javascript', 'node.js', 'c++', 'ci/cd', '.net', 'r'])
+    text = "Maintain digital JavaScript apps with Node.js, C++ and CI/CD on asp.net. R is a plus"
+    found = matcher.find_all(text)
+    print(f"   📊 Found: {sorted(found)}")
+    assert found == {'javascript', 'node.js', 'c++', 'ci/cd', 'r'}
+    print("   ✅ No substring false positives")
+
+def test_multi_word_and_nested_skills():
+    """Multi-word skills span line breaks, and skills inside longer ones are reported too"""
+    print("\n🔗 Testing multi-word and nested skills...")
+
+    matcher = SkillMatcher(['react', 'react native', 'machine learning', 'learning', 'node', 'node.js'])
+    text = "Built React Native apps.\nApplied machine\nlearning with node.js"
+    assert matcher.find_ordered(text) == ['react', 'react native', 'machine learning', 'learning',
+                                          'node', 'node.js']
+    occurrences = matcher.occurrences(text)
+    assert occurrences[:2] == [('react', 6, 11), ('react native', 6, 18)]
+    assert text[occurrences[2][1]:occurrences[2][2]] == "machine\nlearning"
+    print("   ✅ Multi-word and nested skills found")
+
+def test_matchers_are_reused():
+    """A vocabulary is compiled once and shared between callers"""
+    print("\n♻️  Testing matcher cache...")
+
+    assert get_skill_matcher(['python', 'sql']) is get_skill_matcher(['python', 'sql'])
+    assert get_skill_matcher(['python', 'sql']) is not get_skill_matcher(['python'])
+    print("   ✅ Compiled matcher reused")
+
+def test_modules_use_word_boundaries():
+    """JD parsing, hard matching and feedback no longer match skills inside other words"""
+    print("\n🧩 Testing skill matching in parse_jd, hard_match and feedback...")
+
+    must_have, _ = extract_skills("We maintain digital JavaScript products. Skills: React, SQL.")
+    print(f"   📊 JD skills: {must_have}")
+    assert must_have == ['javascript', 'react', 'sql']
+
+    score, missing = calculate_hard_score("digital marketing and maintenance", ['git', 'ai'])
+    assert score == 0 and missing == ['git', 'ai']
+    score, missing = calculate_hard_score("python, git and ai research", ['python', 'git', 'ai'])
+    assert score == 30 and missing == []
+
+    feedback = generate_simple_feedback("javascript developer " * 100, "java and javascript role with experience")
+    assert "Add skills: java" in feedback
+    print("   ✅ All three modules use whole-word matching")
+
+def test_streaming_scan_matches_whole_text():
+    """Chunked scanning finds the same skills in the same order, including across chunk boundaries"""
+    print("\n🌊 Testing streaming scan...")
+
+    matcher = SkillMatcher(['ai', 'git', 'c++', '.net', 'node.js', 'ci/cd', 'r', 'react', 'react native',
+                            'machine learning', 'learning', 'amazon web services'])
+    text = ("Digital asp.net and C++x. Built React \n\n Native apps, machine\nlearning on "
+            "Amazon   Web Services, CI/CD with Node.js, .NET and R • git")
+    expected = matcher.find_ordered(text)
+    for size in (1, 2, 3, 7, 16, len(text)):
+        chunks = [text[i:i + size] for i in range(0, len(text), size)]
+        assert matcher.find_ordered_stream(chunks) == expected, size
+    print(f"   📊 {expected}")
+    print("   ✅ Same result for every chunk size")
+
+def test_substring_scan_matches_trie():
+    """Small vocabularies use the substring scan, which reports exactly what the trie walk does"""
+    print("\n⚖️  Testing substring scan against the trie walk...")
+
+    skills = ['ai', 'git', 'java', 'javascript', 'c++', '.net', 'node.js', 'ci/cd', 'r', 'react', 'react native',
+              'machine learning', 'learning', 'amazon web services', 'a a', 'k8s']
+    texts = ["Maintain digital JavaScript apps with Node.js, C++x and CI/CD on asp.net and .NET. R is a plus",
+             "Built React \n\n Native apps, machine\nlearning on Amazon   Web Services • git, a a a, K8S",
+             "", "  ", "İstanbul ai"]
+    small = SkillMatcher(skills, aliases={"kubernetes": "k8s"})
+    original = skill_matcher.SUBSTRING_SCAN_MAX_PHRASES
+    skill_matcher.SUBSTRING_SCAN_MAX_PHRASES = 0
+    try:
+        walked = SkillMatcher(skills, aliases={"kubernetes": "k8s"})
+        assert walked._substring_phrases() is None
+    finally:
+        skill_matcher.SUBSTRING_SCAN_MAX_PHRASES = original
+    assert small._substring_phrases() is not None
+    for text in texts:
+        assert small.occurrences(text) == walked.occurrences(text), text
+        assert small.find_ordered(text) == walked.find_ordered(text), text
+        assert small.find_all(text) == walked.find_all(text), text
+    print(f"   📊 {small.find_ordered(texts[1])}")
+    print("   ✅ Same occurrences, order and sets from both scans")
+
+def test_long_jd_is_scanned_in_full():
+    """Requirements after a long company blurb are no longer cut off"""
+    print("\n📜 Testing long JD scanning...")
+
+    blurb = "We are a friendly team that values ownership and growth. " * 1000
+    must_have, good_to_have = extract_skills(blurb + "Required: Kubernetes, Terraform and Golang. Strong communication.")
+    print(f"   📊 {len(blurb) + 60} characters: {must_have} / {good_to_have}")
+    assert must_have == ['kubernetes', 'terraform', 'golang']
+    assert good_to_have == ['communication']
+    print("   ✅ Skills after the first 2000 characters found")
+
+def main():
+    """Run all skill matcher tests"""
+    print("🧩 Starting Skill Matcher Tests")
+    print("=" * 50)
+
+    tests = [
+        test_whole_word_matching,
+        test_multi_word_and_nested_skills,
+        test_matchers_are_reused,
+        test_modules_use_word_boundaries,
+        test_streaming_scan_matches_whole_text,
+        test_substring_scan_matches_trie,
+        test_long_jd_is_scanned_in_full,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ Test {test.__name__} failed: {e}")
+
+    print("\n" + "=" * 50)
+    print(f"📈 Skill Matcher Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
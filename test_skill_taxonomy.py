@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the skill taxonomy, its aliases and its compiled artifact
+"""
+
+import sys
+import os
+import json
+import tempfile
+import time
+
+# Add script directory to path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "script"))
+
+try:
+    import script.skill_taxonomy as skill_taxonomy
+    from script.skill_taxonomy import load_taxonomy, get_skill_taxonomy, artifact_path
+    from script.parse_jd import extract_skills
+    from script.skill_matcher import STREAM_CHUNK_SIZE
+    from script.hard_match import calculate_hard_score
+    print("✅ All imports successful")
+except ImportError as e:
+    print(f"❌ Import failed: {e}")
+    sys.exit(1)
+
+def synthetic_taxonomy(size):
+    """Taxonomy JSON with `size` made-up skills, every tenth one with an alias"""
+    skills = [{"id": f"skill{i} toolkit", "category": "technical",
+               "aliases": [f"st{i}"] if i % 10 == 0 else []} for i in range(size)]
+    return {"version": "test", "skills": skills}
+
+def test_aliases_map_to_canonical_ids():
+    """JD parsing and resume matching both normalise aliases to canonical skill IDs"""
+    print("\n🏷️  Testing alias normalisation...")
+
+    taxonomy = get_skill_taxonomy()
+    assert taxonomy is not None and len(taxonomy) > 100
+    assert taxonomy.canonical("K8s") == "kubernetes"
+    assert taxonomy.canonical("Postgres") == "postgresql"
+
+    must_have, good_to_have = extract_skills("Needs JS, k8s and Postgres. Team player.")
+    print(f"   📊 JD skills: {must_have} / {good_to_have}")
+    assert must_have == ["javascript", "kubernetes", "postgresql"]
+    assert good_to_have == ["teamwork"]
+
+    score, missing = calculate_hard_score("shipped react apps on k8s with postgres", ["kubernetes", "postgresql",
+                                                                                      "javascript"])
+    assert score == 20 and missing == ["javascript"]
+    print("   ✅ Aliases resolved to canonical IDs")
+
+def test_ambiguous_names_need_context():
+    """Skill names that are ordinary words only become JD requirements when the JD means the skill"""
+    print("\n🤔 Testing ambiguous skill names...")
+
+    must_have, _ = extract_skills("You will excel under pressure, ship swift releases and spark ideas. "
+                                  "Rest assured: Python and SQL.")
+    assert must_have == ["python", "sql"]
+    assert extract_skills("Excel under pressure.")[0] == []
+
+    assert extract_skills("Experience with Spark; Excel for reporting.")[0] == ["spark", "excel"]  # capitalised
+    assert extract_skills("spark jobs on a hadoop cluster")[0] == ["spark", "hadoop"]  # context word
+    assert extract_skills("skills: excel, tableau and swift/kotlin")[0] == ["excel", "tableau", "swift", "kotlin"]
+    assert extract_skills("apache spark, ms excel, swiftui, pytorch")[0] == ["spark", "excel", "swift", "pytorch"]
+    # Context on the far side of a streaming chunk boundary still counts
+    padding = "x " * (STREAM_CHUNK_SIZE // 2 - 3)
+    assert extract_skills(padding + "with Spark")[0] == ["spark"]
+    print("   ✅ Ordinary words ignored, skills confirmed by case, context or list")
+
+def test_artifact_is_built_once():
+    """The compiled artifact is reused until the taxonomy file changes"""
+    print("\n📦 Testing compiled taxonomy artifact...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "taxonomy.json")
+        with open(path, 'w') as f:
+            json.dump({"version": "1", "skills": [{"id": "kubernetes", "aliases": ["k8s"]}]}, f)
+
+        first = load_taxonomy(path, temp_dir)
+        assert os.path.exists(artifact_path(first.digest, temp_dir))
+
+        original_compile = skill_taxonomy.compile_taxonomy
+        def fail(source, digest=None):
+            raise AssertionError("taxonomy recompiled despite an up-to-date artifact")
+        skill_taxonomy.compile_taxonomy = fail
+        try:
+            second = load_taxonomy(path, temp_dir)
+        finally:
+            skill_taxonomy.compile_taxonomy = original_compile
+        assert second.extract("ran k8s clusters") == ["kubernetes"]
+
+        with open(path, 'w') as f:
+            json.dump({"version": "2", "skills": [{"id": "kubernetes"}, {"id": "helm"}]}, f)
+        third = load_taxonomy(path, temp_dir)
+        assert third.version == "2" and third.extract("helm on k8s") == ["helm"]
+
+    print("   ✅ Artifact reused, and rebuilt when the taxonomy changes")
+
+def test_large_taxonomy_loads_quickly():
+    """Tens of thousands of skills load from the artifact much faster than they compile"""
+    print("\n⏱️  Testing large taxonomy load time...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "taxonomy.json")
+        with open(path, 'w') as f:
+            json.dump(synthetic_taxonomy(50000), f)
+
+        start = time.perf_counter()
+        load_taxonomy(path, temp_dir)
+        compile_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        taxonomy = load_taxonomy(path, temp_dir)
+        load_time = time.perf_counter() - start
+
+    print(f"   📊 50000 skills: compile {compile_time * 1000:.0f} ms, artifact load {load_time * 1000:.0f} ms")
+    assert len(taxonomy) == 50000
+    assert taxonomy.extract("used st120 and skill7 toolkit") == ["skill120 toolkit", "skill7 toolkit"]
+    assert load_time < compile_time
+    print("   ✅ Large taxonomy loaded from artifact")
+
+def main():
+    """Run all skill taxonomy tests"""
+    print("🏷️  Starting Skill Taxonomy Tests")
+    print("=" * 50)
+
+    tests = [
+        test_aliases_map_to_canonical_ids,
+        test_ambiguous_names_need_context,
+        test_artifact_is_built_once,
+        test_large_taxonomy_loads_quickly,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ Test {test.__name__} failed: {e}")
+
+    print("\n" + "=" * 50)
+    print(f"📈 Skill Taxonomy Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
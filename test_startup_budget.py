@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Test script to verify that importing the pipeline stays cheap
+"""
+
+import sys
+import os
+
+# Add script directory to path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "script"))
+
+try:
+    from script.startup_profile import import_report, print_report
+    from script.nlp_models import get_nlp
+    print("✅ All imports successful")
+except ImportError as e:
+    print(f"❌ Import failed: {e}")
+    sys.exit(1)
+
+def test_pipeline_import_budget():
+    """import script.pipeline loads no NLP/model packages and fits the import budget"""
+    print("\n🚀 Testing pipeline import cost...")
+
+    report = import_report("script.pipeline")
+    print_report(report, top=5)
+    assert report["heavy_modules"] == []
+    assert report["total_ms"] <= report["budget_ms"]
+    print("   ✅ Pipeline import within budget")
+
+def test_nlp_loaded_on_demand():
+    """The spaCy pipeline is loaded on first use and shared afterwards"""
+    print("\n🧠 Testing lazy spaCy loading...")
+
+    nlp = get_nlp()
+    assert get_nlp() is nlp
+    if nlp is None:
+        print("   ⚠️  spaCy model not installed, basic text processing in use")
+    else:
+        assert len(nlp("Python developer")) == 2
+    print("   ✅ spaCy loaded lazily")
+
+def main():
+    """Run all startup budget tests"""
+    print("🚀 Starting Startup Budget Tests")
+    print("=" * 50)
+
+    tests = [
+        test_pipeline_import_budget,
+        test_nlp_loaded_on_demand,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ Test {test.__name__} failed: {e}")
+
+    print("\n" + "=" * 50)
+    print(f"📈 Startup Budget Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the persistent extracted-text cache
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+import threading
+
+# Add script directory to path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "script"))
+
+try:
+    import script.parse_resume as parse_resume
+    import script.text_cache as text_cache
+    from script.text_cache import TextCache, content_digest
+    print("✅ All imports successful")
+except ImportError as e:
+    print(f"❌ Import failed: {e}")
+    sys.exit(1)
+
+SAMPLE_PDF = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "resumes", "resume - 1.pdf")
+
+class MockUpload:
+    """Mimics a Streamlit UploadedFile"""
+    def __init__(self, content, name):
+        self.name = name
+        self._content = content
+        self._position = 0
+
+    def read(self, size=-1):
+        result = self._content[self._position:] if size == -1 else self._content[self._position:self._position + size]
+        self._position += len(result)
+        return result
+
+    def seek(self, position, whence=0):
+        self._position = position if whence == 0 else len(self._content) + position
+        return self._position
+
+    def tell(self):
+        return self._position
+
+    def getvalue(self):
+        return self._content
+
+def test_hits_misses_and_versions():
+    """Entries are found by digest and ignored when the extractor version changes"""
+    print("\n🗄️  Testing cache hits and misses...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = TextCache(os.path.join(temp_dir, "cache.db"))
+        digest = content_digest(b"resume bytes")
+
+        assert cache.get(digest, "v1") is None
+        cache.put(digest, "v1", "python developer")
+        assert cache.get(digest, "v1") == "python developer"
+        assert cache.get(digest, "v2") is None
+
+        stats = cache.stats()
+        print(f"   📊 Stats: {stats}")
+        assert stats["hits"] == 1 and stats["misses"] == 2
+        assert stats["shared_hits"] == 1 and stats["entries"] == 1
+
+        # A second instance on the same file (another process) sees the entry,
+        # and the first one's counts once its next put has written them
+        other = TextCache(os.path.join(temp_dir, "cache.db"))
+        assert other.get(digest, "v1") == "python developer"
+        cache.put(content_digest(b"other bytes"), "v1", "java developer")
+        assert other.stats()["shared_hits"] == 2 and other.stats()["shared_misses"] == 2
+
+    print("   ✅ Cache hits, misses and version checks work")
+
+def test_versions_stored_side_by_side():
+    """One document extracted by two backends keeps both entries"""
+    print("\n📚 Testing per-version entries...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = TextCache(os.path.join(temp_dir, "cache.db"))
+        digest = content_digest(b"resume bytes")
+        cache.put(digest, "v3:pdfplumber", "plumber text")
+        cache.put(digest, "v3:pdfminer", "miner text")
+        assert cache.get(digest, "v3:pdfplumber") == "plumber text"
+        assert cache.get(digest, "v3:pdfminer") == "miner text"
+        assert cache.stats()["entries"] == 2
+
+    print("   ✅ Both versions read back")
+
+def test_reads_do_not_wait_for_writers():
+    """Hits are served while another process holds the write lock; their access times are written later"""
+    print("\n🔓 Testing lock-free reads...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "cache.db")
+        cache = TextCache(path)
+        cache.put("a", "v1", "python developer")
+        writer = sqlite3.connect(path)
+        writer.execute("BEGIN IMMEDIATE")
+        saved = text_cache.ACCESS_FLUSH_ENTRIES
+        text_cache.ACCESS_FLUSH_ENTRIES = 1  # try to flush on every read
+        try:
+            reads = []
+            reader = threading.Thread(target=lambda: reads.append(cache.get("a", "v1")))
+            reader.start()
+            reader.join(10)
+            assert reads == ["python developer"]
+            assert list(cache._accessed) == [("a", "v1")]  # kept pending, not waited for
+        finally:
+            text_cache.ACCESS_FLUSH_ENTRIES = saved
+            writer.rollback()
+            writer.close()
+
+        cache.put("b", "v1", "java developer")
+        assert not cache._accessed and cache.stats()["shared_hits"] == 1
+    print("   ✅ Reads served without the write lock")
+
+def test_lru_eviction():
+    """The least recently used entries are evicted once the size limit is reached"""
+    print("\n🧹 Testing LRU eviction...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = TextCache(os.path.join(temp_dir, "cache.db"), max_bytes=250)
+        cache.put("a", "v1", "a" * 100)
+        cache.put("b", "v1", "b" * 100)
+        cache.get("a", "v1")  # "a" is now the most recently used
+        cache.put("c", "v1", "c" * 100)
+
+        assert cache.get("a", "v1") is not None
+        assert cache.get("b", "v1") is None
+        assert cache.get("c", "v1") is not None
+        assert cache.stats()["evictions"] == 1 and cache.stats()["bytes"] == 200
+
+    print("   ✅ Least recently used entry evicted")
+
+def test_extract_text_skips_parsing_on_hit():
+    """extract_text should return cached text without calling the PDF extractor"""
+    print("\n⚡ Testing extract_text cache integration...")
+
+    with open(SAMPLE_PDF, 'rb') as f:
+        content = f.read()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = TextCache(os.path.join(temp_dir, "cache.db"))
+        original_get_cache = parse_resume.get_text_cache
+        original_extract = parse_resume._extract_text_uncached
+        parse_resume.get_text_cache = lambda: cache
+        try:
+            first = parse_resume.extract_text(MockUpload(content, "first.pdf"))
+            assert first
+
+            def fail(resume_file, backend=None, policy=None, full_document=False):
+                raise AssertionError("PDF parsed despite a cache hit")
+            parse_resume._extract_text_uncached = fail
+
+            second = parse_resume.extract_text(MockUpload(content, "second.pdf"))
+            assert second == first
+            assert cache.stats()["hits"] == 1
+        finally:
+            parse_resume.get_text_cache = original_get_cache
+            parse_resume._extract_text_uncached = original_extract
+
+    print("   ✅ Re-uploaded resume served from cache")
+
+def main():
+    """Run all text cache tests"""
+    print("🗄️  Starting Text Cache Tests")
+    print("=" * 50)
+
+    tests = [
+        test_hits_misses_and_versions,
+        test_versions_stored_side_by_side,
+        test_reads_do_not_wait_for_writers,
+        test_lru_eviction,
+        test_extract_text_skips_parsing_on_hit,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ Test {test.__name__} failed: {e}")
+
+    print("\n" + "=" * 50)
+    print(f"📈 Text Cache Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test script to verify spool-to-disk ingestion of large uploads
+"""
+
+import sys
+import os
+import tempfile
+
+# Add script directory to path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "script"))
+
+try:
+    import script.parse_resume as parse_resume
+    from script.parse_resume import ingest_upload, MappedUpload, sniff_format, _peek_header
+    from script.text_cache import TextCache, content_digest
+    from test_format_sniffing import NamedBytesIO, create_docx
+    print("✅ All imports successful")
+except ImportError as e:
+    print(f"❌ Import failed: {e}")
+    sys.exit(1)
+
+SAMPLE_PDF = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "resumes", "resume - 1.pdf")
+
+def sample_pdf():
+    """Bytes of a sample resume"""
+    with open(SAMPLE_PDF, 'rb') as f:
+        return f.read()
+
+def test_small_uploads_pass_through():
+    """Uploads under the threshold are handed to the extractors untouched"""
+    print("\n📥 Testing small upload pass-through...")
+
+    upload = NamedBytesIO(b"python developer", "cv.txt")
+    with ingest_upload(upload, threshold=1024) as ingested:
+        assert ingested is upload
+    print("   ✅ Small upload not spooled")
+
+def test_spooled_upload_shares_one_buffer():
+    """A spooled upload is hashed, sniffed and read from the same mapping, then removed"""
+    print("\n💾 Testing spooled upload...")
+
+    data = sample_pdf()
+    with ingest_upload(NamedBytesIO(data, "cv.pdf"), threshold=10) as upload:
+        assert isinstance(upload, MappedUpload)
+        assert upload.name == "cv.pdf"
+        path = upload.path
+        with upload.getbuffer() as buffer:
+            assert content_digest(buffer) == content_digest(data)
+        assert sniff_format(_peek_header(upload)) == "pdf"
+        assert upload.read(5) == b"%PDF-"
+    assert not os.path.exists(path)
+    print("   ✅ Digest, sniff and reads served from the mapped file")
+
+def test_extract_text_parity_when_spooled():
+    """Spooling must not change the extracted text, and must not copy the upload"""
+    print("\n📄 Testing extraction parity for spooled uploads...")
+
+    documents = [
+        ("cv.pdf", sample_pdf()),
+        ("cv.docx", create_docx(["Senior Python Developer", "Skills: django, sql"])),
+        ("cv.txt", "Data engineer — spark, airflow".encode('utf-8')),
+    ]
+
+    def no_copy(self):
+        raise AssertionError("spooled upload copied into memory")
+
+    expected = [parse_resume.extract_text(NamedBytesIO(data, name), use_cache=False) for name, data in documents]
+    expected_full = parse_resume.extract_text(NamedBytesIO(documents[0][1], "cv.pdf"), use_cache=False,
+                                              full_document=True)
+
+    original = (parse_resume.SPOOL_THRESHOLD, parse_resume.get_text_cache, MappedUpload.getvalue)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = TextCache(os.path.join(temp_dir, "cache.db"))
+        parse_resume.SPOOL_THRESHOLD = 10
+        parse_resume.get_text_cache = lambda: cache
+        MappedUpload.getvalue = no_copy
+        try:
+            for (name, data), text in zip(documents, expected):
+                spooled = parse_resume.extract_text(NamedBytesIO(data, name))
+                print(f"   📊 {name}: {len(spooled)} chars")
+                assert text and spooled == text
+            full = parse_resume.extract_text(NamedBytesIO(documents[0][1], "cv.pdf"), full_document=True)
+            assert full == expected_full
+        finally:
+            parse_resume.SPOOL_THRESHOLD, parse_resume.get_text_cache, MappedUpload.getvalue = original
+
+    print("   ✅ Same text with and without spooling")
+
+def main():
+    """Run all upload ingestion tests"""
+    print("📥 Starting Upload Ingestion Tests")
+    print("=" * 50)
+
+    tests = [
+        test_small_uploads_pass_through,
+        test_spooled_upload_shares_one_buffer,
+        test_extract_text_parity_when_spooled,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ Test {test.__name__} failed: {e}")
+
+    print("\n" + "=" * 50)
+    print(f"📈 Upload Ingestion Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)